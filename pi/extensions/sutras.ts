@@ -93,14 +93,20 @@ async function handleSkillCommand(command: string, args: string[], ctx: Extensio
 // ── AUTO-GENERATED:START ──
 	const SUBCOMMANDS: { value: string; label: string }[] = [
 		{ value: "build", label: "build — Build a distributable package for a skill." },
+		{ value: "cache clear", label: "cache clear — Remove every tarball from the download cache." },
+		{ value: "cache info", label: "cache info — Show download cache location and usage." },
+		{ value: "cache prune", label: "cache prune — Evict least recently used tarballs from the download cache." },
+		{ value: "cache verify", label: "cache verify — Re-hash cached tarballs and remove corrupted ones." },
 		{ value: "completion", label: "completion — Generate shell completion script." },
 		{ value: "docs", label: "docs — Generate documentation for a skill." },
 		{ value: "eval", label: "eval — Evaluate a skill using configured metrics." },
+		{ value: "gc", label: "gc — Remove installed versions and cached tarballs nothing refers to." },
 		{ value: "info", label: "info — Show detailed information about a skill." },
 		{ value: "install", label: "install — Install a skill from various sources." },
 		{ value: "list", label: "list — List available skills." },
 		{ value: "new", label: "new — Create a new skill with proper structure." },
 		{ value: "publish", label: "publish — Publish a skill to a registry." },
+		{ value: "reconcile", label: "reconcile — Rebuild the install-state database from installed skills on disk." },
 		{ value: "registry add", label: "registry add — Add a new registry." },
 		{ value: "registry build-index", label: "registry build-index — Generate index.yaml for a local registry." },
 		{ value: "registry list", label: "registry list — List configured registries." },
@@ -111,6 +117,7 @@ async function handleSkillCommand(command: string, args: string[], ctx: Extensio
 		{ value: "uninstall", label: "uninstall — Uninstall a skill." },
 		{ value: "update", label: "update — Check for updates and upgrade sutras to the latest version." },
 		{ value: "validate", label: "validate — Validate a skill's structure and metadata." },
+		{ value: "verify", label: "verify — Check installed skills against the digests in .sutras.lock." },
 	];
 	// ── AUTO-GENERATED:END ──
 
@@ -0,0 +1,139 @@
+"""Benchmark skill package compression formats.
+
+Builds the same skill once per compression format and level, then installs
+each package into a fresh sutras home, reporting package size, build time and
+install time (extraction into the store plus linking into place).
+
+The skill is either an existing skill directory or a generated one with
+reference material of the requested size.
+
+Usage:
+  python scripts/bench_compression.py                      # Generated 20 MB skill
+  python scripts/bench_compression.py --size-mb 100 -r 5   # Bigger skill, 5 runs each
+  python scripts/bench_compression.py --skill path/to/my-skill
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sutras import Skill, SkillBuilder
+from sutras.core.config import SutrasConfig
+from sutras.core.installer import SkillInstaller
+
+# (compression, level) pairs to compare; None is the format's default level
+CONFIGURATIONS = [
+    ("none", None),
+    ("gz", 6),
+    ("gz", None),
+    ("xz", None),
+    ("zstd", 3),
+    ("zstd", 19),
+]
+
+WORDS = (
+    "skill agent context tool file registry version install build package manifest "
+    "dependency lockfile store cache digest archive compression reference example "
+    "the a of to and in is for with on that this by from as be it are or"
+).split()
+
+
+def generate_skill(root: Path, size_mb: int) -> Path:
+    """Write a skill with roughly size_mb of markdown reference material."""
+    skill_dir = root / "bench-skill"
+    (skill_dir / "reference").mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(
+        "---\nname: bench-skill\ndescription: Compression benchmark skill\n---\n\n# Bench\n"
+    )
+    (skill_dir / "sutras.yaml").write_text('version: "1.0.0"\nauthor: bench\nlicense: MIT\n')
+
+    rng = random.Random(0)
+    file_size = 256 * 1024
+    for i in range(max(1, size_mb * 1024 * 1024 // file_size)):
+        lines = []
+        written = 0
+        while written < file_size:
+            line = " ".join(rng.choices(WORDS, k=rng.randint(6, 16))) + ".\n"
+            lines.append(line)
+            written += len(line)
+        (skill_dir / "reference" / f"part-{i:03d}.md").write_text("".join(lines))
+    return skill_dir
+
+
+def bench(skill: Skill, compression: str, level: int | None, runs: int, work: Path) -> dict:
+    build_times, install_times = [], []
+    package = None
+    for run in range(runs):
+        out = work / f"{compression}-{level}-{run}"
+        builder = SkillBuilder(
+            skill,
+            output_dir=out / "dist",
+            reproducible=True,
+            compression=compression,
+            compression_level=level,
+        )
+        start = time.perf_counter()
+        package = builder.build(validate=False)
+        build_times.append(time.perf_counter() - start)
+
+        config = SutrasConfig(config_path=out / "home" / "config.yaml")
+        config.config.skills_dir = str(out / "home" / "skills")
+        installer = SkillInstaller(config=config, project_path=out)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            installer._install_from_file(package)
+        install_times.append(time.perf_counter() - start)
+
+    assert package is not None
+    return {
+        "format": compression if level is None else f"{compression}:{level}",
+        "size": package.stat().st_size,
+        "build": statistics.median(build_times),
+        "install": statistics.median(install_times),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skill", type=Path, help="Skill directory to package")
+    parser.add_argument("--size-mb", type=int, default=20, help="Size of the generated skill")
+    parser.add_argument("--runs", "-r", type=int, default=3, help="Runs per format (median)")
+    args = parser.parse_args()
+
+    configurations = CONFIGURATIONS
+    if importlib.util.find_spec("zstandard") is None:
+        print("zstandard is not installed, skipping zstd (pip install 'sutras[zstd]')\n")
+        configurations = [c for c in CONFIGURATIONS if c[0] != "zstd"]
+
+    work = Path(tempfile.mkdtemp(prefix="sutras-bench-"))
+    try:
+        skill_dir = args.skill or generate_skill(work / "src", args.size_mb)
+        skill = Skill.load(skill_dir)
+        source_size = sum(p.stat().st_size for p in skill_dir.rglob("*") if p.is_file())
+        print(f"Skill: {skill.name} ({source_size / 1024 / 1024:.1f} MB, {args.runs} runs each)\n")
+
+        print(f"{'format':<10} {'size':>10} {'ratio':>7} {'build':>9} {'install':>9}")
+        for compression, level in configurations:
+            result = bench(skill, compression, level, args.runs, work / "runs")
+            print(
+                f"{result['format']:<10} "
+                f"{result['size'] / 1024 / 1024:>8.2f}MB "
+                f"{result['size'] / source_size:>7.1%} "
+                f"{result['build'] * 1000:>7.0f}ms "
+                f"{result['install'] * 1000:>7.0f}ms"
+            )
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
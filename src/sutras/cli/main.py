@@ -7,15 +7,20 @@ import click
 
 from sutras import Skill, SkillLoader, __version__
 from sutras.cli.errors import invalid_skill, operation_failed, skill_not_found
-from sutras.cli.progress import spinner
+from sutras.cli.progress import format_size, format_transfer, spinner
+from sutras.core.archive import COMPRESSIONS
 from sutras.core.builder import BuildError, SkillBuilder
+from sutras.core.cache import DownloadCache
 from sutras.core.config import SutrasConfig
 from sutras.core.docgen import generate_docs, write_docs
 from sutras.core.evaluator import Evaluator
+from sutras.core.gc import GarbageCollector
 from sutras.core.installer import SkillInstaller
+from sutras.core.integrity import Verifier
 from sutras.core.publisher import PublishError, SkillPublisher
 from sutras.core.registry import RegistryManager
 from sutras.core.test_runner import TestRunner
+from sutras.core.workspace import SkillBuildResult, WorkspaceBuilder
 
 
 def _verbose(ctx: click.Context) -> bool:
@@ -988,7 +993,14 @@ def docs(name: str, output: Path | None, no_supporting: bool) -> None:
 
 
 @cli.command()
-@click.argument("name")
+@click.argument("name", required=False)
+@click.option("--all", "all_", is_flag=True, help="Build every discovered skill")
+@click.option(
+    "--path",
+    "skills_path",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Skills directory to search (for --all)",
+)
 @click.option(
     "--output",
     "-o",
@@ -1000,9 +1012,84 @@ def docs(name: str, output: Path | None, no_supporting: bool) -> None:
     is_flag=True,
     help="Skip validation before building",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    help="Skills to build in parallel with --all (default: CPU count)",
+)
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Where --all writes its JSON build report (default: <output>/build-report.json)",
+)
+@click.option(
+    "--reproducible",
+    is_flag=True,
+    help="Build a byte-identical package (timestamps from SOURCE_DATE_EPOCH or a fixed default)",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(list(COMPRESSIONS)),
+    default="gz",
+    show_default=True,
+    help="Package compression (zstd needs the zstandard package)",
+)
+@click.option(
+    "--compression-level",
+    type=int,
+    help="Compression level (gz/xz: 0-9, zstd: 1-22; default: the format's default)",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Rebuild even if the package in the output directory is up to date",
+)
 @click.pass_context
-def build(ctx: click.Context, name: str, output: Path | None, no_validate: bool) -> None:
-    """Build a distributable package for a skill."""
+def build(
+    ctx: click.Context,
+    name: str | None,
+    all_: bool,
+    skills_path: Path | None,
+    output: Path | None,
+    no_validate: bool,
+    jobs: int | None,
+    report: Path | None,
+    reproducible: bool,
+    compression: str,
+    compression_level: int | None,
+    no_cache: bool,
+) -> None:
+    """Build a distributable package for a skill.
+
+    With --all, every discovered skill is validated and packaged in parallel.
+    Unchanged skills are skipped, and a JSON report with each package's path,
+    size, checksum and build time is written next to the packages.
+
+    \b
+    Examples:
+      sutras build my-skill
+      sutras build my-skill --compression zstd
+      sutras build --all --path skills/ --jobs 8
+    """
+    if all_:
+        if name:
+            raise click.UsageError("Cannot combine --all with a skill name")
+        _build_all(
+            skills_path,
+            output,
+            no_validate,
+            jobs,
+            report,
+            reproducible=reproducible,
+            compression=compression,
+            compression_level=compression_level,
+            use_cache=not no_cache,
+        )
+        return
+    if not name:
+        raise click.UsageError("Provide a skill name, or use --all")
+
     verbose = _verbose(ctx)
     loader = SkillLoader()
 
@@ -1012,15 +1099,26 @@ def build(ctx: click.Context, name: str, output: Path | None, no_validate: bool)
 
         skill = loader.load(name)
 
+        builder = SkillBuilder(
+            skill,
+            output_dir=output,
+            reproducible=reproducible,
+            compression=compression,
+            compression_level=compression_level,
+        )
+
         if verbose:
             click.echo(click.style("Build configuration:", fg="bright_black"))
             click.echo(click.style(f"  Source: {skill.path}", fg="bright_black"))
             click.echo(click.style(f"  Output: {output or './dist'}", fg="bright_black"))
             click.echo(click.style(f"  Validate: {not no_validate}", fg="bright_black"))
+            level = f" (level {compression_level})" if compression_level is not None else ""
+            click.echo(click.style(f"  Compression: {compression}{level}", fg="bright_black"))
+            if builder.reproducible:
+                epoch = builder.source_date_epoch()
+                click.echo(click.style(f"  Reproducible: {epoch}", fg="bright_black"))
             click.echo()
 
-        builder = SkillBuilder(skill, output_dir=output)
-
         if not no_validate:
             click.echo(click.style("Validating skill...", fg="blue"))
             errors = builder.validate_for_distribution()
@@ -1035,7 +1133,7 @@ def build(ctx: click.Context, name: str, output: Path | None, no_validate: bool)
             click.echo()
 
         with spinner("Packaging skill"):
-            package_path = builder.build(validate=False)
+            package_path = builder.build(validate=False, use_cache=not no_cache)
 
         package_size = package_path.stat().st_size
         size_str = f"{package_size:,} bytes"
@@ -1045,7 +1143,13 @@ def build(ctx: click.Context, name: str, output: Path | None, no_validate: bool)
             size_str = f"{package_size / (1024 * 1024):.1f} MB"
 
         click.echo()
-        click.echo(click.style("✓ Build complete!", fg="green", bold=True))
+        if builder.from_cache:
+            click.echo(
+                click.style("✓ Package is up to date", fg="green", bold=True)
+                + click.style(" (nothing changed since the last build)", fg="bright_black")
+            )
+        else:
+            click.echo(click.style("✓ Build complete!", fg="green", bold=True))
         click.echo()
         click.echo(click.style("Package:", fg="cyan", bold=True))
         click.echo(f"  {package_path}")
@@ -1058,7 +1162,7 @@ def build(ctx: click.Context, name: str, output: Path | None, no_validate: bool)
         click.echo(f"  Version: {version}")
         if skill.abi and skill.abi.author:
             click.echo(f"  Author: {skill.abi.author}")
-        click.echo(f"  Files: {len(builder.create_manifest()['files']) + 1}")
+        click.echo(f"  Files: {len(builder.collect_files()) + 1}")
         click.echo()
 
         click.echo(click.style("Next steps:", fg="yellow", bold=True))
@@ -1081,6 +1185,85 @@ def build(ctx: click.Context, name: str, output: Path | None, no_validate: bool)
         operation_failed("Building skill", str(e))
 
 
+def _build_all(
+    skills_path: Path | None,
+    output: Path | None,
+    no_validate: bool,
+    jobs: int | None,
+    report_path: Path | None,
+    **builder_options,
+) -> None:
+    """Build every discovered skill and write the build report."""
+    compression = builder_options["compression"]
+    try:
+        COMPRESSIONS[compression].validate_level(builder_options["compression_level"])
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--compression-level'")
+
+    if skills_path:
+        loader = SkillLoader(
+            search_paths=[skills_path],
+            include_global=False,
+            include_project=False,
+        )
+    else:
+        loader = SkillLoader()
+    workspace = WorkspaceBuilder(
+        loader, output_dir=output, jobs=jobs, validate=not no_validate, **builder_options
+    )
+
+    skill_paths = workspace.discover()
+    if not skill_paths:
+        click.echo(click.style("No skills found to build.", fg="yellow", bold=True))
+        return
+
+    click.echo(
+        click.style(
+            f"Building {len(skill_paths)} skill(s) with {min(workspace.jobs, len(skill_paths))} "
+            "worker(s)",
+            fg="cyan",
+            bold=True,
+        )
+    )
+    click.echo()
+
+    def show(result: SkillBuildResult) -> None:
+        label = f"{result.name} {result.version or ''}".rstrip()
+        timing = click.style(f" ({result.duration:.2f}s)", fg="bright_black")
+        if result.status == "built":
+            click.echo(click.style("  ✓ ", fg="green") + label + timing)
+        elif result.status == "cached":
+            click.echo(
+                click.style("  ✓ ", fg="green")
+                + label
+                + click.style(" (up to date)", fg="bright_black")
+            )
+        else:
+            click.echo(click.style("  ✗ ", fg="red") + f"{label} ({result.status})")
+            for error in result.errors:
+                click.echo(click.style(f"      {error}", fg="red"))
+
+    report = workspace.build(skill_paths, on_result=show)
+    report_path = report_path or workspace.output_dir / "build-report.json"
+    report.write(report_path)
+
+    counts = report.counts()
+    total_size = sum(r.size or 0 for r in report.results)
+    click.echo()
+    summary = (
+        f"{counts['built']} built, {counts['cached']} up to date"
+        f", {len(report.failed)} failed in {report.duration:.2f}s"
+        f" ({format_size(total_size)})"
+    )
+    if report.failed:
+        click.echo(click.style("✗ ", fg="red") + summary)
+    else:
+        click.echo(click.style("✓ ", fg="green") + summary)
+    click.echo(click.style(f"  Report: {report_path}", fg="bright_black"))
+    if report.failed:
+        raise click.Abort()
+
+
 @cli.group()
 def registry() -> None:
     """Manage skill registries."""
@@ -1237,13 +1420,32 @@ def registry_build_index(registry_path: Path, output: Path | None) -> None:
 
 
 @cli.command()
-@click.argument("source")
+@click.argument("source", required=False)
 @click.option("--version", "-v", help="Specific version (for registry installs)")
 @click.option("--registry", "-r", help="Registry to install from (for registry installs)")
+@click.option(
+    "--frozen",
+    is_flag=True,
+    help="Install exactly the skills in .sutras.lock, skipping resolution",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Only use the download cache; never fetch from the network",
+)
 @click.pass_context
-def install(ctx: click.Context, source: str, version: str | None, registry: str | None) -> None:
+def install(
+    ctx: click.Context,
+    source: str | None,
+    version: str | None,
+    registry: str | None,
+    frozen: bool,
+    offline: bool,
+) -> None:
     """Install a skill from various sources.
 
+    With --frozen, installs every skill pinned in .sutras.lock instead.
+
     SOURCE can be:
 
     \b
@@ -1260,9 +1462,27 @@ def install(ctx: click.Context, source: str, version: str | None, registry: str
     sutras install github:user/repo@v1.0.0
     sutras install https://example.com/skills/skill-1.0.0.tar.gz
     sutras install ./dist/my-skill-1.0.0.tar.gz
+    sutras install --frozen
+    sutras install --frozen --offline
     """
+    if frozen and source:
+        raise click.UsageError("SOURCE cannot be combined with --frozen")
+    if not frozen and not source:
+        raise click.UsageError("Missing argument 'SOURCE' (or use --frozen)")
+
     verbose = _verbose(ctx)
     try:
+        if frozen:
+            with spinner("Installing from .sutras.lock", "Installed locked skills") as status:
+                installer = SkillInstaller(
+                    offline=offline,
+                    on_progress=lambda p: status.update(
+                        format_transfer(p.downloaded, p.total, p.bytes_per_second)
+                    ),
+                )
+                installer.install_frozen()
+            return
+
         if verbose:
             click.echo(click.style("Install details:", fg="bright_black"))
             click.echo(click.style(f"  Source: {source}", fg="bright_black"))
@@ -1272,8 +1492,13 @@ def install(ctx: click.Context, source: str, version: str | None, registry: str
                 click.echo(click.style(f"  Registry: {registry}", fg="bright_black"))
             click.echo()
 
-        installer = SkillInstaller()
-        with spinner("Installing skill", f"Installed {source}"):
+        with spinner("Installing skill", f"Installed {source}") as status:
+            installer = SkillInstaller(
+                offline=offline,
+                on_progress=lambda p: status.update(
+                    format_transfer(p.downloaded, p.total, p.bytes_per_second)
+                ),
+            )
             installer.install(source, version, registry)
 
         click.echo()
@@ -1315,6 +1540,120 @@ def uninstall(skill_name: str, version: str | None) -> None:
         operation_failed("Uninstall", str(e))
 
 
+@cli.command()
+def reconcile() -> None:
+    """Rebuild the install-state database from installed skills on disk."""
+    try:
+        installer = SkillInstaller()
+        with spinner("Scanning installed skills", "Scan finished"):
+            added, removed = installer.reconcile()
+
+        total = sum(len(v) for v in installer.list_installed().values())
+        click.echo(
+            click.style("✓ ", fg="green")
+            + f"Install state rebuilt: {total} version(s) installed "
+            + f"({added} added, {removed} removed)"
+        )
+
+    except Exception as e:
+        operation_failed("Reconciling install state", str(e))
+
+
+@cli.command()
+@click.option(
+    "--installed",
+    "all_installed",
+    is_flag=True,
+    help="Verify every installed version against its install-time digests instead of .sutras.lock",
+)
+@click.option("--jobs", "-j", default=8, show_default=True, help="Files to hash in parallel")
+def verify(all_installed: bool, jobs: int) -> None:
+    """Check installed skills against the digests in .sutras.lock."""
+    try:
+        verifier = Verifier(SkillInstaller(), max_workers=jobs)
+        with spinner("Verifying installed skills", "Verification finished"):
+            results = verifier.verify_installed() if all_installed else verifier.verify_locked()
+
+    except ValueError as e:
+        operation_failed(
+            "Verification",
+            str(e),
+            [
+                f"Run {click.style('sutras install <skill>', fg='cyan')} to create a lockfile",
+                f"Use {click.style('sutras verify --installed', fg='cyan')} to check "
+                "installs without one",
+            ],
+        )
+    except Exception as e:
+        operation_failed("Verification", str(e))
+
+    failed = [r for r in results if not r.ok]
+    for result in results:
+        label = f"{result.name} {result.version}"
+        if result.ok:
+            click.echo(click.style("  ✓ ", fg="green") + label)
+        else:
+            click.echo(click.style("  ✗ ", fg="red") + f"{label} ({result.status})")
+        for problem in result.problems:
+            color = "yellow" if result.ok else "red"
+            click.echo(click.style(f"      {problem}", fg=color))
+
+    hashed = sum(r.hashed for r in results)
+    summary = (
+        f"{len(results) - len(failed)}/{len(results)} skill(s) verified, {hashed} file(s) hashed"
+    )
+    if failed:
+        click.echo(click.style("✗ ", fg="red") + summary)
+        raise click.Abort()
+    click.echo(click.style("✓ ", fg="green") + summary)
+
+
+@cli.command()
+@click.option(
+    "--project",
+    "-p",
+    "projects",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Project whose .sutras.lock keeps skills alive (repeatable, default: current directory)",
+)
+@click.option("--max-age", type=int, help="Only remove things unused for at least this many days")
+@click.option(
+    "--max-size",
+    type=int,
+    help="Size budget in MB for cached tarballs still in use "
+    "(default: configured download_cache_max_size)",
+)
+@click.option("--dry-run", is_flag=True, help="Show what would be removed without removing it")
+def gc(
+    projects: tuple[Path, ...], max_age: int | None, max_size: int | None, dry_run: bool
+) -> None:
+    """Remove installed versions and cached tarballs nothing refers to."""
+    try:
+        collector = GarbageCollector(SkillInstaller(), list(projects) or None)
+        with spinner("Collecting garbage", "Collection finished"):
+            report = collector.collect(
+                max_age=max_age * 86400 if max_age is not None else None,
+                max_size=max_size * 1024 * 1024 if max_size is not None else None,
+                dry_run=dry_run,
+            )
+
+        verb = "Would remove" if dry_run else "Removed"
+        for item in report.versions:
+            click.echo(
+                click.style(f"  {verb.lower()} {item.name} {item.version}", fg="bright_black")
+            )
+        click.echo(
+            click.style("✓ ", fg="green")
+            + f"{verb} {len(report.versions)} version(s), {len(report.blobs)} cached tarball(s) "
+            + f"and {len(report.store_entries)} store entry(s), "
+            + f"{'would free' if dry_run else 'freed'} {format_size(report.freed)}"
+        )
+
+    except Exception as e:
+        operation_failed("Garbage collection", str(e))
+
+
 @cli.command()
 @click.argument("skill_path", type=click.Path(exists=True, path_type=Path), default=".")
 @click.option("--registry", "-r", help="Registry to publish to (default: default registry)")
@@ -1340,6 +1679,95 @@ def publish(skill_path: Path, registry: str | None, pr: bool, build_dir: Path |
         operation_failed("Publishing", str(e))
 
 
+def _download_cache() -> DownloadCache:
+    config = SutrasConfig()
+    return DownloadCache(config.get_download_cache_dir(), config.config.download_cache_max_size)
+
+
+@cli.group()
+def cache() -> None:
+    """Inspect and manage the download cache."""
+    pass
+
+
+@cache.command("info")
+def cache_info() -> None:
+    """Show download cache location and usage."""
+    try:
+        download_cache = _download_cache()
+        entries = download_cache.entries()
+        total = sum(e.size for e in entries)
+
+        click.echo(click.style("Download cache:", fg="cyan", bold=True))
+        click.echo(f"  Location: {download_cache.cache_dir}")
+        click.echo(f"  Tarballs: {len(entries)}")
+        click.echo(f"  Size: {format_size(total)} / {format_size(download_cache.max_size)}")
+        if entries:
+            oldest = datetime.fromtimestamp(entries[0].last_used)
+            click.echo(
+                click.style(f"  Least recently used: {oldest:%Y-%m-%d %H:%M}", fg="bright_black")
+            )
+
+    except Exception as e:
+        operation_failed("Reading cache", str(e))
+
+
+@cache.command("prune")
+@click.option(
+    "--max-size",
+    type=int,
+    help="Size limit in MB (default: configured download_cache_max_size)",
+)
+@click.option("--max-age", type=int, help="Also remove tarballs unused for this many days")
+def cache_prune(max_size: int | None, max_age: int | None) -> None:
+    """Evict least recently used tarballs from the download cache."""
+    try:
+        download_cache = _download_cache()
+        removed, freed = download_cache.prune(
+            max_size=max_size * 1024 * 1024 if max_size is not None else None,
+            max_age=max_age * 86400 if max_age is not None else None,
+        )
+        click.echo(
+            click.style("✓ ", fg="green")
+            + f"Removed {removed} tarball(s), freed {format_size(freed)}"
+        )
+
+    except Exception as e:
+        operation_failed("Pruning cache", str(e))
+
+
+@cache.command("verify")
+def cache_verify() -> None:
+    """Re-hash cached tarballs and remove corrupted ones."""
+    try:
+        download_cache = _download_cache()
+        with spinner("Verifying cached tarballs", "Verification finished"):
+            corrupted = download_cache.verify()
+
+        if corrupted:
+            click.echo(
+                click.style("⚠ ", fg="yellow") + f"Removed {len(corrupted)} corrupted tarball(s):"
+            )
+            for digest in corrupted:
+                click.echo(click.style(f"  {digest}", fg="bright_black"))
+        else:
+            click.echo(click.style("✓ ", fg="green") + "All cached tarballs are intact")
+
+    except Exception as e:
+        operation_failed("Verifying cache", str(e))
+
+
+@cache.command("clear")
+def cache_clear() -> None:
+    """Remove every tarball from the download cache."""
+    try:
+        _download_cache().clear()
+        click.echo(click.style("✓ ", fg="green") + "Download cache cleared")
+
+    except Exception as e:
+        operation_failed("Clearing cache", str(e))
+
+
 @cli.command()
 @click.option(
     "--check",
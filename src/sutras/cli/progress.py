@@ -11,6 +11,34 @@ from itertools import cycle
 import click
 
 
+def format_size(num_bytes: float) -> str:
+    """Format a byte count for display."""
+    if num_bytes > 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):.1f} MB"
+    if num_bytes > 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes:,.0f} bytes"
+
+
+def format_transfer(downloaded: int, total: int | None, bytes_per_second: float) -> str:
+    """Format download progress, e.g. "1.2 MB / 3.4 MB at 850.0 KB/s"."""
+    done = format_size(downloaded)
+    if total:
+        done = f"{done} / {format_size(total)}"
+    return f"{done} at {format_size(bytes_per_second)}/s"
+
+
+class SpinnerStatus:
+    """Handle yielded by spinner() to show live detail next to the message."""
+
+    def __init__(self) -> None:
+        self.detail = ""
+
+    def update(self, detail: str) -> None:
+        """Replace the detail text shown after the spinner message."""
+        self.detail = detail
+
+
 @contextmanager
 def spinner(message: str, done_message: str | None = None):
     """Display a spinner during a long-running operation.
@@ -20,16 +48,17 @@ def spinner(message: str, done_message: str | None = None):
         done_message: Message to show on completion. Defaults to "{message} done".
 
     Usage:
-        with spinner("Installing skill"):
-            do_long_operation()
+        with spinner("Installing skill") as status:
+            do_long_operation(on_progress=status.update)
     """
     frames = cycle(["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"])
     stop_event = threading.Event()
     is_tty = sys.stderr.isatty()
+    status = SpinnerStatus()
 
     if not is_tty:
         click.echo(f"  {message}...", err=True)
-        yield
+        yield status
         if done_message:
             click.echo(f"  {done_message}", err=True)
         return
@@ -37,19 +66,20 @@ def spinner(message: str, done_message: str | None = None):
     def _animate():
         while not stop_event.is_set():
             frame = next(frames)
-            click.echo(f"\r  {frame} {message}...", nl=False, err=True)
+            detail = f" {status.detail}" if status.detail else ""
+            click.echo(f"\r  {frame} {message}...{detail}\033[K", nl=False, err=True)
             stop_event.wait(0.08)
 
     t = threading.Thread(target=_animate, daemon=True)
     t.start()
 
     try:
-        yield
+        yield status
     finally:
         stop_event.set()
         t.join()
         final = done_message or f"{message} done"
-        click.echo(f"\r  {click.style('✓', fg='green')} {final}   ", err=True)
+        click.echo(f"\r  {click.style('✓', fg='green')} {final}\033[K", err=True)
 
 
 @contextmanager
@@ -8,9 +8,11 @@ from sutras.core.resolver import (
     DependencyConflictError,
     DependencyResolver,
     NoMatchingVersionError,
+    ResolutionCache,
     ResolvedSkill,
     SkillNotFoundError,
     resolve_dependencies,
+    topological_levels,
 )
 from sutras.core.semver import Version, VersionRange, parse_constraint, parse_version
 from sutras.core.skill import Skill, SkillMetadata
@@ -24,6 +26,7 @@ __all__ = [
     "LockedSkill",
     "LockfileManager",
     "NoMatchingVersionError",
+    "ResolutionCache",
     "ResolvedSkill",
     "Skill",
     "SkillLoader",
@@ -35,4 +38,5 @@ __all__ = [
     "parse_constraint",
     "parse_version",
     "resolve_dependencies",
+    "topological_levels",
 ]
@@ -0,0 +1,299 @@
+"""Skill tarball extraction for Sutras.
+
+Extracts a skill tarball in a single streaming pass, capturing the files the
+installer needs (sutras.yaml, SKILL.md and MANIFEST.json) as they go by, so
+each archive is decompressed exactly once. Extracted trees can be checked
+against the checksums recorded in MANIFEST.json.
+
+Packages may be gzip, xz or zstd compressed, or plain tar. The compression is
+detected from the file contents, not its name; zstd needs the optional
+``zstandard`` package.
+"""
+
+import gzip
+import json
+import lzma
+import re
+import tarfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import yaml
+
+from .cache import sha256_file
+
+METADATA_FILES = ("sutras.yaml", "SKILL.md", "MANIFEST.json")
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@dataclass(frozen=True)
+class Compression:
+    """A package compression format."""
+
+    name: str
+    extension: str
+    min_level: int | None = None
+    max_level: int | None = None
+    default_level: int | None = None
+
+    def validate_level(self, level: int | None) -> int | None:
+        """Check a compression level, returning the level to use.
+
+        Raises:
+            ValueError: If the level is out of range or the format has no levels
+        """
+        if level is None:
+            return self.default_level
+        if self.min_level is None or self.max_level is None:
+            raise ValueError(f"Compression '{self.name}' does not take a level")
+        if not self.min_level <= level <= self.max_level:
+            raise ValueError(
+                f"Compression level for '{self.name}' must be between "
+                f"{self.min_level} and {self.max_level}, got {level}"
+            )
+        return level
+
+
+COMPRESSIONS = {
+    "gz": Compression("gz", ".tar.gz", 0, 9, 9),
+    "xz": Compression("xz", ".tar.xz", 0, 9, 6),
+    "zstd": Compression("zstd", ".tar.zst", 1, 22, 3),
+    "none": Compression("none", ".tar"),
+}
+
+ARCHIVE_EXTENSIONS = (".tar.gz", ".tgz", ".tar.xz", ".tar.zst", ".tar")
+
+
+def is_archive(filename: str) -> bool:
+    """Check whether a file name looks like a skill package."""
+    return filename.endswith(ARCHIVE_EXTENSIONS)
+
+
+def strip_archive_extension(filename: str) -> str:
+    """Remove the package extension from a file name."""
+    for extension in ARCHIVE_EXTENSIONS:
+        if filename.endswith(extension):
+            return filename[: -len(extension)]
+    return filename
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise ImportError(
+            "zstd-compressed packages need the 'zstandard' package: pip install 'sutras[zstd]'"
+        ) from None
+    return zstandard
+
+
+def compression_writer(
+    raw: IO[bytes],
+    compression: str = "gz",
+    level: int | None = None,
+    mtime: float | None = None,
+) -> IO[bytes]:
+    """Wrap a binary file so that everything written to it is compressed.
+
+    Closing the returned stream finishes the compressed data but leaves
+    ``raw`` open.
+
+    Args:
+        raw: File the compressed package is written to
+        compression: One of COMPRESSIONS
+        level: Compression level (default: the format's default)
+        mtime: Timestamp for the gzip header (default: now)
+
+    Returns:
+        Writable stream
+
+    Raises:
+        ValueError: If the compression or level is not supported
+        ImportError: If zstd is requested without the zstandard package
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unknown compression '{compression}'. Use one of: {', '.join(COMPRESSIONS)}"
+        )
+    level = COMPRESSIONS[compression].validate_level(level)
+
+    if compression == "gz":
+        return gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=level, mtime=mtime)
+    if compression == "xz":
+        return lzma.LZMAFile(raw, "wb", preset=level)
+    if compression == "zstd":
+        compressor = _zstandard().ZstdCompressor(level=level)
+        return compressor.stream_writer(raw, closefd=False)
+    return raw
+
+
+@contextmanager
+def open_archive(tarball_path: Path) -> Iterator[tarfile.TarFile]:
+    """Open a package for streaming reads, detecting its compression.
+
+    Args:
+        tarball_path: Path to a gzip, xz, bzip2, zstd or uncompressed tarball
+
+    Yields:
+        TarFile in stream mode
+    """
+    with open(tarball_path, "rb") as raw:
+        is_zstd = raw.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+        raw.seek(0)
+        if is_zstd:
+            decompressor = _zstandard().ZstdDecompressor()
+            with (
+                decompressor.stream_reader(raw, closefd=False) as stream,
+                tarfile.open(fileobj=stream, mode="r|") as tar,
+            ):
+                yield tar
+        else:
+            with tarfile.open(fileobj=raw, mode="r|*") as tar:
+                yield tar
+
+
+# Use the safe "data" extraction filter where available (Python 3.11.4+).
+_EXTRACT_KWARGS: dict[str, Any] = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+
+@dataclass
+class ArchiveMetadata:
+    """Metadata files found in a skill tarball."""
+
+    root: str | None = None
+    sutras_yaml: dict[str, Any] | None = None
+    skill_md: str | None = None
+    manifest: dict[str, Any] | None = None
+
+    @property
+    def version(self) -> str:
+        """Version from sutras.yaml (default: 0.0.0)."""
+        return str((self.sutras_yaml or {}).get("version", "0.0.0"))
+
+    @property
+    def name(self) -> str:
+        """Skill name from SKILL.md frontmatter, falling back to the root directory.
+
+        Raises:
+            ValueError: If the name cannot be determined
+        """
+        if self.skill_md:
+            match = re.search(r"^name:\s*(.+)$", self.skill_md, re.MULTILINE)
+            if match:
+                return match.group(1).strip()
+        if self.root:
+            return self.root
+        raise ValueError("Could not determine skill name from tarball")
+
+    def identity(self) -> tuple[str, str]:
+        """Get the (skill_name, version) recorded in the tarball.
+
+        Raises:
+            ValueError: If there is no sutras.yaml or no recognisable name
+        """
+        if self.sutras_yaml is None:
+            raise ValueError("No sutras.yaml found in tarball")
+        return self.name, self.version
+
+
+def _metadata_key(member_name: str) -> tuple[str | None, str] | None:
+    """Match a member against the metadata files at the archive root or one level down."""
+    parts = Path(member_name).parts
+    if parts and parts[0] == ".":
+        parts = parts[1:]
+    if len(parts) == 1 and parts[0] in METADATA_FILES:
+        return None, parts[0]
+    if len(parts) == 2 and parts[1] in METADATA_FILES:
+        return parts[0], parts[1]
+    return None
+
+
+def _record(metadata: ArchiveMetadata, root: str | None, filename: str, data: bytes) -> None:
+    if filename == "sutras.yaml" and metadata.sutras_yaml is None:
+        metadata.sutras_yaml = yaml.safe_load(data) or {}
+    elif filename == "SKILL.md" and metadata.skill_md is None:
+        metadata.skill_md = data.decode("utf-8")
+    elif filename == "MANIFEST.json" and metadata.manifest is None:
+        metadata.manifest = json.loads(data)
+    else:
+        return
+    if metadata.root is None:
+        metadata.root = root
+
+
+def extract_archive(tarball_path: Path, dest_dir: Path) -> ArchiveMetadata:
+    """Extract a tarball in one streaming pass, collecting its metadata files.
+
+    Args:
+        tarball_path: Path to the tarball (see open_archive for supported formats)
+        dest_dir: Directory to extract into
+
+    Returns:
+        Metadata captured during extraction
+    """
+    metadata = ArchiveMetadata()
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    with open_archive(tarball_path) as tar:
+        for member in tar:
+            tar.extract(member, dest_dir, **_EXTRACT_KWARGS)
+            key = _metadata_key(member.name) if member.isfile() else None
+            if key:
+                # Just written, so this is served from the page cache.
+                _record(metadata, key[0], key[1], (dest_dir / member.name).read_bytes())
+
+    return metadata
+
+
+def read_metadata(tree_dir: Path) -> ArchiveMetadata:
+    """Collect the metadata files from an already extracted tarball.
+
+    Args:
+        tree_dir: Directory the tarball was extracted into
+
+    Returns:
+        Metadata found in the tree
+    """
+    metadata = ArchiveMetadata()
+    candidates = [tree_dir] + sorted(p for p in tree_dir.iterdir() if p.is_dir())
+    for directory in candidates:
+        root = None if directory == tree_dir else directory.name
+        for filename in METADATA_FILES:
+            path = directory / filename
+            if path.is_file():
+                _record(metadata, root, filename, path.read_bytes())
+    return metadata
+
+
+def verify_manifest(tree_dir: Path, metadata: ArchiveMetadata) -> list[str]:
+    """Check an extracted tree against the sizes and checksums in its MANIFEST.json.
+
+    Trees without a manifest pass trivially.
+
+    Args:
+        tree_dir: Directory the tarball was extracted or materialised into
+        metadata: Metadata of the tarball
+
+    Returns:
+        List of problems found (empty if the tree matches)
+    """
+    if not metadata.manifest:
+        return []
+
+    skill_dir = tree_dir / metadata.root if metadata.root else tree_dir
+    problems = []
+    for name, expected in metadata.manifest.get("files", {}).items():
+        path = skill_dir / name
+        if not path.is_file():
+            problems.append(f"{name}: missing")
+            continue
+        if "size" in expected and path.stat().st_size != expected["size"]:
+            problems.append(f"{name}: size mismatch")
+            continue
+        if "checksum" in expected and sha256_file(path) != expected["checksum"]:
+            problems.append(f"{name}: checksum mismatch")
+    return problems
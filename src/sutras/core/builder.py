@@ -1,16 +1,23 @@
 """Skill packaging and distribution builder."""
 
 import hashlib
+import io
 import json
-import re
+import os
 import tarfile
 import tempfile
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
+from sutras.core.archive import COMPRESSIONS, compression_writer
+from sutras.core.cache import sha256_file
+from sutras.core.semver import SEMVER_PATTERN
 from sutras.core.skill import Skill
 
+CHUNK_SIZE = 1024 * 1024
+
 
 class BuildError(Exception):
     """Raised when skill build fails."""
@@ -19,11 +26,83 @@ class BuildError(Exception):
 
 
 class SkillBuilder:
-    """Builds distributable packages from skills."""
+    """Builds distributable packages from skills.
+
+    In reproducible mode the same source always produces a byte-identical
+    tarball: every timestamp (tar entries, gzip header and MANIFEST.json) is
+    taken from ``SOURCE_DATE_EPOCH`` or a fixed default, entries are sorted,
+    and ownership and permissions are normalised. Setting ``SOURCE_DATE_EPOCH``
+    enables reproducible mode on its own.
+
+    Packages are gzip-compressed by default; ``compression`` selects xz, zstd
+    or an uncompressed tar instead, and ``compression_level`` trades build time
+    for size.
+    """
+
+    # 1980-01-01T00:00:00Z, the earliest timestamp every archive format can hold
+    DEFAULT_SOURCE_DATE_EPOCH = 315532800
+
+    def __init__(
+        self,
+        skill: Skill,
+        output_dir: Path | None = None,
+        reproducible: bool = False,
+        source_date_epoch: int | None = None,
+        compression: str = "gz",
+        compression_level: int | None = None,
+    ):
+        if compression not in COMPRESSIONS:
+            raise BuildError(
+                f"Unknown compression '{compression}'. Use one of: {', '.join(COMPRESSIONS)}"
+            )
+        try:
+            COMPRESSIONS[compression].validate_level(compression_level)
+        except ValueError as e:
+            raise BuildError(str(e))
 
-    def __init__(self, skill: Skill, output_dir: Path | None = None):
         self.skill = skill
+        self.compression = compression
+        self.compression_level = compression_level
         self.output_dir = output_dir or Path.cwd() / "dist"
+        self.reproducible = (
+            reproducible or source_date_epoch is not None or "SOURCE_DATE_EPOCH" in os.environ
+        )
+        self._source_date_epoch = source_date_epoch
+        self.from_cache = False
+        self.checksum: str | None = None
+
+    def source_date_epoch(self) -> int:
+        """Get the timestamp used for reproducible builds.
+
+        Returns:
+            Seconds since the epoch, from the constructor, ``SOURCE_DATE_EPOCH``
+            or the fixed default, in that order
+
+        Raises:
+            BuildError: If ``SOURCE_DATE_EPOCH`` is not a non-negative integer
+        """
+        if self._source_date_epoch is not None:
+            return self._source_date_epoch
+
+        value = os.environ.get("SOURCE_DATE_EPOCH")
+        if value is None:
+            return self.DEFAULT_SOURCE_DATE_EPOCH
+        if not value.strip().isdigit():
+            raise BuildError(f"Invalid SOURCE_DATE_EPOCH '{value}': must be a non-negative integer")
+        return int(value)
+
+    def _build_time(self) -> datetime:
+        if self.reproducible:
+            return datetime.fromtimestamp(self.source_date_epoch(), UTC)
+        return datetime.now(UTC)
+
+    def _normalize(self, tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+        """Strip host-specific metadata from a tar entry."""
+        tarinfo.mtime = self.source_date_epoch()
+        tarinfo.uid = tarinfo.gid = 0
+        tarinfo.uname = tarinfo.gname = ""
+        tarinfo.mode = 0o755 if tarinfo.isdir() or tarinfo.mode & 0o111 else 0o644
+        return tarinfo
 
     def validate_version(self, version: str) -> bool:
         """Validate semantic version format.
@@ -37,8 +116,7 @@ class SkillBuilder:
         Raises:
             BuildError: If version is invalid
         """
-        semver_pattern = r"^(\d+)\.(\d+)\.(\d+)(?:-([a-zA-Z0-9.-]+))?(?:\+([a-zA-Z0-9.-]+))?$"
-        if not re.match(semver_pattern, version):
+        if not SEMVER_PATTERN.match(version):
             raise BuildError(
                 f"Invalid version '{version}'. Must follow semver format "
                 f"(e.g., 1.0.0, 1.0.0-beta, 1.0.0+build)"
@@ -90,7 +168,7 @@ class SkillBuilder:
         """
         sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
                 sha256.update(chunk)
         return sha256.hexdigest()
 
@@ -106,7 +184,7 @@ class SkillBuilder:
             "description": self.skill.description,
             "author": self.skill.abi.author if self.skill.abi else None,
             "license": self.skill.abi.license if self.skill.abi else None,
-            "build_timestamp": datetime.now(UTC).isoformat(),
+            "build_timestamp": self._build_time().isoformat(),
             "files": {},
         }
 
@@ -126,14 +204,71 @@ class SkillBuilder:
 
         return manifest
 
-    def build(self, validate: bool = True) -> Path:
+    def package_path(self) -> Path:
+        """Get the path the package is built to."""
+        version = self.skill.abi.version if self.skill.abi else "0.0.0"
+        extension = COMPRESSIONS[self.compression].extension
+        return self.output_dir / f"{self.skill.name}-{version}{extension}"
+
+    def collect_files(self) -> list[tuple[str, Path]]:
+        """Get the files that go into the package.
+
+        Returns:
+            Sorted list of (name in package, source path)
+        """
+        files_to_package = [
+            ("SKILL.md", self.skill.path / "SKILL.md"),
+        ]
+
+        if (self.skill.path / "sutras.yaml").exists():
+            files_to_package.append(("sutras.yaml", self.skill.path / "sutras.yaml"))
+
+        # Supporting files cover the whole skill tree, so keep out earlier
+        # packages when the output directory is inside the skill.
+        skill_root = self.skill.path.resolve()
+        package_path = self.package_path().resolve()
+        excluded: tuple[str, ...] = ()
+        if package_path.is_relative_to(skill_root):
+            package_name = package_path.relative_to(skill_root).as_posix()
+            output_dir = self.output_dir.resolve().relative_to(skill_root).as_posix()
+            record_name = Path(package_name).with_name(BuildCache.record_name(package_path.name))
+            excluded = (package_name, record_name.as_posix())
+            if output_dir != ".":
+                excluded += (f"{output_dir}/",)
+
+        for filename, filepath in self.skill.supporting_files.items():
+            if excluded and filename.startswith(excluded):
+                continue
+            files_to_package.append((filename, filepath))
+
+        return sorted((name, path) for name, path in files_to_package if path.exists())
+
+    def build_options(self) -> dict[str, Any]:
+        """Get the options that affect the package bytes, for the build cache."""
+        options: dict[str, Any] = {
+            "compression": self.compression,
+            "compression_level": COMPRESSIONS[self.compression].validate_level(
+                self.compression_level
+            ),
+            "reproducible": self.reproducible,
+        }
+        if self.reproducible:
+            options["source_date_epoch"] = self.source_date_epoch()
+        return options
+
+    def build(self, validate: bool = True, use_cache: bool = True) -> Path:
         """Build distributable package.
 
+        If the package from an earlier build is still in the output directory
+        and neither the packaged files nor the build options have changed, it
+        is reused instead of being rebuilt; ``from_cache`` tells which happened.
+
         Args:
             validate: Whether to validate before building
+            use_cache: Whether an up-to-date earlier package may be reused
 
         Returns:
-            Path to created package
+            Path to created package (its SHA256 is left in ``checksum``)
 
         Raises:
             BuildError: If validation fails or build fails
@@ -143,43 +278,228 @@ class SkillBuilder:
             if errors:
                 raise BuildError("Validation failed:\n" + "\n".join(f"  - {e}" for e in errors))
 
-        version = self.skill.abi.version if self.skill.abi else "0.0.0"
-        package_name = f"{self.skill.name}-{version}.tar.gz"
-        package_path = self.output_dir / package_name
+        package_path = self.package_path()
+        package_path.parent.mkdir(parents=True, exist_ok=True)
+
+        files_to_package = self.collect_files()
+        cache = BuildCache(package_path)
+        inputs = cache.digest(files_to_package, self.build_options()) if use_cache else None
+        self.from_cache = inputs is not None and cache.is_fresh(inputs.digest)
+        if self.from_cache:
+            self.checksum = cache.checksum
+            cache.save(inputs, cache.checksum)  # remembers new stats of touched files
+            return package_path
+
+        manifest = self.create_manifest()
+
+        # tarfile.open(..., "w:gz") stamps the gzip header with the current
+        # time, so the compression layer is opened here to control it.
+        mtime = self.source_date_epoch() if self.reproducible else None
+        try:
+            with (
+                open(package_path, "wb") as f,
+                _HashingWriter(f) as raw,
+                compression_writer(raw, self.compression, self.compression_level, mtime) as stream,
+                tarfile.open(fileobj=stream, mode="w", copybufsize=CHUNK_SIZE) as tar,
+            ):
+                self._add_dir(tar, self.skill.name)
+                added_dirs = {self.skill.name}
+
+                for dest_name, src_path in files_to_package:
+                    parts = dest_name.split("/")
+                    for i in range(1, len(parts)):
+                        subdir = "/".join([self.skill.name, *parts[:i]])
+                        if subdir not in added_dirs:
+                            self._add_dir(tar, subdir)
+                            added_dirs.add(subdir)
+                    arcname = f"{self.skill.name}/{dest_name}"
+                    manifest["files"][dest_name] = self._add_file(tar, src_path, arcname)
+
+                data = json.dumps(manifest, indent=2).encode()
+                info = self._tarinfo(f"{self.skill.name}/MANIFEST.json", len(data))
+                tar.addfile(info, io.BytesIO(data))
+        except ImportError as e:
+            package_path.unlink(missing_ok=True)
+            raise BuildError(str(e))
+        except BaseException:
+            package_path.unlink(missing_ok=True)
+            raise
+
+        self.checksum = raw.sha256.hexdigest()
+        if inputs is not None:
+            cache.save(inputs, self.checksum)
+        return package_path
 
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    def _tarinfo(self, arcname: str, size: int = 0, directory: bool = False) -> tarfile.TarInfo:
+        """Create an entry for content generated by the build itself."""
+        info = tarfile.TarInfo(arcname)
+        info.size = size
+        info.mtime = int(self._build_time().timestamp())
+        if directory:
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+        else:
+            info.mode = 0o644
+        return info
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            skill_dir = tmpdir_path / self.skill.name
+    def _add_dir(self, tar: tarfile.TarFile, arcname: str) -> None:
+        tar.addfile(self._tarinfo(arcname, directory=True))
 
-            skill_dir.mkdir(parents=True, exist_ok=True)
+    def _add_file(self, tar: tarfile.TarFile, src_path: Path, arcname: str) -> dict[str, Any]:
+        """Stream a source file into the archive, hashing it on the same read.
 
-            manifest = self.create_manifest()
+        Returns:
+            The file's manifest entry
+        """
+        with open(src_path, "rb") as f:
+            info = tar.gettarinfo(arcname=arcname, fileobj=f)
+            if self.reproducible:
+                info = self._normalize(info)
+            reader = _HashingReader(f)
+            tar.addfile(info, reader)
+        return {"size": info.size, "checksum": reader.sha256.hexdigest()}
 
-            files_to_package = [
-                ("SKILL.md", self.skill.path / "SKILL.md"),
-            ]
 
-            if (self.skill.path / "sutras.yaml").exists():
-                files_to_package.append(("sutras.yaml", self.skill.path / "sutras.yaml"))
+@dataclass
+class BuildInputs:
+    """Content digest of everything that goes into a package."""
 
-            for filename, filepath in self.skill.supporting_files.items():
-                files_to_package.append((filename, filepath))
+    digest: str
+    files: dict[str, dict[str, Any]]
 
-            for dest_name, src_path in files_to_package:
-                if src_path.exists():
-                    dest_path = skill_dir / dest_name
-                    dest_path.write_bytes(src_path.read_bytes())
-                    manifest["files"][dest_name] = {
-                        "size": src_path.stat().st_size,
-                        "checksum": self.calculate_checksum(src_path),
-                    }
 
-            manifest_path = skill_dir / "MANIFEST.json"
-            manifest_path.write_text(json.dumps(manifest, indent=2))
+class BuildCache:
+    """Records which inputs produced a package, so unchanged skills are not rebuilt.
 
-            with tarfile.open(package_path, "w:gz") as tar:
-                tar.add(skill_dir, arcname=self.skill.name)
+    The record lives next to the package as ``.<package>.json`` and holds the
+    digest of the packaged files and build options, the package's size, mtime
+    and checksum, and the stat and digest of every source file. A source file whose
+    size, mtime and inode are unchanged reuses its recorded digest, so checking
+    an unchanged skill costs only stats.
+    """
 
-        return package_path
+    VERSION = 1
+
+    def __init__(self, package_path: Path):
+        self.package_path = package_path
+        self.record_path = package_path.with_name(self.record_name(package_path.name))
+        self._record = self._load()
+
+    @staticmethod
+    def record_name(package_name: str) -> str:
+        """Get the file name of the record kept next to a package."""
+        return f".{package_name}.json"
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            record = json.loads(self.record_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return record if record.get("version") == self.VERSION else {}
+
+    def digest(self, files: list[tuple[str, Path]], options: dict[str, Any]) -> BuildInputs:
+        """Digest the packaged files and build options.
+
+        Args:
+            files: Sorted (name in package, source path) pairs
+            options: Build options that affect the package bytes
+
+        Returns:
+            Digest of the inputs and the per-file stats to record
+        """
+        known = self._record.get("files", {})
+        sha256 = hashlib.sha256(json.dumps(options, sort_keys=True).encode())
+        stats: dict[str, dict[str, Any]] = {}
+
+        for name, path in files:
+            st = path.stat()
+            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+            previous = known.get(name)
+            if previous and all(previous.get(k) == v for k, v in entry.items()):
+                entry["digest"] = previous["digest"]
+            else:
+                entry["digest"] = sha256_file(path)
+            stats[name] = entry
+            sha256.update(f"{name}\t{entry['digest']}\n".encode())
+
+        return BuildInputs(digest=sha256.hexdigest(), files=stats)
+
+    def is_fresh(self, digest: str) -> bool:
+        """Check that the package exists and was built from these inputs."""
+        if self._record.get("inputs") != digest:
+            return False
+        try:
+            st = self.package_path.stat()
+        except FileNotFoundError:
+            return False
+        package = self._record.get("package", {})
+        return (
+            package.get("size") == st.st_size
+            and package.get("mtime_ns") == st.st_mtime_ns
+            and package.get("sha256") is not None
+        )
+
+    @property
+    def checksum(self) -> str | None:
+        """SHA256 of the recorded package."""
+        return self._record.get("package", {}).get("sha256")
+
+    def save(self, inputs: BuildInputs, checksum: str | None) -> None:
+        """Record the inputs the package was built from."""
+        st = self.package_path.stat()
+        record = {
+            "version": self.VERSION,
+            "inputs": inputs.digest,
+            "package": {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": checksum},
+            "files": inputs.files,
+        }
+        if record == self._record:
+            return
+        self._record = record
+        fd, tmp = tempfile.mkstemp(dir=self.record_path.parent, prefix=".build-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._record, f)
+            os.replace(tmp, self.record_path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+class _HashingReader:
+    """File wrapper that hashes everything read through it."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.f.read(size)
+        self.sha256.update(data)
+        return data
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written through it."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.written += len(data)
+        return self.f.write(data)
+
+    def tell(self) -> int:
+        return self.written
+
+    def flush(self) -> None:
+        self.f.flush()
+
+    def __enter__(self) -> "_HashingWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
@@ -0,0 +1,239 @@
+"""Content-addressable download cache for Sutras.
+
+Stores downloaded skill tarballs under ~/.sutras/downloads/ keyed by their
+SHA256 checksum, with a URL index for downloads whose checksum is not known
+up front. Blobs are evicted least-recently-used first once the cache grows
+past its size limit.
+
+Layout:
+    blobs/<aa>/<sha256>   tarball contents, named by digest
+    urls/<sha256(url)>    digest of the blob last downloaded from that URL
+    partial/<sha256(url)> interrupted download of that URL, resumed next time
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+    """Calculate the SHA256 hex digest of a file."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A blob stored in the download cache."""
+
+    digest: str
+    path: Path
+    size: int
+    last_used: float
+
+
+class DownloadCache:
+    """Content-addressable store of downloaded tarballs with LRU eviction."""
+
+    DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path, max_size: int | None = None):
+        self.cache_dir = cache_dir
+        self.max_size = self.DEFAULT_MAX_SIZE if max_size is None else max_size
+        self.blobs_dir = cache_dir / "blobs"
+        self.urls_dir = cache_dir / "urls"
+
+    def blob_path(self, digest: str) -> Path:
+        """Get the storage path for a digest."""
+        return self.blobs_dir / digest[:2] / digest
+
+    def partial_path(self, url: str) -> Path:
+        """Get the path where a download of ``url`` in progress is kept."""
+        partial_dir = self.cache_dir / "partial"
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        return partial_dir / hashlib.sha256(url.encode()).hexdigest()
+
+    def discard_partial(self, url: str) -> None:
+        """Drop a partial download of ``url`` and its resume metadata."""
+        path = self.partial_path(url)
+        path.unlink(missing_ok=True)
+        path.with_name(path.name + ".meta").unlink(missing_ok=True)
+
+    def _url_path(self, url: str) -> Path:
+        return self.urls_dir / hashlib.sha256(url.encode()).hexdigest()
+
+    def _touch(self, path: Path) -> None:
+        """Mark a blob as recently used."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get(self, checksum: str | None = None, url: str | None = None) -> Path | None:
+        """Look up a cached tarball.
+
+        The checksum is preferred; the URL index is only consulted when no
+        checksum is known.
+
+        Args:
+            checksum: Expected SHA256 checksum
+            url: URL the tarball was downloaded from
+
+        Returns:
+            Path to the cached blob, or None on a miss
+        """
+        digest = checksum
+        if digest is None and url is not None:
+            url_path = self._url_path(url)
+            if url_path.exists():
+                digest = url_path.read_text().strip()
+
+        if not digest:
+            return None
+
+        path = self.blob_path(digest)
+        if not path.exists():
+            return None
+
+        self._touch(path)
+        return path
+
+    def put(self, source: Path, url: str | None = None, digest: str | None = None) -> Path:
+        """Move a downloaded file into the cache.
+
+        Args:
+            source: File to store; it is moved, not copied
+            url: URL it was downloaded from, recorded in the URL index
+            digest: SHA256 of the file if already known
+
+        Returns:
+            Path to the cached blob
+        """
+        digest = digest or sha256_file(source)
+        path = self.blob_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.exists():
+            source.unlink()
+        else:
+            # Stage next to the final path so the blob appears atomically,
+            # even when the source lives on another filesystem.
+            staging = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.move(source, staging)
+            os.replace(staging, path)
+        self._touch(path)
+
+        if url is not None:
+            self._record_url(url, digest)
+
+        return path
+
+    def _record_url(self, url: str, digest: str) -> None:
+        """Point a URL at a blob, replacing any earlier mapping atomically."""
+        self.urls_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.urls_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(digest)
+        os.replace(tmp_name, self._url_path(url))
+
+    def entries(self) -> list[CacheEntry]:
+        """List cached blobs, least recently used first."""
+        if not self.blobs_dir.exists():
+            return []
+
+        entries = []
+        for path in self.blobs_dir.glob("*/*"):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            stat = path.stat()
+            entries.append(
+                CacheEntry(digest=path.name, path=path, size=stat.st_size, last_used=stat.st_mtime)
+            )
+        entries.sort(key=lambda e: e.last_used)
+        return entries
+
+    def total_size(self) -> int:
+        """Total size of cached blobs in bytes."""
+        return sum(e.size for e in self.entries())
+
+    def remove(self, digest: str) -> None:
+        """Remove a blob from the cache."""
+        self.blob_path(digest).unlink(missing_ok=True)
+
+    def prune(self, max_size: int | None = None, max_age: float | None = None) -> tuple[int, int]:
+        """Evict blobs until the cache fits within its budget.
+
+        Args:
+            max_size: Size limit in bytes (default: the cache's max_size)
+            max_age: Also evict blobs unused for this many seconds
+
+        Returns:
+            Tuple of (blobs_removed, bytes_freed)
+        """
+        limit = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        total = sum(e.size for e in entries)
+        cutoff = time.time() - max_age if max_age is not None else None
+
+        removed = 0
+        freed = 0
+        for entry in entries:
+            too_old = cutoff is not None and entry.last_used < cutoff
+            if total <= limit and not too_old:
+                continue
+            entry.path.unlink(missing_ok=True)
+            total -= entry.size
+            freed += entry.size
+            removed += 1
+
+        if removed:
+            self.prune_url_index()
+        return removed, freed
+
+    def prune_url_index(self) -> None:
+        """Drop URL index entries whose blobs are gone."""
+        if not self.urls_dir.exists():
+            return
+        for url_path in self.urls_dir.iterdir():
+            try:
+                digest = url_path.read_text().strip()
+            except OSError:
+                continue
+            if not self.blob_path(digest).exists():
+                url_path.unlink(missing_ok=True)
+
+    def verify(self, remove: bool = True) -> list[str]:
+        """Re-hash every blob and find ones whose contents do not match their name.
+
+        Args:
+            remove: Whether to delete corrupted blobs
+
+        Returns:
+            Digests of corrupted blobs
+        """
+        corrupted = []
+        for entry in self.entries():
+            if sha256_file(entry.path) != entry.digest:
+                corrupted.append(entry.digest)
+                if remove:
+                    entry.path.unlink(missing_ok=True)
+
+        if corrupted and remove:
+            self.prune_url_index()
+        return corrupted
+
+    def clear(self) -> None:
+        """Remove everything from the cache."""
+        for directory in (self.blobs_dir, self.urls_dir, self.cache_dir / "partial"):
+            if directory.exists():
+                shutil.rmtree(directory)
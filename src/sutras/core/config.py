@@ -29,6 +29,20 @@ class GlobalConfig(BaseModel):
     default_registry: str | None = Field(None, description="Default registry for publishing")
     cache_dir: str | None = Field(None, description="Custom cache directory")
     skills_dir: str | None = Field(None, description="Custom skills installation directory")
+    store_dir: str | None = Field(None, description="Custom shared skill store directory")
+    install_link_mode: str = Field(
+        "auto", description="How installs link from the store: auto, reflink, hardlink or copy"
+    )
+    download_cache_max_size: int | None = Field(
+        None, description="Download cache size limit in bytes"
+    )
+    http_max_connections_per_host: int = Field(
+        8, description="Maximum concurrent HTTP connections per host"
+    )
+    http_timeout: float = Field(30.0, description="HTTP request timeout in seconds")
+    lockfile_format: str | None = Field(
+        None, description="Format for new .sutras.lock files: yaml or json (default: yaml)"
+    )
 
 
 class SutrasConfig:
@@ -118,6 +132,28 @@ class SutrasConfig:
             return Path(self.config.cache_dir)
         return self.DEFAULT_CACHE_DIR
 
+    def get_resolution_cache_dir(self) -> Path:
+        """Get the dependency resolution cache directory."""
+        return self.config_path.parent / "resolution-cache"
+
+    def get_download_cache_dir(self) -> Path:
+        """Get the tarball download cache directory."""
+        return self.config_path.parent / "downloads"
+
+    def get_locks_dir(self) -> Path:
+        """Get the directory holding cross-process install locks."""
+        return self.config_path.parent / "locks"
+
+    def get_state_db_path(self) -> Path:
+        """Get the install-state database."""
+        return self.config_path.parent / "state.db"
+
+    def get_store_dir(self) -> Path:
+        """Get the shared store of extracted skill versions."""
+        if self.config.store_dir:
+            return Path(self.config.store_dir)
+        return self.config_path.parent / "store"
+
     def get_installed_dir(self) -> Path:
         """Get the installed skills directory."""
         if self.config.skills_dir:
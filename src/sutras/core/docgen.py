@@ -106,7 +106,8 @@ def generate_docs(skill: Skill, include_supporting: bool = True) -> str:
     if include_supporting and skill.supporting_files:
         for filename in sorted(skill.supporting_files.keys()):
             filepath = skill.supporting_files[filename]
-            if not filepath.suffix == ".md":
+            # Only top-level markdown; nested files are scripts, templates, fixtures...
+            if "/" in filename or not filepath.suffix == ".md":
                 continue
             try:
                 content = filepath.read_text().strip()
@@ -0,0 +1,235 @@
+"""Garbage collection for installed skills and cached tarballs.
+
+Installed versions are kept when they are reachable from a root:
+
+- every skill pinned in a project lockfile (.sutras.lock)
+- the version each skills-directory symlink currently points at, unless
+  it was only installed as a dependency and everything that needed it has
+  been uninstalled
+- the most recently installed version of each explicitly installed skill
+
+and from there, through the dependencies recorded in the install-state
+database. Everything else under the installed directory is removed, along
+with download-cache blobs and store entries no kept install or lockfile
+refers to. Space is counted per inode, so hardlinked store files and
+installs are not counted twice.
+"""
+
+import os
+import shutil
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .installer import SkillInstaller
+from .lockfile import LockfileManager
+from .state import InstalledVersion
+
+
+@dataclass
+class GCReport:
+    """What a garbage collection run removed (or would remove)."""
+
+    versions: list[InstalledVersion] = field(default_factory=list)
+    blobs: list[str] = field(default_factory=list)
+    store_entries: list[str] = field(default_factory=list)
+    freed: int = 0
+    dry_run: bool = False
+
+
+def _disk_usage(paths: list[Path]) -> int:
+    """Bytes used by the files under ``paths``, counting each inode once."""
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    for root in paths:
+        if root.is_file():
+            walk = [(str(root.parent), [], [root.name])]
+        else:
+            walk = os.walk(root)
+        for dirpath, _, filenames in walk:
+            for filename in filenames:
+                st = os.lstat(os.path.join(dirpath, filename))
+                if (st.st_dev, st.st_ino) in seen:
+                    continue
+                seen.add((st.st_dev, st.st_ino))
+                total += st.st_size
+    return total
+
+
+def _installed_at(installed: InstalledVersion) -> float:
+    try:
+        return datetime.fromisoformat(installed.installed_at).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class GarbageCollector:
+    """Finds and removes installed versions and cached tarballs nothing needs."""
+
+    def __init__(self, installer: SkillInstaller, project_paths: list[Path] | None = None):
+        self.installer = installer
+        self.project_paths = project_paths or [installer.lockfile_manager.project_path]
+
+    def _locked(self) -> list[tuple[str, str, str | None]]:
+        """(name, version, checksum) of every skill pinned in the project lockfiles."""
+        locked = []
+        for project_path in self.project_paths:
+            manager = LockfileManager(project_path)
+            if manager.exists():
+                for skill in manager.load().skills.values():
+                    locked.append((skill.name, skill.version, skill.checksum))
+        return locked
+
+    def _linked(self, installs: list[InstalledVersion]) -> dict[tuple[str, str], list[Path]]:
+        """Map the versions skills-directory symlinks point at to those symlinks."""
+        by_dir = {(item.fs_name, item.version): (item.name, item.version) for item in installs}
+        installed_dir = self.installer.installed_dir.resolve()
+        linked: dict[tuple[str, str], list[Path]] = {}
+        skills_dir = self.installer.skills_dir
+        for link in skills_dir.iterdir() if skills_dir.exists() else []:
+            if not link.is_symlink():
+                continue
+            target = link.resolve()
+            if target.parent.parent != installed_dir:
+                continue
+            key = by_dir.get((target.parent.name, target.name))
+            if key:
+                linked.setdefault(key, []).append(link)
+        return linked
+
+    def _orphaned(self, item: InstalledVersion, installed_names: set[str]) -> bool:
+        """Whether a dependency-only install has outlived everything that needed it."""
+        if item.explicit:
+            return False
+        dependents = self.installer.state.dependents(item.name, item.version)
+        return bool(dependents) and not installed_names.intersection(dependents)
+
+    def roots(self, installs: list[InstalledVersion]) -> set[tuple[str, str]]:
+        """Versions kept regardless of dependencies."""
+        roots = {(name, version) for name, version, _ in self._locked()}
+
+        by_key = {(item.name, item.version): item for item in installs}
+        installed_names = {item.name for item in installs}
+        roots |= {
+            key
+            for key in self._linked(installs)
+            if not self._orphaned(by_key[key], installed_names)
+        }
+
+        latest: dict[str, InstalledVersion] = {}
+        for item in installs:
+            if item.explicit and (
+                item.name not in latest or _installed_at(item) >= _installed_at(latest[item.name])
+            ):
+                latest[item.name] = item
+        roots |= {(item.name, item.version) for item in latest.values()}
+        return roots
+
+    def reachable(self, installs: list[InstalledVersion]) -> set[tuple[str, str]]:
+        """Roots plus everything they depend on, transitively."""
+        state = self.installer.state
+        reachable = self.roots(installs)
+        queue = deque(reachable)
+        while queue:
+            name, _ = queue.popleft()
+            for dep in state.dependencies(name):
+                if dep not in reachable:
+                    reachable.add(dep)
+                    queue.append(dep)
+        return reachable
+
+    def collect(
+        self,
+        max_age: float | None = None,
+        max_size: int | None = None,
+        dry_run: bool = False,
+    ) -> GCReport:
+        """Remove unreachable installs, then unreferenced cache blobs and store entries.
+
+        Args:
+            max_age: Only remove versions installed, and blobs last used, at
+                least this many seconds ago (default: no grace period)
+            max_size: Size budget in bytes for the blobs still referenced;
+                least recently used ones are evicted beyond it (default: the
+                configured download_cache_max_size)
+            dry_run: Report what would be removed without removing anything
+
+        Returns:
+            Report of what was removed and the space reclaimed
+        """
+        installer = self.installer
+        if dry_run:
+            installs = installer.state.reconciled(installer.installed_dir)
+        else:
+            installer.reconcile()
+            installs = installer.state.all()
+        reachable = self.reachable(installs)
+        cutoff = time.time() - max_age if max_age is not None else None
+
+        report = GCReport(dry_run=dry_run)
+        for item in installs:
+            if (item.name, item.version) in reachable:
+                continue
+            if cutoff is not None and _installed_at(item) > cutoff:
+                continue
+            report.versions.append(item)
+
+        removed = {(item.name, item.version) for item in report.versions}
+        referenced = {checksum for _, _, checksum in self._locked() if checksum}
+        referenced |= {
+            item.checksum
+            for item in installs
+            if item.checksum and (item.name, item.version) not in removed
+        }
+
+        cache = installer.download_cache
+        entries = cache.entries()
+        budget = cache.max_size if max_size is None else max_size
+        kept_size = sum(e.size for e in entries if e.digest in referenced)
+        for entry in entries:
+            if entry.digest not in referenced:
+                if cutoff is None or entry.last_used <= cutoff:
+                    report.blobs.append(entry.digest)
+            elif kept_size > budget:
+                report.blobs.append(entry.digest)
+                kept_size -= entry.size
+
+        report.store_entries = [
+            entry.name for entry in installer.store.entries() if entry.name not in referenced
+        ]
+
+        report.freed = _disk_usage(
+            [item.install_dir for item in report.versions]
+            + [cache.blob_path(digest) for digest in report.blobs]
+            + [installer.store.entry_path(digest) for digest in report.store_entries]
+        )
+
+        if not dry_run:
+            self._remove(report)
+        return report
+
+    def _remove(self, report: GCReport) -> None:
+        installer = self.installer
+        for item in report.versions:
+            with installer._version_lock(item.name, item.version):
+                # An install may have re-activated this version while we waited.
+                current = installer.state.get(item.name, item.version)
+                if current is None or current.installed_at != item.installed_at:
+                    continue
+                for link in self._linked([item]).get((item.name, item.version), []):
+                    link.unlink(missing_ok=True)
+                shutil.rmtree(item.install_dir, ignore_errors=True)
+                installer.state.remove(item.name, item.version)
+                skill_dir = item.install_dir.parent
+                if skill_dir.exists() and not any(skill_dir.iterdir()):
+                    skill_dir.rmdir()
+
+        for digest in report.blobs:
+            installer.download_cache.remove(digest)
+        if report.blobs:
+            installer.download_cache.prune_url_index()
+
+        for digest in report.store_entries:
+            installer.store.remove(digest)
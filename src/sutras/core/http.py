@@ -0,0 +1,434 @@
+"""HTTP client and downloads for Sutras.
+
+Provides a shared HTTP client and resumable, retried file downloads:
+- Per-host pools of keep-alive connections, so bulk installs from one host
+  reuse TCP/TLS sessions instead of reconnecting for every tarball
+- Per-host concurrency limits and request timeouts
+- Streaming to disk with incremental SHA256 hashing
+- Resuming partial files with HTTP Range requests, guarded by If-Range
+  (ETag or Last-Modified) so a changed file is never spliced onto old bytes
+- Retrying transient failures with exponential backoff and jitter
+"""
+
+import hashlib
+import http.client
+import json
+import random
+import ssl
+import threading
+import time
+import urllib.error
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+from .cache import CHUNK_SIZE
+from .config import SutrasConfig
+
+# Client errors that are worth retrying; anything else in 4xx is permanent.
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+REDIRECT_STATUS = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 10
+USER_AGENT = "sutras"
+
+
+@dataclass
+class DownloadProgress:
+    """Progress of a download, reported after each chunk."""
+
+    url: str
+    downloaded: int
+    total: int | None
+    bytes_per_second: float
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how patiently to retry a failed download."""
+
+    attempts: int = 5
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    jitter: float = 0.25
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        base = min(self.max_backoff, self.backoff * (2**attempt))
+        return base * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+class DownloadError(Exception):
+    """Raised when a download fails permanently or runs out of retries."""
+
+    pass
+
+
+class HTTPStatusError(Exception):
+    """Raised when a server answers with an error status."""
+
+    def __init__(self, url: str, status: int, reason: str = ""):
+        self.url = url
+        self.status = status
+        super().__init__(f"HTTP {status} {reason}".strip() + f" for {url}")
+
+
+class HttpClient:
+    """Thread-safe HTTP client with per-host keep-alive connection pools.
+
+    Idle connections are kept per (scheme, host, port) and reused by the next
+    request to that host. A per-host semaphore caps how many requests run
+    against one host at once. Requests that must go through a proxy, and
+    non-HTTP URLs such as ``file://``, are delegated to ``urlopen``.
+    """
+
+    def __init__(self, max_connections_per_host: int = 8, timeout: float = 30.0):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._limits: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+
+    def _host_key(self, url: str) -> tuple[str, str, int]:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return parts.scheme, parts.hostname or "", port
+
+    def _limit(self, key: tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._limits:
+                self._limits[key] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self._limits[key]
+
+    def _checkout(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection for a host, or create one.
+
+        Returns:
+            Tuple of (connection, reused)
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                host, port, timeout=self.timeout, context=self._ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        return conn, False
+
+    def _checkin(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_connections_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _uses_proxy(self, url: str) -> bool:
+        parts = urlsplit(url)
+        return parts.scheme in getproxies() and not proxy_bypass(parts.hostname or "")
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _send(
+        self,
+        key: tuple[str, str, int],
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request, retrying once on a fresh connection if a pooled one went stale."""
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        while True:
+            conn, reused = self._checkout(key)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request(method, target, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+    @contextmanager
+    def open(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+        timeout: float | None = None,
+    ) -> Iterator[Any]:
+        """Open a URL and yield the response, following redirects.
+
+        The connection goes back to its host's pool when the body was read to
+        the end, and is closed otherwise.
+
+        Args:
+            url: URL to request
+            headers: Extra request headers
+            method: HTTP method
+            timeout: Socket timeout in seconds (default: the client's timeout)
+
+        Yields:
+            Response object with ``status``, ``headers`` and ``read()``
+
+        Raises:
+            HTTPStatusError: If the final response has an error status
+        """
+        headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        timeout = self.timeout if timeout is None else timeout
+
+        if urlsplit(url).scheme not in ("http", "https") or self._uses_proxy(url):
+            try:
+                with urlopen(
+                    Request(url, headers=headers, method=method), timeout=timeout
+                ) as response:
+                    yield response
+            except urllib.error.HTTPError as e:
+                raise HTTPStatusError(url, e.code, str(e.reason)) from e
+            return
+
+        for _ in range(MAX_REDIRECTS + 1):
+            key = self._host_key(url)
+            limit = self._limit(key)
+            limit.acquire()
+            try:
+                conn, response = self._send(key, method, url, headers, timeout)
+                try:
+                    location = response.headers.get("Location")
+                    if response.status in REDIRECT_STATUS and location:
+                        response.read()
+                        url = urljoin(url, location)
+                        if response.status == 303:
+                            method = "GET"
+                        continue
+                    if response.status >= 400:
+                        response.read()
+                        raise HTTPStatusError(url, response.status, response.reason)
+                    yield response
+                finally:
+                    if response.isclosed() and not response.will_close:
+                        self._checkin(key, conn)
+                    else:
+                        conn.close()
+            finally:
+                limit.release()
+            return
+
+        raise HTTPStatusError(url, 310, "Too many redirects")
+
+    def get_json(
+        self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None
+    ) -> Any:
+        """Fetch and decode a JSON document."""
+        headers = {"Accept": "application/json", **(headers or {})}
+        with self.open(url, headers, timeout=timeout) as response:
+            return json.loads(response.read().decode())
+
+
+_default_client: HttpClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Get the process-wide shared HTTP client.
+
+    Pool size and timeout come from ``http_max_connections_per_host`` and
+    ``http_timeout`` in the global config.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            config = SutrasConfig().config
+            _default_client = HttpClient(
+                max_connections_per_host=config.http_max_connections_per_host,
+                timeout=config.http_timeout,
+            )
+        return _default_client
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, HTTPStatusError):
+        return error.status in RETRYABLE_STATUS
+    return isinstance(
+        error,
+        urllib.error.URLError
+        | http.client.HTTPException
+        | ConnectionError
+        | TimeoutError
+        | ssl.SSLError,
+    )
+
+
+def _load_validators(meta_path: Path, url: str) -> dict[str, str]:
+    """Read the ETag/Last-Modified recorded for a partial download of ``url``."""
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if meta.get("url") != url:
+        return {}
+    return {k: v for k, v in meta.items() if k in ("etag", "last_modified") and v}
+
+
+def _save_validators(meta_path: Path, url: str, headers) -> dict[str, str]:
+    validators = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+    validators = {k: v for k, v in validators.items() if v}
+    meta_path.write_text(json.dumps({"url": url, **validators}))
+    return validators
+
+
+def _content_range_start(value: str | None) -> int | None:
+    """Get the first byte position of a ``bytes start-end/total`` Content-Range."""
+    if not value:
+        return None
+    unit, _, spec = value.strip().partition(" ")
+    start, _, _ = spec.partition("-")
+    if unit.lower() != "bytes" or not start.isascii() or not start.isdigit():
+        return None
+    return int(start)
+
+
+def _hash_prefix(path: Path) -> "hashlib._Hash":
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256
+
+
+def download(
+    url: str,
+    dest: Path,
+    retry: RetryPolicy | None = None,
+    on_progress: Callable[[DownloadProgress], None] | None = None,
+    client: HttpClient | None = None,
+) -> str:
+    """Download ``url`` to ``dest``, resuming and retrying as needed.
+
+    If ``dest`` already holds a partial download with a recorded ETag or
+    Last-Modified validator, only the remaining bytes are requested. Servers
+    that ignore the Range header, report that the file changed, or answer
+    with a range that does not start where the partial file ends, get a full
+    restart. Validators are kept in a ``.meta`` file next to ``dest`` until
+    the caller moves the finished file away.
+
+    Args:
+        url: URL to download
+        dest: File to write (may already contain a partial download)
+        retry: Retry policy for transient failures
+        on_progress: Called after each chunk with progress details
+        client: HTTP client to use (default: the shared client)
+
+    Returns:
+        SHA256 hex digest of the complete file
+
+    Raises:
+        DownloadError: On permanent failure or when retries are exhausted
+    """
+    retry = retry or RetryPolicy()
+    client = client or get_client()
+    meta_path = dest.with_name(dest.name + ".meta")
+    last_error: Exception | None = None
+
+    for attempt in range(retry.attempts):
+        validators = _load_validators(meta_path, url)
+        offset = dest.stat().st_size if dest.exists() else 0
+
+        headers = {}
+        if offset and validators:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validators.get("etag") or validators["last_modified"]
+
+        try:
+            with client.open(url, headers) as response:
+                status = getattr(response, "status", None)
+                if headers and status == 206:
+                    content_range = response.headers.get("Content-Range")
+                    if _content_range_start(content_range) != offset:
+                        # Appending a range that starts elsewhere would corrupt the file.
+                        dest.unlink(missing_ok=True)
+                        meta_path.unlink(missing_ok=True)
+                        last_error = DownloadError(
+                            f"Server sent Content-Range {content_range!r} "
+                            f"for a request from byte {offset}"
+                        )
+                        continue
+                    sha256 = _hash_prefix(dest)
+                    mode = "ab"
+                else:
+                    sha256 = hashlib.sha256()
+                    offset = 0
+                    mode = "wb"
+
+                _save_validators(meta_path, url, response.headers)
+                length = response.headers.get("Content-Length")
+                total = offset + int(length) if length and length.isdigit() else None
+
+                downloaded = offset
+                started = time.monotonic()
+                with open(dest, mode) as f:
+                    while chunk := response.read(CHUNK_SIZE):
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        downloaded += len(chunk)
+
+                        if on_progress:
+                            elapsed = time.monotonic() - started
+                            rate = (downloaded - offset) / elapsed if elapsed > 0 else 0.0
+                            on_progress(DownloadProgress(url, downloaded, total, rate))
+
+                if total is not None and downloaded < total:
+                    raise http.client.IncompleteRead(b"", total - downloaded)
+
+            meta_path.unlink(missing_ok=True)
+            return sha256.hexdigest()
+
+        except HTTPStatusError as e:
+            if e.status == 416:
+                # Our partial file no longer lines up with the server's copy.
+                dest.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                last_error = e
+                continue
+            if not _is_retryable(e):
+                raise DownloadError(f"Failed to download {url}: HTTP {e.status}") from e
+            last_error = e
+        except Exception as e:
+            if not _is_retryable(e):
+                raise
+            last_error = e
+
+        if attempt + 1 < retry.attempts:
+            time.sleep(retry.delay(attempt))
+
+    raise DownloadError(
+        f"Failed to download {url} after {retry.attempts} attempts: {last_error}"
+    ) from last_error
@@ -0,0 +1,169 @@
+"""Ignore rules for the files packaged with a skill.
+
+A skill's supporting files are every file under its directory, except those
+excluded by the default rules below or by a ``.sutrasignore`` file at the
+skill root. ``.sutrasignore`` uses gitignore syntax:
+
+- Blank lines and lines starting with ``#`` are skipped
+- ``!pattern`` re-includes paths excluded by an earlier pattern
+- A trailing ``/`` matches directories only
+- A pattern containing ``/`` (other than a trailing one) is relative to the
+  skill root; otherwise it matches at any depth
+- ``*`` and ``?`` do not match ``/``; ``**`` matches across directories
+
+Patterns are compiled to regular expressions once. The tree is walked top
+down, and an ignored directory is pruned without being listed, so large
+excluded trees such as ``node_modules/`` cost a single match.
+"""
+
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+IGNORE_FILE = ".sutrasignore"
+
+DEFAULT_IGNORE = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "__pycache__/",
+    "*.py[cod]",
+    ".DS_Store",
+    "node_modules/",
+    ".venv/",
+    IGNORE_FILE,
+]
+
+
+def _translate(pattern: str) -> str:
+    """Translate the body of a gitignore pattern into a regular expression."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n:
+            parts.append(".*")
+            i += 2
+        elif c == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif c == "?":
+            parts.append("[^/]")
+            i += 1
+        elif c == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(c))
+            i += 1
+    return "".join(parts)
+
+
+class IgnoreMatcher:
+    """Compiled gitignore-style rules; the last matching rule wins."""
+
+    def __init__(self, patterns: list[str]):
+        self._rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for line in patterns:
+            rule = self._compile(line)
+            if rule:
+                self._rules.append(rule)
+        self._rules.reverse()
+
+    @staticmethod
+    def _compile(line: str) -> tuple[re.Pattern[str], bool, bool] | None:
+        line = line.rstrip("\n")
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        if not line or line.startswith("#"):
+            return None
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith(("\\!", "\\#")):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+
+        anchored = "/" in line
+        body = _translate(line.lstrip("/"))
+        regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+        return re.compile(regex), negate, dir_only
+
+    @classmethod
+    def for_directory(cls, root: Path) -> "IgnoreMatcher":
+        """Build the matcher for a skill: the defaults, then its .sutrasignore."""
+        patterns = list(DEFAULT_IGNORE)
+        ignore_file = root / IGNORE_FILE
+        if ignore_file.is_file():
+            patterns.extend(ignore_file.read_text().splitlines())
+        return cls(patterns)
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Check whether a path is ignored by its own rules.
+
+        Exclusion of a parent directory is not considered here; walk_files
+        handles it by never descending into ignored directories.
+
+        Args:
+            path: POSIX path relative to the root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path is ignored
+        """
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negate
+        return False
+
+
+def walk_files(root: Path, matcher: IgnoreMatcher) -> Iterator[tuple[str, Path]]:
+    """Yield every file under root that is not ignored.
+
+    Ignored directories are pruned rather than walked, and symlinked
+    directories are not followed.
+
+    Args:
+        root: Directory to walk
+        matcher: Ignore rules, relative to root
+
+    Yields:
+        Tuples of (POSIX path relative to root, path)
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        prefix = "" if rel_dir == "." else f"{rel_dir}/"
+
+        dirnames[:] = sorted(
+            d
+            for d in dirnames
+            if not os.path.islink(os.path.join(dirpath, d))
+            and not matcher.match(prefix + d, is_dir=True)
+        )
+        for name in sorted(filenames):
+            rel = prefix + name
+            path = Path(dirpath) / name
+            if not matcher.match(rel) and path.is_file():
+                yield rel, path
@@ -7,22 +7,151 @@ Handles installing skills from multiple sources:
 - Local files: ./skill.tar.gz or /path/to/skill.tar.gz
 """
 
-import hashlib
-import json
+import os
 import re
 import shutil
-import tarfile
-import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from urllib.request import urlopen
 
 import yaml
 
+from .archive import is_archive, read_metadata, strip_archive_extension, verify_manifest
+from .cache import DownloadCache, sha256_file
 from .config import SutrasConfig
-from .lockfile import LockfileManager
+from .http import (
+    DownloadError,
+    DownloadProgress,
+    HttpClient,
+    RetryPolicy,
+    download,
+    get_client,
+)
+from .integrity import scan_tree, tree_digest
+from .lockfile import LockedSkill, LockfileManager
+from .locks import FileLock, lock_name
 from .naming import SkillName
 from .registry import RegistryManager
-from .resolver import DependencyRequest, DependencyResolver
+from .resolver import (
+    DependencyRequest,
+    DependencyResolver,
+    ResolutionCache,
+    ResolvedSkill,
+)
+from .state import InstalledVersion, InstallState, tree_size
+from .store import SkillStore
+
+
+@dataclass
+class InstallTiming:
+    """Wall-clock timings for installing one skill."""
+
+    name: str
+    version: str
+    install_dir: Path
+    download_seconds: float
+    extract_seconds: float
+    staging_dir: Path | None = None
+    checksum: str | None = None
+
+
+class InstallTransaction:
+    """Atomically places installs and symlinks, and can undo them as a group.
+
+    Each install directory is renamed into place from a staging directory; an
+    install it replaces is kept as a backup until commit. Symlinks are swapped
+    with a rename so readers never see a missing link. Rolling back restores
+    the previous directories and symlink targets in reverse order. Callbacks
+    registered with ``on_commit`` (such as install-state updates) run only
+    once the transaction commits.
+
+    Usage:
+        with InstallTransaction() as txn:
+            txn.place(staging_dir, install_dir)
+            txn.link(symlink_path, install_dir)
+    """
+
+    def __init__(self) -> None:
+        self._undo: list[tuple[str, Path, Path | str | None]] = []
+        self._on_commit: list[Callable[[], None]] = []
+
+    def place(self, staging_dir: Path, install_dir: Path) -> None:
+        """Rename a staged tree into place, keeping any existing install as a backup."""
+        backup = None
+        if install_dir.exists():
+            backup = _sibling(install_dir, "old")
+            install_dir.rename(backup)
+        try:
+            staging_dir.rename(install_dir)
+        except OSError:
+            if backup is not None:
+                backup.rename(install_dir)
+            raise
+        self._undo.append(("place", install_dir, backup))
+
+    def link(self, symlink_path: Path, target: Path) -> None:
+        """Point a symlink at a new target with an atomic rename."""
+        previous = os.readlink(symlink_path) if symlink_path.is_symlink() else None
+        _swap_symlink(symlink_path, target)
+        self._undo.append(("link", symlink_path, previous))
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Run a callback once the transaction has committed."""
+        self._on_commit.append(callback)
+
+    def commit(self) -> None:
+        """Make the transaction permanent by deleting replaced installs."""
+        for action, _, backup in self._undo:
+            if action == "place" and backup is not None:
+                shutil.rmtree(backup, ignore_errors=True)
+        self._undo.clear()
+        callbacks, self._on_commit = self._on_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        """Undo every placement and symlink swap, newest first."""
+        for action, path, previous in reversed(self._undo):
+            if action == "link":
+                if previous is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    _swap_symlink(path, previous)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+                if previous is not None:
+                    Path(previous).rename(path)
+        self._undo.clear()
+        self._on_commit.clear()
+
+    def __enter__(self) -> "InstallTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+def _sibling(path: Path, kind: str) -> Path:
+    """Get an unused hidden path next to ``path`` for staging or backups."""
+    return path.with_name(f".{path.name}.{kind}-{uuid.uuid4().hex[:12]}")
+
+
+def _swap_symlink(symlink_path: Path, target: Path | str) -> None:
+    """Create or repoint a symlink atomically."""
+    tmp = _sibling(symlink_path, "link")
+    tmp.symlink_to(target)
+    try:
+        os.replace(tmp, symlink_path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 class SkillInstaller:
@@ -32,73 +161,190 @@ class SkillInstaller:
         self,
         config: SutrasConfig | None = None,
         project_path: Path | None = None,
+        max_workers: int = 8,
+        on_progress: Callable[[DownloadProgress], None] | None = None,
+        retry: RetryPolicy | None = None,
+        http_client: HttpClient | None = None,
+        offline: bool = False,
     ):
         self.config = config or SutrasConfig()
+        self.max_workers = max_workers
+        self.offline = offline
+        self.on_progress = on_progress
+        self.retry = retry or RetryPolicy()
+        self.http_client = http_client or get_client()
+        self.last_install_timings: list[InstallTiming] = []
         self.installed_dir = self.config.get_installed_dir()
+        self.locks_dir = self.config.get_locks_dir()
         self.skills_dir = self.config.get_skills_dir()
         self.registry_manager = RegistryManager(config)
-        self.lockfile_manager = LockfileManager(project_path or Path.cwd())
+        self.lockfile_manager = LockfileManager(
+            project_path or Path.cwd(), self.config.config.lockfile_format
+        )
+        self.download_cache = DownloadCache(
+            self.config.get_download_cache_dir(),
+            self.config.config.download_cache_max_size,
+        )
+        self.store = SkillStore(self.config.get_store_dir(), self.config.config.install_link_mode)
+        self.state = InstallState(self.config.get_state_db_path(), self.installed_dir)
 
         self.installed_dir.mkdir(parents=True, exist_ok=True)
         self.skills_dir.mkdir(parents=True, exist_ok=True)
 
-    def _download_and_verify(self, url: str, expected_checksum: str | None) -> Path:
-        """Download a tarball and verify its checksum.
+    def _download_and_verify(self, url: str | None, expected_checksum: str | None) -> Path:
+        """Download a tarball into the download cache and verify its checksum.
+
+        Cache hits skip the network entirely. The returned path belongs to the
+        cache and must not be deleted by the caller.
 
         Args:
-            url: URL to download
+            url: URL to download (may be None if the checksum is cached)
             expected_checksum: Expected SHA256 checksum
 
         Returns:
-            Path to downloaded file
+            Path to the cached tarball
 
         Raises:
-            ValueError: If checksum doesn't match
+            ValueError: If checksum doesn't match, or the tarball is not cached
+                and cannot be downloaded (offline, or no URL)
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".tar.gz") as f:
-            temp_path = Path(f.name)
-
-            with urlopen(url) as response:
-                f.write(response.read())
+        cached = self._cached_tarball(expected_checksum, url)
+        if cached:
+            return cached
 
-        if expected_checksum:
-            with open(temp_path, "rb") as f:
-                actual_checksum = hashlib.sha256(f.read()).hexdigest()
+        if self.offline:
+            raise ValueError(f"{url or expected_checksum} is not in the download cache (offline)")
+        if url is None:
+            raise ValueError(f"No tarball URL for checksum {expected_checksum}")
 
-            if actual_checksum != expected_checksum:
-                temp_path.unlink()
-                raise ValueError(
-                    f"Checksum mismatch for {url}. "
-                    f"Expected: {expected_checksum}, Got: {actual_checksum}"
-                )
+        with FileLock(self.locks_dir / lock_name("download", url)):
+            # Another process may have finished this download while we waited.
+            cached = self._cached_tarball(expected_checksum, url)
+            if cached:
+                return cached
+            return self._fetch_into_cache(url, expected_checksum)
 
-        return temp_path
+    def _cached_tarball(self, checksum: str | None, url: str | None) -> Path | None:
+        """Look up a tarball in the download cache and verify its contents.
 
-    def _extract_tarball(self, tarball_path: Path, dest_dir: Path) -> None:
-        """Extract a tarball to destination directory.
+        A blob whose SHA256 no longer matches the digest it is stored under
+        is evicted and treated as a miss, so it is downloaded again.
 
-        Args:
-            tarball_path: Path to tarball
-            dest_dir: Destination directory
+        Returns:
+            Path to the cached blob, or None on a miss
         """
-        dest_dir.mkdir(parents=True, exist_ok=True)
+        cached = self.download_cache.get(checksum, url)
+        if cached is None:
+            return None
+        if sha256_file(cached) != cached.name:
+            print(f"Warning: Discarding corrupted cached tarball {cached.name}")
+            self.download_cache.remove(cached.name)
+            self.download_cache.prune_url_index()
+            return None
+        return cached
+
+    def _fetch_into_cache(self, url: str, expected_checksum: str | None) -> Path:
+        """Download a URL into the cache; the caller holds the URL's download lock."""
+        # Partial downloads stay in the cache so an interrupted install resumes
+        # where it left off instead of starting over.
+        partial_path = self.download_cache.partial_path(url)
+        try:
+            actual_checksum = download(
+                url,
+                partial_path,
+                retry=self.retry,
+                on_progress=self.on_progress,
+                client=self.http_client,
+            )
+        except DownloadError as e:
+            raise ValueError(str(e)) from e
 
-        with tarfile.open(tarball_path, "r:gz") as tar:
-            tar.extractall(dest_dir)
+        if expected_checksum and actual_checksum != expected_checksum:
+            self.download_cache.discard_partial(url)
+            raise ValueError(
+                f"Checksum mismatch for {url}. "
+                f"Expected: {expected_checksum}, Got: {actual_checksum}"
+            )
+
+        return self.download_cache.put(partial_path, url=url, digest=actual_checksum)
 
-    def _create_symlink(self, skill_name: SkillName, install_path: Path) -> None:
-        """Create or update symlink in skills directory.
+    def _stage(self, entry: Path, install_dir: Path) -> Path:
+        """Materialise a stored tree next to its install directory and verify it.
 
         Args:
-            skill_name: Skill name
-            install_path: Path to installed skill
+            entry: Store directory holding the extracted tarball
+            install_dir: Final install directory
+
+        Returns:
+            Staging directory, ready to be renamed into place
+
+        Raises:
+            ValueError: If the tree does not match its MANIFEST.json
         """
-        symlink_path = self.skills_dir / skill_name.name
+        install_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = _sibling(install_dir, "staging")
+        try:
+            self.store.materialize(entry, staging)
+            problems = verify_manifest(staging, self.store.metadata(entry))
+            if problems:
+                raise ValueError(
+                    f"Installed files do not match MANIFEST.json for {install_dir}:\n  "
+                    + "\n  ".join(problems)
+                )
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return staging
+
+    def _activate(self, skill_name: SkillName, entry: Path, install_dir: Path, source: str) -> None:
+        """Stage a stored tree, rename it into place and repoint the symlink atomically."""
+        with self._version_lock(skill_name, install_dir.name):
+            staging = self._stage(entry, install_dir)
+            with InstallTransaction() as txn:
+                txn.place(staging, install_dir)
+                txn.link(self.skills_dir / skill_name.name, install_dir)
+                self._record_on_commit(txn, skill_name, install_dir, entry.name, source, True)
+
+    def _is_installed(self, skill_name: SkillName | str, version: str) -> bool:
+        """Check the install-state database for an installed version."""
+        installed = self.state.get(str(skill_name), version)
+        return installed is not None and installed.install_dir.is_dir()
+
+    def _record_on_commit(
+        self,
+        txn: InstallTransaction,
+        skill_name: SkillName,
+        install_dir: Path,
+        checksum: str | None,
+        source: str | None,
+        explicit: bool,
+    ) -> None:
+        """Record an install in the install-state database once ``txn`` commits."""
+
+        def record() -> None:
+            # A reused install keeps the file digests recorded when it was placed.
+            placed = checksum is not None or not self.state.files(str(skill_name), install_dir.name)
+            files = scan_tree(install_dir, max_workers=self.max_workers)[0] if placed else None
+            self.state.record(
+                InstalledVersion(
+                    name=str(skill_name),
+                    version=install_dir.name,
+                    fs_name=skill_name.to_filesystem_name(),
+                    install_dir=install_dir,
+                    checksum=checksum,
+                    tree_digest=tree_digest(files) if files is not None else None,
+                    source=source,
+                    size=tree_size(install_dir),
+                    explicit=explicit,
+                ),
+                files=files,
+            )
 
-        if symlink_path.exists() or symlink_path.is_symlink():
-            symlink_path.unlink()
+        txn.on_commit(record)
 
-        symlink_path.symlink_to(install_path)
+    def _version_lock(self, skill_name: SkillName | str, version: str) -> FileLock:
+        """Get the cross-process lock for installing one version of a skill."""
+        return FileLock(self.locks_dir / lock_name(str(skill_name), version))
 
     def _remove_symlink(self, skill_name: SkillName) -> None:
         """Remove symlink from skills directory.
@@ -111,47 +357,24 @@ class SkillInstaller:
         if symlink_path.exists() or symlink_path.is_symlink():
             symlink_path.unlink()
 
-    def _read_skill_metadata_from_tarball(self, tarball_path: Path) -> tuple[str, str]:
-        """Extract skill name and version from tarball.
+    def _unpack_to_store(self, tarball_path: Path) -> tuple[Path, str, str]:
+        """Extract a tarball into the store and read its skill name and version.
+
+        The archive is decompressed once; sutras.yaml and SKILL.md are picked up
+        during that same pass.
 
         Args:
             tarball_path: Path to tarball
 
         Returns:
-            Tuple of (skill_name, version)
+            Tuple of (store_entry, skill_name, version)
 
         Raises:
             ValueError: If metadata cannot be read
         """
-        with tarfile.open(tarball_path, "r:gz") as tar:
-            for member in tar.getmembers():
-                if member.name.endswith("/sutras.yaml") or member.name == "sutras.yaml":
-                    f = tar.extractfile(member)
-                    if f:
-                        data = yaml.safe_load(f.read())
-                        version = data.get("version", "0.0.0")
-
-                        skill_name = None
-                        for m in tar.getmembers():
-                            if m.name.endswith("/SKILL.md") or m.name == "SKILL.md":
-                                skill_f = tar.extractfile(m)
-                                if skill_f:
-                                    content = skill_f.read().decode("utf-8")
-                                    match = re.search(r"^name:\s*(.+)$", content, re.MULTILINE)
-                                    if match:
-                                        skill_name = match.group(1).strip()
-                                    break
-
-                        if not skill_name:
-                            parts = member.name.split("/")
-                            if len(parts) > 1:
-                                skill_name = parts[0]
-                            else:
-                                raise ValueError("Could not determine skill name from tarball")
-
-                        return skill_name, version
-
-        raise ValueError("No sutras.yaml found in tarball")
+        entry = self.store.ensure(tarball_path)
+        skill_name, version = self.store.metadata(entry).identity()
+        return entry, skill_name, version
 
     def _resolve_github_release_url(self, github_spec: str) -> tuple[str, str, str]:
         """Resolve GitHub release spec to download URL.
@@ -186,29 +409,28 @@ class SkillInstaller:
         api_url = f"https://api.github.com/repos/{user}/{repo}/releases/{tag}"
 
         try:
-            with urlopen(api_url) as response:
-                release_data = json.loads(response.read())
+            release_data = self.http_client.get_json(api_url)
         except Exception as e:
             raise ValueError(f"Failed to fetch GitHub release for {user}/{repo}@{tag}: {e}")
 
         if "assets" not in release_data or not release_data["assets"]:
             raise ValueError(
                 f"No assets found in GitHub release {user}/{repo}@{tag}. "
-                f"Make sure the release has a .tar.gz file attached."
+                f"Make sure the release has a skill package (.tar.gz) attached."
             )
 
         for asset in release_data["assets"]:
-            if asset["name"].endswith(".tar.gz"):
+            if is_archive(asset["name"]):
                 download_url = asset["browser_download_url"]
                 actual_version = release_data.get("tag_name", "").lstrip("v")
 
-                asset_name = asset["name"].replace(".tar.gz", "")
+                asset_name = strip_archive_extension(asset["name"])
                 parts = asset_name.rsplit("-", 1)
                 skill_name = parts[0] if len(parts) > 1 else asset_name
 
                 return download_url, skill_name, actual_version
 
-        raise ValueError(f"No .tar.gz asset found in GitHub release {user}/{repo}@{tag}")
+        raise ValueError(f"No skill package found in GitHub release {user}/{repo}@{tag}")
 
     def _detect_install_source(self, source: str) -> str:
         """Detect the type of installation source.
@@ -267,22 +489,28 @@ class SkillInstaller:
                 print(f"Using locked version {locked_version} from .sutras.lock")
                 version = locked_version
 
-        if source_type == "registry":
-            install_path = self._install_from_registry(
-                source, version, registry_name, install_dependencies
-            )
-        elif source_type == "github":
-            install_path = self._install_from_github(source_str)
-        elif source_type == "url":
-            install_path = self._install_from_url(source_str)
-        elif source_type == "file":
-            install_path = self._install_from_file(Path(source_str))
-        else:
-            raise ValueError(f"Unknown installation source type: {source_type}")
+        # The skill's own entry and its resolved dependencies reach .sutras.lock
+        # in one write once everything has installed.
+        tarball_url = None
+        with self.lockfile_manager.batch():
+            if source_type == "registry":
+                install_path, tarball_url = self._install_from_registry(
+                    source, version, registry_name, install_dependencies
+                )
+            elif source_type == "github":
+                install_path = self._install_from_github(source_str)
+            elif source_type == "url":
+                install_path = self._install_from_url(source_str)
+            elif source_type == "file":
+                install_path = self._install_from_file(Path(source_str))
+            else:
+                raise ValueError(f"Unknown installation source type: {source_type}")
 
-        # Update lockfile after successful install
-        if update_lockfile and source_type == "registry":
-            self._update_lockfile_entry(source_str, install_path, registry_name)
+            # Update lockfile after successful install
+            if update_lockfile and source_type == "registry":
+                self._update_lockfile_entry(source_str, install_path, registry_name, tarball_url)
+
+        self.download_cache.prune()
 
         return install_path
 
@@ -291,63 +519,56 @@ class SkillInstaller:
         skill_name: str,
         install_path: Path,
         registry_name: str | None,
+        tarball_url: str | None = None,
     ) -> None:
-        """Update lockfile with installed skill info."""
-        sutras_yaml = install_path / "sutras.yaml"
-        version = "0.0.0"
-        checksum = None
+        """Update lockfile with installed skill info.
+
+        The tarball checksum and tree digest come from the install-state
+        database, so the installed files can be verified against the lockfile.
+        The tarball URL lets a frozen install fetch the skill without the registry.
+        """
+        data = read_metadata(install_path).sutras_yaml or {}
+        version = install_path.name
         dependencies: list[str] = []
 
-        if sutras_yaml.exists():
-            with open(sutras_yaml) as f:
-                data = yaml.safe_load(f) or {}
-            version = data.get("version", "0.0.0")
-            caps = data.get("capabilities", {})
-            raw_deps = caps.get("dependencies", [])
-            for dep in raw_deps:
-                if isinstance(dep, str):
-                    dependencies.append(dep)
-                elif isinstance(dep, dict):
-                    dependencies.append(dep.get("name", ""))
+        caps = data.get("capabilities", {})
+        raw_deps = caps.get("dependencies", [])
+        for dep in raw_deps:
+            if isinstance(dep, str):
+                dependencies.append(dep)
+            elif isinstance(dep, dict):
+                dependencies.append(dep.get("name", ""))
 
+        installed = self.state.get(skill_name, version)
         self.lockfile_manager.add_skill(
             name=skill_name,
             version=version,
-            checksum=checksum,
+            checksum=installed.checksum if installed else None,
             registry=registry_name,
+            tarball_url=tarball_url,
             dependencies=dependencies,
+            tree_digest=installed.tree_digest if installed else None,
         )
 
-    def _install_from_registry(
+    def _locate_registry_tarball(
         self,
-        skill_name: str | SkillName,
-        version: str | None = None,
-        registry_name: str | None = None,
-        install_dependencies: bool = True,
-    ) -> Path:
-        """Install a skill from a registry.
+        skill_name: SkillName,
+        version: str | None,
+        registry_name: str | None,
+    ) -> tuple[str, str, str | None, str]:
+        """Find the tarball for a registry skill.
 
         Args:
-            skill_name: Skill name to install
-            version: Specific version to install (default: latest)
-            registry_name: Registry to install from (default: search all)
-            install_dependencies: Whether to install dependencies
+            skill_name: Scoped skill name
+            version: Specific version (default: latest)
+            registry_name: Registry to look in (default: search all)
 
         Returns:
-            Path to installed skill
+            Tuple of (version, tarball_url, checksum, registry_name)
 
         Raises:
             ValueError: If skill not found or version not available
         """
-        if isinstance(skill_name, str):
-            skill_name = SkillName.parse(skill_name)
-
-        if not skill_name.is_scoped:
-            raise ValueError(
-                f"Cannot install bare skill name '{skill_name}'. "
-                f"Use scoped names (@namespace/name) for registry skills."
-            )
-
         if registry_name:
             registry = self.registry_manager.get_registry(registry_name)
             full_name = str(skill_name)
@@ -368,27 +589,114 @@ class SkillInstaller:
                     f"Available: {list(entry.versions.keys())}"
                 )
             tarball_url = entry.versions[version]
-            checksum = None
+            checksum = entry.checksum if version == entry.version else None
 
         if not tarball_url:
             raise ValueError(f"No tarball URL available for '{skill_name}' version {version}")
 
-        registry = self.registry_manager.get_registry(registry_name)
-        if not tarball_url.startswith(("http://", "https://")):
-            tarball_url = f"{registry.url}/raw/main/{tarball_url}"
+        tarball_url = self._absolute_tarball_url(tarball_url, registry_name)
+        return version, tarball_url, checksum, registry_name
+
+    def _absolute_tarball_url(self, tarball_url: str, registry_name: str | None) -> str:
+        """Turn a registry-relative tarball path into a URL.
 
-        print(f"Downloading {skill_name} {version} from {registry_name}...")
+        Only the configured registry URL is consulted, so this works offline.
+        """
+        if tarball_url.startswith(("http://", "https://", "file://")) or not registry_name:
+            return tarball_url
+        registry_url = self.config.get_registry(registry_name).url
+        return f"{registry_url}/raw/main/{tarball_url}"
+
+    def _download_and_extract(
+        self,
+        skill_name: SkillName,
+        version: str,
+        tarball_url: str | None,
+        checksum: str | None,
+    ) -> InstallTiming:
+        """Download a skill tarball and stage it next to its install directory.
+
+        Neither the install directory nor the skills directory symlink is
+        touched; the caller places the staged tree with an InstallTransaction.
+
+        Returns:
+            Timing information for the install, including the staging directory
+        """
+        started = time.monotonic()
         tarball_path = self._download_and_verify(tarball_url, checksum)
+        downloaded = time.monotonic()
 
         install_dir = self.installed_dir / skill_name.to_filesystem_name() / version
-        if install_dir.exists():
-            shutil.rmtree(install_dir)
+        # A known checksum has been verified against the tarball by now.
+        entry = self.store.ensure(tarball_path, digest=checksum)
+        staging = self._stage(entry, install_dir)
 
-        print(f"Installing to {install_dir}...")
-        self._extract_tarball(tarball_path, install_dir)
-        tarball_path.unlink()
+        return InstallTiming(
+            name=str(skill_name),
+            version=version,
+            install_dir=install_dir,
+            download_seconds=downloaded - started,
+            extract_seconds=time.monotonic() - downloaded,
+            staging_dir=staging,
+            checksum=entry.name,
+        )
 
-        self._create_symlink(skill_name, install_dir)
+    def _install_from_registry(
+        self,
+        skill_name: str | SkillName,
+        version: str | None = None,
+        registry_name: str | None = None,
+        install_dependencies: bool = True,
+    ) -> tuple[Path, str]:
+        """Install a skill from a registry.
+
+        Args:
+            skill_name: Skill name to install
+            version: Specific version to install (default: latest)
+            registry_name: Registry to install from (default: search all)
+            install_dependencies: Whether to install dependencies
+
+        Returns:
+            Tuple of (path to installed skill, tarball URL it came from)
+
+        Raises:
+            ValueError: If skill not found or version not available
+        """
+        if isinstance(skill_name, str):
+            skill_name = SkillName.parse(skill_name)
+
+        if not skill_name.is_scoped:
+            raise ValueError(
+                f"Cannot install bare skill name '{skill_name}'. "
+                f"Use scoped names (@namespace/name) for registry skills."
+            )
+
+        version, tarball_url, checksum, registry_name = self._locate_registry_tarball(
+            skill_name, version, registry_name
+        )
+
+        install_dir = self.installed_dir / skill_name.to_filesystem_name() / version
+        source = f"registry:{registry_name}"
+        existed = self._is_installed(skill_name, version)
+
+        with self._version_lock(skill_name, version):
+            if not existed and self._is_installed(skill_name, version):
+                # Another process installed this version while we waited for the lock.
+                print(f"Reusing {skill_name} {version} installed by another process...")
+                with InstallTransaction() as txn:
+                    txn.link(self.skills_dir / skill_name.name, install_dir)
+                    self._record_on_commit(txn, skill_name, install_dir, None, source, True)
+            else:
+                print(f"Downloading {skill_name} {version} from {registry_name}...")
+                timing = self._download_and_extract(skill_name, version, tarball_url, checksum)
+
+                print(f"Installing to {install_dir}...")
+                with InstallTransaction() as txn:
+                    txn.place(timing.staging_dir, install_dir)
+                    txn.link(self.skills_dir / skill_name.name, install_dir)
+                    self._record_on_commit(
+                        txn, skill_name, install_dir, timing.checksum, source, True
+                    )
 
         print(f"✓ Installed {skill_name} {version}")
 
@@ -396,7 +704,183 @@ class SkillInstaller:
         if install_dependencies:
             self._install_dependencies(install_dir, str(skill_name))
 
-        return install_dir
+        return install_dir, tarball_url
+
+    def _install_level(
+        self, skills: list[ResolvedSkill], txn: InstallTransaction | None = None
+    ) -> list[InstallTiming]:
+        """Install one dependency level concurrently.
+
+        Every skill in the level is downloaded and staged on a bounded thread
+        pool. Only once the whole level has staged successfully are the trees
+        renamed into place and their symlinks swapped; on failure the staging
+        directories are removed and nothing installed is touched.
+
+        Args:
+            skills: Skills with no unmet dependencies on each other
+            txn: Transaction to record the level in, so a bulk install can be
+                rolled back as a whole (default: commit this level on its own)
+
+        Returns:
+            Per-skill timings, in completion order
+
+        Raises:
+            ValueError: If any skill in the level fails to install
+        """
+        jobs = []
+        for skill in skills:
+            skill_name = SkillName.parse(skill.name)
+            version, tarball_url, checksum, registry_name = self._locate_registry_tarball(
+                skill_name, skill.version, skill.registry
+            )
+            jobs.append((skill_name, version, tarball_url, checksum, f"registry:{registry_name}"))
+
+        return self._install_jobs(jobs, txn, "dependencies")
+
+    def _install_jobs(
+        self,
+        jobs: list[tuple[SkillName, str, str | None, str | None, str | None]],
+        txn: InstallTransaction | None,
+        what: str,
+        explicit: set[str] | None = None,
+    ) -> list[InstallTiming]:
+        """Download and stage skills in parallel, then place and link them all.
+
+        Args:
+            jobs: (skill_name, version, tarball_url, checksum, source) tuples
+            txn: Transaction to record placements in (default: a new one)
+            what: Description used in the error message
+            explicit: Names of the skills to record as explicitly installed
+                (default: none, they are dependencies)
+
+        Returns:
+            Per-skill timings, in completion order
+
+        Raises:
+            ValueError: If any skill fails to download or stage
+        """
+        timings: list[InstallTiming] = []
+        errors: list[str] = []
+        workers = max(1, min(self.max_workers, len(jobs)))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._download_and_extract, *job[:4]): job for job in jobs}
+            for future in as_completed(futures):
+                skill_name, version = futures[future][:2]
+                try:
+                    timing = future.result()
+                except Exception as e:
+                    errors.append(f"{skill_name} {version}: {e}")
+                    continue
+                timings.append(timing)
+                print(
+                    f"  ✓ {timing.name} {timing.version} "
+                    f"(download {timing.download_seconds:.2f}s, "
+                    f"extract {timing.extract_seconds:.2f}s)"
+                )
+
+        if errors:
+            for timing in timings:
+                shutil.rmtree(timing.staging_dir, ignore_errors=True)
+            raise ValueError(f"Failed to install {what}:\n  " + "\n  ".join(errors))
+
+        sources = {(str(job[0]), job[1]): job[4] for job in jobs}
+        with InstallTransaction() if txn is None else nullcontext(txn) as level_txn:
+            for timing in timings:
+                level_txn.place(timing.staging_dir, timing.install_dir)
+            for timing in timings:
+                skill_name = SkillName.parse(timing.name)
+                level_txn.link(self.skills_dir / skill_name.name, timing.install_dir)
+                self._record_on_commit(
+                    level_txn,
+                    skill_name,
+                    timing.install_dir,
+                    timing.checksum,
+                    sources[(timing.name, timing.version)],
+                    timing.name in (explicit or set()),
+                )
+
+        return timings
+
+    def install_frozen(self) -> list[InstallTiming]:
+        """Install exactly the skills pinned in .sutras.lock.
+
+        Resolution is skipped entirely. Each tarball is taken from the download
+        cache by its locked checksum, or downloaded from its locked URL and
+        verified against that checksum. Everything is staged in parallel and
+        placed as one transaction. With ``offline`` set, nothing is fetched
+        from the network, so a warm cache makes CI restores fast and hermetic.
+
+        Returns:
+            Timings for the skills that had to be installed
+
+        Raises:
+            ValueError: If there is no lockfile, or any skill cannot be installed
+        """
+        if not self.lockfile_manager.exists():
+            raise ValueError(
+                f"No {LockfileManager.LOCKFILE_NAME} found in {self.lockfile_manager.project_path}"
+            )
+
+        locked = sorted(self.lockfile_manager.load().skills.values(), key=lambda s: s.name)
+        print(f"Installing {len(locked)} locked skills from {LockfileManager.LOCKFILE_NAME}...")
+
+        # Skills nothing else in the lockfile depends on were installed explicitly.
+        required = {dep for skill in locked for dep in skill.dependencies}
+        explicit = {skill.name for skill in locked if skill.name not in required}
+
+        jobs = []
+        current = []
+        for skill in locked:
+            skill_name = SkillName.parse(skill.name)
+            install_dir = self.installed_dir / skill_name.to_filesystem_name() / skill.version
+            if self._is_installed(skill_name, skill.version):
+                print(f"  ✓ {skill.name} {skill.version} (already installed)")
+                current.append((skill_name, install_dir))
+                continue
+
+            url = skill.tarball_url
+            if url:
+                url = self._absolute_tarball_url(url, skill.registry)
+            elif not (skill.checksum and self._cached_tarball(skill.checksum, None)):
+                if self.offline:
+                    raise ValueError(
+                        f"{skill.name} {skill.version} has no tarball URL in "
+                        f"{LockfileManager.LOCKFILE_NAME} and is not in the download cache"
+                    )
+                _, url, _, _ = self._locate_registry_tarball(
+                    skill_name, skill.version, skill.registry
+                )
+            source = f"registry:{skill.registry}" if skill.registry else url
+            jobs.append((skill_name, skill.version, url, skill.checksum, source))
+
+        with ExitStack() as locks, InstallTransaction() as txn:
+            for skill in locked:
+                locks.enter_context(self._version_lock(skill.name, skill.version))
+
+            pending = []
+            for job in jobs:
+                skill_name, version = job[:2]
+                if self._is_installed(skill_name, version):
+                    # Another process installed this version while we waited for the lock.
+                    print(f"  ✓ {skill_name} {version} (installed by another process)")
+                    install_dir = self.installed_dir / skill_name.to_filesystem_name() / version
+                    current.append((skill_name, install_dir))
+                else:
+                    pending.append(job)
+
+            timings = (
+                self._install_jobs(pending, txn, "locked skills", explicit=explicit)
+                if pending
+                else []
+            )
+            for skill_name, install_dir in current:
+                txn.link(self.skills_dir / skill_name.name, install_dir)
+            txn.on_commit(lambda: self._record_dependents(locked))
+
+        self.last_install_timings = timings
+        self.download_cache.prune()
+        return timings
 
     def _install_dependencies(self, install_dir: Path, parent_skill: str) -> None:
         """Install dependencies for an installed skill.
@@ -424,6 +908,7 @@ class SkillInstaller:
             registry_manager=self.registry_manager,
             lockfile_manager=self.lockfile_manager,
             use_lockfile=True,
+            cache=ResolutionCache(self.config.get_resolution_cache_dir()),
         )
 
         requests = []
@@ -450,31 +935,78 @@ class SkillInstaller:
         try:
             resolved = resolver.resolve(requests)
 
-            for skill in resolved:
-                # Skip if already installed at this version
-                existing_dir = (
-                    self.installed_dir
-                    / skill.name.replace("@", "").replace("/", "_")
-                    / skill.version
-                )
-                if existing_dir.exists():
-                    print(f"  ✓ {skill.name} {skill.version} (already installed)")
-                    continue
+            self.last_install_timings = []
+            levels = resolver.install_levels()
+
+            existed = {
+                (skill.name, skill.version): self._is_installed(skill.name, skill.version)
+                for level in levels
+                for skill in level
+            }
+
+            # Lock every version up front, in sorted order so concurrent
+            # installs can't deadlock, and hold the locks until the
+            # transaction is settled. All levels form one transaction: if a
+            # later level fails, earlier levels are rolled back too.
+            with ExitStack() as locks, InstallTransaction() as txn:
+                for name, version in sorted(existed):
+                    locks.enter_context(self._version_lock(name, version))
+
+                for level in levels:
+                    pending = []
+                    for skill in level:
+                        # Skip if already installed at this version
+                        if self._is_installed(skill.name, skill.version):
+                            if existed[(skill.name, skill.version)]:
+                                note = "already installed"
+                            else:
+                                note = "installed by another process"
+                            print(f"  ✓ {skill.name} {skill.version} ({note})")
+                            continue
+                        pending.append(skill)
 
-                print(f"  Installing dependency: {skill.name} {skill.version}...")
-                self._install_from_registry(
-                    skill.name,
-                    version=skill.version,
-                    registry_name=skill.registry,
-                    install_dependencies=False,  # Don't recurse, resolver handles it
-                )
+                    if pending:
+                        names = ", ".join(f"{s.name} {s.version}" for s in pending)
+                        print(f"  Installing dependencies: {names}...")
+                        self.last_install_timings.extend(self._install_level(pending, txn))
+
+                direct = [r.name for r in requests]
+                txn.on_commit(lambda: self._record_dependents(resolved, parent_skill, direct))
 
-            # Update lockfile with resolved dependencies
+            # Update lockfile with resolved dependencies and their digests
+            for skill in resolved:
+                installed = self.state.get(skill.name, skill.version)
+                if installed:
+                    skill.checksum = installed.checksum or skill.checksum
+                    skill.tree_digest = installed.tree_digest
             resolver.update_lockfile(resolved)
 
         except Exception as e:
             print(f"  Warning: Could not resolve dependencies: {e}")
 
+    def _record_dependents(
+        self,
+        skills: list[ResolvedSkill] | list[LockedSkill],
+        parent_skill: str | None = None,
+        direct: list[str] | None = None,
+    ) -> None:
+        """Record which skills depend on each installed version.
+
+        Args:
+            skills: Resolved or locked skills with their direct dependencies
+            parent_skill: Skill whose dependencies were installed, if any
+            direct: Names ``parent_skill`` depends on directly
+        """
+        versions = {skill.name: skill.version for skill in skills}
+        with self.state.transaction():
+            for skill in skills:
+                for dep in skill.dependencies:
+                    if dep in versions:
+                        self.state.add_dependent(dep, versions[dep], skill.name)
+            for dep in direct or []:
+                if parent_skill and dep in versions:
+                    self.state.add_dependent(dep, versions[dep], parent_skill)
+
     def _install_from_url(self, url: str) -> Path:
         """Install a skill from a direct URL.
 
@@ -487,22 +1019,16 @@ class SkillInstaller:
         print(f"Downloading from {url}...")
         tarball_path = self._download_and_verify(url, None)
 
-        try:
-            skill_name_str, version = self._read_skill_metadata_from_tarball(tarball_path)
-            skill_name = SkillName.parse(skill_name_str)
+        entry, skill_name_str, version = self._unpack_to_store(tarball_path)
+        skill_name = SkillName.parse(skill_name_str)
 
-            install_dir = self.installed_dir / skill_name.to_filesystem_name() / version
-            if install_dir.exists():
-                shutil.rmtree(install_dir)
+        install_dir = self.installed_dir / skill_name.to_filesystem_name() / version
 
-            print(f"Installing {skill_name} {version}...")
-            self._extract_tarball(tarball_path, install_dir)
-            self._create_symlink(skill_name, install_dir)
+        print(f"Installing {skill_name} {version}...")
+        self._activate(skill_name, entry, install_dir, f"url:{url}")
 
-            print(f"✓ Installed {skill_name} {version} from URL")
-            return install_dir
-        finally:
-            tarball_path.unlink()
+        print(f"✓ Installed {skill_name} {version} from URL")
+        return install_dir
 
     def _install_from_github(self, github_spec: str) -> Path:
         """Install a skill from a GitHub release.
@@ -519,24 +1045,18 @@ class SkillInstaller:
         print("Downloading from GitHub...")
         tarball_path = self._download_and_verify(download_url, None)
 
-        try:
-            actual_skill_name, actual_version = self._read_skill_metadata_from_tarball(tarball_path)
-            skill_name = SkillName.parse(actual_skill_name)
+        entry, actual_skill_name, actual_version = self._unpack_to_store(tarball_path)
+        skill_name = SkillName.parse(actual_skill_name)
 
-            version_to_use = actual_version if actual_version else version
+        version_to_use = actual_version if actual_version else version
 
-            install_dir = self.installed_dir / skill_name.to_filesystem_name() / version_to_use
-            if install_dir.exists():
-                shutil.rmtree(install_dir)
+        install_dir = self.installed_dir / skill_name.to_filesystem_name() / version_to_use
 
-            print(f"Installing {skill_name} {version_to_use}...")
-            self._extract_tarball(tarball_path, install_dir)
-            self._create_symlink(skill_name, install_dir)
+        print(f"Installing {skill_name} {version_to_use}...")
+        self._activate(skill_name, entry, install_dir, github_spec)
 
-            print(f"✓ Installed {skill_name} {version_to_use} from GitHub")
-            return install_dir
-        finally:
-            tarball_path.unlink()
+        print(f"✓ Installed {skill_name} {version_to_use} from GitHub")
+        return install_dir
 
     def _install_from_file(self, file_path: Path) -> Path:
         """Install a skill from a local tarball file.
@@ -550,20 +1070,19 @@ class SkillInstaller:
         if not file_path.exists():
             raise ValueError(f"File not found: {file_path}")
 
-        if not file_path.name.endswith(".tar.gz"):
-            raise ValueError(f"File must be a .tar.gz tarball: {file_path}")
+        if not is_archive(file_path.name):
+            raise ValueError(
+                f"File must be a skill package (.tar.gz, .tar.xz, .tar.zst or .tar): {file_path}"
+            )
 
         print(f"Installing from {file_path}...")
-        skill_name_str, version = self._read_skill_metadata_from_tarball(file_path)
+        entry, skill_name_str, version = self._unpack_to_store(file_path)
         skill_name = SkillName.parse(skill_name_str)
 
         install_dir = self.installed_dir / skill_name.to_filesystem_name() / version
-        if install_dir.exists():
-            shutil.rmtree(install_dir)
 
         print(f"Installing {skill_name} {version}...")
-        self._extract_tarball(file_path, install_dir)
-        self._create_symlink(skill_name, install_dir)
+        self._activate(skill_name, entry, install_dir, f"file:{file_path.resolve()}")
 
         print(f"✓ Installed {skill_name} {version} from local file")
         return install_dir
@@ -584,42 +1103,61 @@ class SkillInstaller:
             raise ValueError(f"Skill '{skill_name}' is not installed")
 
         if version:
-            version_dir = skill_install_dir / version
-            if not version_dir.exists():
-                raise ValueError(f"Version {version} of '{skill_name}' is not installed")
-
-            print(f"Uninstalling {skill_name} {version}...")
-            shutil.rmtree(version_dir)
+            versions = [version]
+        else:
+            versions = sorted(
+                d.name
+                for d in skill_install_dir.iterdir()
+                if d.is_dir() and not d.name.startswith(".")
+            )
 
-            remaining_versions = [
-                d for d in skill_install_dir.iterdir() if d.is_dir() and d.name != version
-            ]
-            if not remaining_versions:
+        # Hold the same per-version locks as installs, in the same sorted
+        # order, so an install of one of these versions can't race with us.
+        with ExitStack() as locks:
+            for locked_version in versions:
+                locks.enter_context(self._version_lock(skill_name, locked_version))
+
+            if version:
+                version_dir = skill_install_dir / version
+                if not version_dir.exists():
+                    raise ValueError(f"Version {version} of '{skill_name}' is not installed")
+
+                print(f"Uninstalling {skill_name} {version}...")
+                shutil.rmtree(version_dir)
+                self.state.remove(str(skill_name), version)
+
+                remaining_versions = [
+                    d
+                    for d in skill_install_dir.iterdir()
+                    if d.is_dir() and d.name != version and not d.name.startswith(".")
+                ]
+                if not remaining_versions:
+                    self._remove_symlink(skill_name)
+                    skill_install_dir.rmdir()
+            else:
+                print(f"Uninstalling {skill_name}...")
+                shutil.rmtree(skill_install_dir)
+                self.state.remove(str(skill_name))
                 self._remove_symlink(skill_name)
-                skill_install_dir.rmdir()
-        else:
-            print(f"Uninstalling {skill_name}...")
-            shutil.rmtree(skill_install_dir)
-            self._remove_symlink(skill_name)
 
         print(f"✓ Uninstalled {skill_name}")
 
     def list_installed(self) -> dict[str, list[str]]:
         """List all installed skills.
 
+        Reads the install-state database rather than scanning the installed
+        directory. A new or empty database is reconciled automatically; run
+        ``reconcile`` if the two have drifted apart since.
+
         Returns:
             Dict mapping skill names to list of installed versions
         """
-        if not self.installed_dir.exists():
-            return {}
-
-        installed = {}
-        for skill_dir in self.installed_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
+        return self.state.list_installed()
 
-            versions = [v.name for v in skill_dir.iterdir() if v.is_dir()]
-            if versions:
-                installed[skill_dir.name] = sorted(versions)
+    def reconcile(self) -> tuple[int, int]:
+        """Rebuild the install-state database from the installed directory.
 
-        return installed
+        Returns:
+            Tuple of (records_added, records_removed)
+        """
+        return self.state.reconcile(self.installed_dir)
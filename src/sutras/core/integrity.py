@@ -0,0 +1,200 @@
+"""Integrity checks for installed skills.
+
+Every installed version has a tree digest: the SHA256 of its sorted
+``path<TAB>file-digest`` lines. It is recorded in the install-state database
+and in .sutras.lock next to the tarball checksum, so installed files can be
+verified against the lockfile later.
+
+The digest and stat of each file are recorded at install time too. When
+verifying, a file whose size, mtime, inode and ctime all match the recorded
+stat reuses its recorded digest, so re-verifying an unchanged tree costs only
+stats; changed files are re-hashed in parallel.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .cache import sha256_file
+from .naming import SkillName
+from .state import FileRecord
+
+if TYPE_CHECKING:  # the installer records digests with scan_tree
+    from .installer import SkillInstaller
+
+
+def _file_digest(path: str) -> str:
+    """Digest a file, or a symlink by its target (links are not followed)."""
+    if os.path.islink(path):
+        return "symlink:" + hashlib.sha256(os.readlink(path).encode()).hexdigest()
+    return sha256_file(Path(path))
+
+
+def tree_digest(files: dict[str, FileRecord]) -> str:
+    """Combine per-file digests into a digest of the whole tree."""
+    sha256 = hashlib.sha256()
+    for path in sorted(files):
+        sha256.update(f"{path}\t{files[path].digest}\n".encode())
+    return sha256.hexdigest()
+
+
+def scan_tree(
+    root: Path,
+    baseline: dict[str, FileRecord] | None = None,
+    max_workers: int = 8,
+) -> tuple[dict[str, FileRecord], int]:
+    """Digest every file under ``root``, reusing baseline digests for unchanged files.
+
+    Args:
+        root: Directory to scan
+        baseline: Previously recorded digests, keyed by relative path
+        max_workers: Threads used to hash changed files
+
+    Returns:
+        Tuple of (records keyed by relative POSIX path, number of files hashed)
+    """
+    baseline = baseline or {}
+    records: dict[str, FileRecord] = {}
+    to_hash: list[tuple[str, str, os.stat_result]] = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        names = filenames + [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]
+        for name in names:
+            full = os.path.join(dirpath, name)
+            rel = Path(os.path.relpath(full, root)).as_posix()
+            st = os.lstat(full)
+            known = baseline.get(rel)
+            if known is not None and known.matches(st):
+                records[rel] = known
+            else:
+                to_hash.append((rel, full, st))
+
+    if to_hash:
+        workers = max(1, min(max_workers, len(to_hash)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = pool.map(lambda item: _file_digest(item[1]), to_hash)
+            for (rel, _, st), digest in zip(to_hash, digests, strict=True):
+                records[rel] = FileRecord(
+                    digest=digest,
+                    size=st.st_size,
+                    mtime_ns=st.st_mtime_ns,
+                    ino=st.st_ino,
+                    ctime_ns=st.st_ctime_ns,
+                )
+
+    return records, len(to_hash)
+
+
+@dataclass
+class VerifyResult:
+    """Outcome of verifying one installed skill version."""
+
+    name: str
+    version: str
+    status: str  # "ok", "missing", "modified" or "mismatch"
+    problems: list[str] = field(default_factory=list)
+    hashed: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+class Verifier:
+    """Checks installed skills against .sutras.lock and their install-time digests."""
+
+    def __init__(self, installer: "SkillInstaller", max_workers: int = 8):
+        self.installer = installer
+        self.max_workers = max_workers
+
+    def verify_version(
+        self,
+        name: str,
+        version: str,
+        tree: str | None = None,
+        checksum: str | None = None,
+    ) -> VerifyResult:
+        """Verify one installed version.
+
+        Args:
+            name: Skill name
+            version: Installed version
+            tree: Expected tree digest (default: the one recorded at install)
+            checksum: Expected tarball checksum, if known
+
+        Returns:
+            Result of the check
+        """
+        state = self.installer.state
+        install_dir = (
+            self.installer.installed_dir / SkillName.parse(name).to_filesystem_name() / version
+        )
+        result = VerifyResult(name=name, version=version, status="ok")
+        if not install_dir.is_dir():
+            result.status = "missing"
+            result.problems.append(f"not installed at {install_dir}")
+            return result
+
+        installed = state.get(name, version)
+        baseline = state.files(name, version)
+        current, result.hashed = scan_tree(install_dir, baseline, self.max_workers)
+
+        if checksum and installed and installed.checksum and installed.checksum != checksum:
+            result.status = "mismatch"
+            result.problems.append(
+                f"installed from tarball {installed.checksum[:12]}, lockfile pins {checksum[:12]}"
+            )
+
+        expected = tree or (installed.tree_digest if installed else None)
+        if expected and tree_digest(current) != expected:
+            result.status = "modified"
+            if baseline:
+                for path in sorted(set(baseline) | set(current)):
+                    if path not in current:
+                        result.problems.append(f"{path}: missing")
+                    elif path not in baseline:
+                        result.problems.append(f"{path}: unexpected file")
+                    elif current[path].digest != baseline[path].digest:
+                        result.problems.append(f"{path}: modified")
+            if not result.problems:
+                result.problems.append("tree digest does not match")
+        elif expected is None:
+            result.problems.append("no recorded digest to verify against")
+
+        # Remember the new stats of files whose content is unchanged, so the
+        # next run only needs to stat them.
+        refreshed = {
+            path: record
+            for path, record in current.items()
+            if path in baseline
+            and record.digest == baseline[path].digest
+            and record is not baseline[path]
+        }
+        if installed and refreshed:
+            state.update_files(name, version, refreshed)
+
+        return result
+
+    def verify_locked(self) -> list[VerifyResult]:
+        """Verify every skill pinned in the project's .sutras.lock.
+
+        Raises:
+            ValueError: If there is no lockfile
+        """
+        manager = self.installer.lockfile_manager
+        if not manager.exists():
+            raise ValueError(f"No {manager.LOCKFILE_NAME} found in {manager.project_path}")
+
+        locked = sorted(manager.load().skills.values(), key=lambda s: s.name)
+        return [
+            self.verify_version(skill.name, skill.version, skill.tree_digest, skill.checksum)
+            for skill in locked
+        ]
+
+    def verify_installed(self) -> list[VerifyResult]:
+        """Verify every installed version against the digests recorded at install."""
+        return [self.verify_version(item.name, item.version) for item in self.installer.state.all()]
@@ -2,14 +2,32 @@
 
 Handles .sutras.lock files that pin exact versions of dependencies
 for reproducible installations.
+
+Lockfiles are written as YAML by default, or as JSON, which every YAML
+reader also accepts but which is much faster to read and write. Updates are
+batched and written once, atomically, per transaction.
 """
 
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 
 import yaml
 from pydantic import BaseModel, Field
 
+from .locks import FileLock
+
+LOCKFILE_FORMATS = ("yaml", "json")
+
+# libyaml's loader is several times faster than the pure-Python one.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class LockedSkill(BaseModel):
     """A locked skill entry with exact version and integrity info."""
@@ -17,6 +35,7 @@ class LockedSkill(BaseModel):
     name: str = Field(..., description="Full skill name (@namespace/name)")
     version: str = Field(..., description="Exact version installed")
     checksum: str | None = Field(None, description="SHA256 checksum of tarball")
+    tree_digest: str | None = Field(None, description="Digest of the installed file tree")
     registry: str | None = Field(None, description="Registry the skill was installed from")
     tarball_url: str | None = Field(None, description="URL the skill was downloaded from")
     dependencies: list[str] = Field(
@@ -38,13 +57,51 @@ class Lockfile(BaseModel):
 
 
 class LockfileManager:
-    """Manages .sutras.lock files."""
+    """Manages .sutras.lock files.
+
+    Single updates (``add_skill``, ``remove_skill``) each load and save the
+    lockfile. To make many updates with one write, group them:
+
+        with manager.transaction() as lockfile:
+            ...  # read-modify-write under the write lock, saved once on exit
+
+        with manager.batch():
+            ...  # add_skill/remove_skill calls are queued, then applied in
+                 # one transaction on exit; the write lock isn't held meanwhile
+    """
 
     LOCKFILE_NAME = ".sutras.lock"
 
-    def __init__(self, project_path: Path | None = None):
+    def __init__(self, project_path: Path | None = None, file_format: str | None = None):
+        """Initialize the manager.
+
+        Args:
+            project_path: Project directory (default: current directory)
+            file_format: "yaml" or "json" (default: keep the existing file's
+                format, YAML for new lockfiles)
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if file_format is not None and file_format not in LOCKFILE_FORMATS:
+            raise ValueError(
+                f"Unknown lockfile format '{file_format}'. Supported: {', '.join(LOCKFILE_FORMATS)}"
+            )
         self.project_path = project_path or Path.cwd()
         self.lockfile_path = self.project_path / self.LOCKFILE_NAME
+        self.file_format = file_format
+        self._local = threading.local()
+
+    def lock(self, timeout: float | None = None) -> FileLock:
+        """Get the write lock guarding read-modify-write updates of the lockfile.
+
+        Hold it around load() and save() so concurrent sutras processes don't
+        lose each other's entries. The lock file sits next to the lockfile.
+
+        Args:
+            timeout: Seconds to wait before giving up (default: wait forever)
+        """
+        return FileLock(self.lockfile_path.with_name(self.LOCKFILE_NAME + ".lock"), timeout=timeout)
 
     def exists(self) -> bool:
         """Check if lockfile exists."""
@@ -53,32 +110,127 @@ class LockfileManager:
     def load(self) -> Lockfile:
         """Load lockfile from disk.
 
+        Inside a transaction on this thread, the transaction's pending
+        lockfile is returned instead.
+
         Returns:
             Lockfile object (empty if file doesn't exist)
         """
+        current = getattr(self._local, "current", None)
+        if current is not None:
+            return current
+
         if not self.lockfile_path.exists():
             return Lockfile()
 
-        with open(self.lockfile_path) as f:
-            data = yaml.safe_load(f) or {}
+        text = self.lockfile_path.read_text()
+        if text.lstrip().startswith("{"):
+            data = json.loads(text)
+        else:
+            data = yaml.load(text, Loader=_YamlLoader) or {}
 
         return Lockfile(**data)
 
+    def _existing_format(self) -> str | None:
+        try:
+            with open(self.lockfile_path) as f:
+                head = f.read(64).lstrip()
+        except FileNotFoundError:
+            return None
+        return "json" if head.startswith("{") else "yaml"
+
     def save(self, lockfile: Lockfile) -> None:
         """Save lockfile to disk.
 
+        The file is written next to the lockfile and renamed over it, so
+        readers see either the old or the new lockfile, never a partial one.
+
         Args:
             lockfile: Lockfile to save
         """
         lockfile.generated_at = datetime.now(UTC).isoformat()
+        data = lockfile.model_dump(exclude_none=True)
 
-        with open(self.lockfile_path, "w") as f:
-            yaml.safe_dump(
-                lockfile.model_dump(exclude_none=True),
-                f,
-                sort_keys=False,
-                default_flow_style=False,
-            )
+        file_format = self.file_format or self._existing_format() or "yaml"
+        if file_format == "json":
+            text = json.dumps(data, indent=2) + "\n"
+        else:
+            text = yaml.safe_dump(data, sort_keys=False, default_flow_style=False)
+
+        self.project_path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.project_path, prefix=f"{self.LOCKFILE_NAME}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, self.lockfile_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def transaction(self) -> Iterator[Lockfile]:
+        """Load the lockfile under the write lock and save it once on exit.
+
+        The lockfile is only written if it changed, and not at all if the
+        block raises. Nested transactions on the same thread share the outer
+        one, and ``load``, ``add_skill`` and ``remove_skill`` operate on it.
+
+        Yields:
+            Lockfile to read and modify
+        """
+        current = getattr(self._local, "current", None)
+        if current is not None:
+            yield current
+            return
+
+        with self.lock():
+            lockfile = self.load()
+            before = lockfile.model_dump()
+            self._local.current = lockfile
+            try:
+                yield lockfile
+            finally:
+                self._local.current = None
+            if lockfile.model_dump() != before:
+                self.save(lockfile)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Queue ``add_skill``/``remove_skill`` calls and apply them in one write.
+
+        Unlike a transaction, the write lock is only taken on exit, so a batch
+        can span slow work such as downloads. Queued changes are discarded if
+        the block raises. Nested batches on the same thread join the outer one.
+        """
+        if getattr(self._local, "queue", None) is not None:
+            yield
+            return
+
+        queue: list[Callable[[Lockfile], None]] = []
+        self._local.queue = queue
+        try:
+            yield
+        finally:
+            self._local.queue = None
+
+        if queue:
+            with self.transaction() as lockfile:
+                for change in queue:
+                    change(lockfile)
+
+    def _apply(self, change: Callable[[Lockfile], None]) -> None:
+        """Apply a change now, or queue it if this thread is in a batch."""
+        queue = getattr(self._local, "queue", None)
+        if queue is not None and getattr(self._local, "current", None) is None:
+            queue.append(change)
+            return
+        with self.transaction() as lockfile:
+            change(lockfile)
 
     def add_skill(
         self,
@@ -88,6 +240,7 @@ class LockfileManager:
         registry: str | None = None,
         tarball_url: str | None = None,
         dependencies: list[str] | None = None,
+        tree_digest: str | None = None,
     ) -> None:
         """Add or update a locked skill.
 
@@ -98,17 +251,18 @@ class LockfileManager:
             registry: Source registry
             tarball_url: Download URL
             dependencies: Direct dependencies
+            tree_digest: Digest of the installed file tree
         """
-        lockfile = self.load()
-        lockfile.skills[name] = LockedSkill(
+        skill = LockedSkill(
             name=name,
             version=version,
             checksum=checksum,
+            tree_digest=tree_digest,
             registry=registry,
             tarball_url=tarball_url,
             dependencies=dependencies or [],
         )
-        self.save(lockfile)
+        self._apply(lambda lockfile: lockfile.skills.__setitem__(name, skill))
 
     def remove_skill(self, name: str) -> None:
         """Remove a skill from the lockfile.
@@ -116,10 +270,23 @@ class LockfileManager:
         Args:
             name: Skill name to remove
         """
-        lockfile = self.load()
-        if name in lockfile.skills:
-            del lockfile.skills[name]
-            self.save(lockfile)
+        self._apply(lambda lockfile: lockfile.skills.pop(name, None))
+
+    def content_hash(self) -> str | None:
+        """Hash the locked skills, ignoring volatile fields like ``generated_at``.
+
+        Returns:
+            SHA256 hex digest, or None if no lockfile exists
+        """
+        if not self.lockfile_path.exists():
+            return None
+
+        skills = {
+            name: skill.model_dump(exclude_none=True)
+            for name, skill in sorted(self.load().skills.items())
+        }
+        payload = json.dumps(skills, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
 
     def get_skill(self, name: str) -> LockedSkill | None:
         """Get a locked skill by name.
@@ -147,8 +314,10 @@ class LockfileManager:
 
     def clear(self) -> None:
         """Clear all locked skills."""
-        lockfile = Lockfile()
-        self.save(lockfile)
+        with self.transaction() as lockfile:
+            lockfile.skills.clear()
+            if not self.exists():
+                self.save(lockfile)
 
     def delete(self) -> None:
         """Delete the lockfile."""
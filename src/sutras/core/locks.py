@@ -0,0 +1,130 @@
+"""Cross-process file locks for Sutras.
+
+Coordinates concurrent sutras processes (for example parallel CI jobs on one
+machine) that install into the same directories. Locks are advisory
+``fcntl.flock`` locks on small files under ~/.sutras/locks/, so they are
+released automatically if a process dies.
+
+Within a process, a lock is re-entrant for the thread holding it and other
+threads wait their turn, which keeps one flock per lock file per process.
+On platforms without ``fcntl`` only the in-process part applies.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+POLL_INTERVAL = 0.05
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a lock cannot be acquired within the timeout."""
+
+    pass
+
+
+class _HeldLock:
+    """Process-wide state for one lock file."""
+
+    def __init__(self) -> None:
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.fd: int | None = None
+
+
+_held: dict[str, _HeldLock] = {}
+_held_guard = threading.Lock()
+
+
+def _state(path: Path) -> _HeldLock:
+    key = os.path.abspath(path)
+    with _held_guard:
+        if key not in _held:
+            _held[key] = _HeldLock()
+        return _held[key]
+
+
+def lock_name(*parts: str) -> str:
+    """Build a safe lock file name from arbitrary parts (names, versions, URLs)."""
+    readable = "-".join(parts)
+    safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in readable)[:80]
+    digest = hashlib.sha256("\0".join(parts).encode()).hexdigest()[:12]
+    return f"{safe}-{digest}.lock"
+
+
+class FileLock:
+    """Exclusive advisory lock on a file.
+
+    Usage:
+        with FileLock(locks_dir / "skill@1.0.0.lock", timeout=60):
+            ...
+    """
+
+    def __init__(self, path: Path, timeout: float | None = None):
+        self.path = path
+        self.timeout = timeout
+        self._state = _state(path)
+
+    def acquire(self) -> None:
+        """Acquire the lock, waiting up to ``timeout`` seconds.
+
+        Raises:
+            LockTimeout: If the lock is still held elsewhere after the timeout
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        state = self._state
+
+        if not state.rlock.acquire(timeout=-1 if self.timeout is None else self.timeout):
+            raise LockTimeout(f"Timed out waiting for lock {self.path}")
+
+        if state.depth == 0:
+            try:
+                state.fd = self._lock_file(deadline)
+            except BaseException:
+                state.rlock.release()
+                raise
+        state.depth += 1
+
+    def _lock_file(self, deadline: float | None) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is None:
+            return fd
+
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (fcntl.LOCK_NB if deadline is not None else 0))
+                return fd
+            except BlockingIOError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out waiting for lock {self.path}") from None
+                time.sleep(POLL_INTERVAL)
+            except BaseException:
+                os.close(fd)
+                raise
+
+    def release(self) -> None:
+        """Release one level of the lock."""
+        state = self._state
+        state.depth -= 1
+        if state.depth == 0 and state.fd is not None:
+            if fcntl is not None:
+                fcntl.flock(state.fd, fcntl.LOCK_UN)
+            os.close(state.fd)
+            state.fd = None
+        state.rlock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
@@ -218,6 +218,8 @@ class SkillPublisher:
         print(f"Building {skill_name}...")
         builder = SkillBuilder(skill, output_dir=build_dir or Path.cwd() / "dist")
         tarball_path = builder.build()
+        if builder.from_cache:
+            print(f"✓ Reusing {tarball_path.name}, nothing changed since the last build")
 
         version = skill.abi.version if skill.abi else "0.0.0"
 
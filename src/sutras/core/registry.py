@@ -14,10 +14,12 @@ from pathlib import Path
 from typing import Any
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from .archive import COMPRESSIONS
 from .config import SutrasConfig
 from .naming import SkillName
+from .semver import Version
 
 
 class SkillIndexEntry(BaseModel):
@@ -34,6 +36,27 @@ class SkillIndexEntry(BaseModel):
         default_factory=dict, description="Available versions (version -> tarball_url)"
     )
 
+    _sorted_versions: list[Version] | None = PrivateAttr(default=None)
+
+    def available_versions(self) -> list[str]:
+        """All version strings published for this skill, latest included."""
+        return list(dict.fromkeys([self.version, *self.versions]))
+
+    def sorted_versions(self) -> list[Version]:
+        """Parseable versions sorted ascending, computed once per entry.
+
+        Unparseable version strings are skipped.
+        """
+        if self._sorted_versions is None:
+            parsed = []
+            for v in self.available_versions():
+                try:
+                    parsed.append(Version.parse(v))
+                except ValueError:
+                    continue
+            self._sorted_versions = sorted(parsed)
+        return self._sorted_versions
+
 
 class RegistryMetadata(BaseModel):
     """Registry metadata from registry.yaml."""
@@ -181,6 +204,59 @@ class RegistryManager:
         self._cached_registries[name] = cached
         return cached
 
+    def get_index_revision(self, name: str) -> str | None:
+        """Get a revision identifier for a registry's cached index.
+
+        Uses the checked-out git commit when the cache is a git clone, falling
+        back to a hash of ``index.yaml``. Reads files only; never clones.
+
+        Args:
+            name: Registry name
+
+        Returns:
+            Revision string, or None if the registry is not cached yet
+        """
+        cache_path = self._get_registry_cache_path(name)
+        if not cache_path.exists():
+            return None
+
+        head = self._read_git_head(cache_path)
+        if head:
+            return head
+
+        index_path = cache_path / "index.yaml"
+        if index_path.exists():
+            return hashlib.sha256(index_path.read_bytes()).hexdigest()
+        return None
+
+    def get_index_revisions(self) -> dict[str, str | None]:
+        """Get index revisions for every configured registry."""
+        return {name: self.get_index_revision(name) for name in self.config.list_registries()}
+
+    def _read_git_head(self, repo_path: Path) -> str | None:
+        """Resolve HEAD of a git checkout without spawning git."""
+        git_dir = repo_path / ".git"
+        head_path = git_dir / "HEAD"
+        if not head_path.is_file():
+            return None
+
+        head = head_path.read_text().strip()
+        if not head.startswith("ref: "):
+            return head
+
+        ref = head[5:]
+        ref_path = git_dir / ref
+        if ref_path.is_file():
+            return ref_path.read_text().strip()
+
+        packed = git_dir / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text().splitlines():
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+        return None
+
     def search_skill(self, skill_name: str | SkillName) -> list[tuple[str, SkillIndexEntry]]:
         """Search for a skill across all registries.
 
@@ -265,11 +341,17 @@ class RegistryManager:
             description = skill_data.get("description")
             homepage = skill_data.get("distribution", {}).get("homepage")
 
-            tarball_path = skill_dir / f"{skill_dir.name}-{version}.tar.gz"
+            tarball_path = None
+            for compression in COMPRESSIONS.values():
+                candidate = skill_dir / f"{skill_dir.name}-{version}{compression.extension}"
+                if candidate.exists():
+                    tarball_path = candidate
+                    break
+
             tarball_url = None
             checksum = None
 
-            if tarball_path.exists():
+            if tarball_path is not None:
                 with open(tarball_path, "rb") as f:
                     checksum = hashlib.sha256(f.read()).hexdigest()
                 tarball_url = f"skills/{skill_dir.name}/{tarball_path.name}"
@@ -5,14 +5,21 @@ Provides dependency resolution with:
 - Conflict detection
 - Circular dependency detection
 - Topological sorting for install order
+- Persistent caching of resolution results
 """
 
-from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 import yaml
 
 from .abi import DependencyConfig
+from .config import RegistryConfigEntry
 from .lockfile import LockfileManager
 from .naming import SkillName
 from .registry import RegistryManager, SkillIndexEntry
@@ -29,6 +36,7 @@ class ResolvedSkill:
     tarball_url: str | None
     checksum: str | None
     dependencies: list[str] = field(default_factory=list)
+    tree_digest: str | None = None
 
 
 class DependencyConflictError(Exception):
@@ -89,6 +97,96 @@ class DependencyRequest:
     optional: bool = False
 
 
+class ResolutionCache:
+    """Persistent cache of resolution results.
+
+    Entries are keyed by everything resolution depends on: the normalised
+    root requests, each registry's index revision and settings (enabled,
+    priority, URL and namespace decide which registry a skill comes from)
+    and the lockfile contents. When none of those change, a previous result
+    can be reused as-is.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def make_key(
+        requests: list[DependencyRequest],
+        registry_revisions: dict[str, str | None],
+        lockfile_hash: str | None,
+        registry_configs: dict[str, RegistryConfigEntry] | None = None,
+    ) -> str:
+        """Build a cache key from resolution inputs.
+
+        Args:
+            requests: Root dependency requests (order-insensitive)
+            registry_revisions: Registry name -> index revision
+            lockfile_hash: Hash of the lockfile contents, if one is used
+            registry_configs: Registry name -> configuration
+
+        Returns:
+            SHA256 hex digest identifying the inputs
+        """
+        settings = {
+            name: [entry.enabled, entry.priority, entry.url, entry.namespace]
+            for name, entry in (registry_configs or {}).items()
+        }
+        payload = {
+            "requests": sorted(
+                [r.name, r.constraint.strip(), r.source, r.registry, r.optional] for r in requests
+            ),
+            "registries": sorted(
+                [name, revision, settings.get(name)]
+                for name, revision in registry_revisions.items()
+            ),
+            "lockfile": lockfile_hash,
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> list[ResolvedSkill] | None:
+        """Load a cached resolution result.
+
+        Returns:
+            Resolved skills in installation order, or None on a miss
+        """
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return [ResolvedSkill(**item) for item in data["resolved"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, resolved: list[ResolvedSkill]) -> None:
+        """Store a resolution result, replacing any existing entry atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = {"resolved": [asdict(skill) for skill in resolved]}
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_name, self._entry_path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        """Remove all cached resolution results."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
 class DependencyResolver:
     """Resolves skill dependencies with conflict detection."""
 
@@ -97,13 +195,16 @@ class DependencyResolver:
         registry_manager: RegistryManager | None = None,
         lockfile_manager: LockfileManager | None = None,
         use_lockfile: bool = True,
+        cache: ResolutionCache | None = None,
     ):
         self.registry_manager = registry_manager or RegistryManager()
         self.lockfile_manager = lockfile_manager or LockfileManager()
         self.use_lockfile = use_lockfile
+        self.cache = cache
 
         self._resolved: dict[str, ResolvedSkill] = {}
         self._constraints: dict[str, list[tuple[str, str]]] = {}
+        self._ranges: dict[str, VersionRange] = {}
         self._resolution_stack: list[str] = []
 
     def resolve(self, dependencies: list[DependencyRequest]) -> list[ResolvedSkill]:
@@ -123,18 +224,43 @@ class DependencyResolver:
         """
         self._resolved = {}
         self._constraints = {}
+        self._ranges = {}
         self._resolution_stack = []
 
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(dependencies)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._resolved = {skill.name: skill for skill in cached}
+                return cached
+
         for dep in dependencies:
             if dep.optional:
-                try:
-                    self._resolve_one(dep)
-                except (SkillNotFoundError, NoMatchingVersionError):
-                    continue
+                self._resolve_optional(dep)
             else:
                 self._resolve_one(dep)
 
-        return self._topological_sort()
+        result = self._topological_sort()
+        if cache_key is not None:
+            try:
+                self.cache.put(cache_key, result)
+            except OSError:
+                # The cache only saves work; a result that can't be stored is still valid.
+                pass
+        return result
+
+    def _cache_key(self, dependencies: list[DependencyRequest]) -> str:
+        """Compute the resolution cache key for a set of root requests."""
+        lockfile_hash = None
+        if self.use_lockfile:
+            lockfile_hash = self.lockfile_manager.content_hash()
+        return ResolutionCache.make_key(
+            dependencies,
+            self.registry_manager.get_index_revisions(),
+            lockfile_hash,
+            self.registry_manager.config.list_registries(),
+        )
 
     def _resolve_one(self, request: DependencyRequest) -> ResolvedSkill | None:
         """Resolve a single dependency.
@@ -182,7 +308,8 @@ class DependencyResolver:
                 version=version,
                 registry=registry_name,
                 tarball_url=tarball_url,
-                checksum=entry.checksum,
+                # The index only carries a checksum for the latest version.
+                checksum=entry.checksum if version == entry.version else None,
                 dependencies=[d.name for d in deps],
             )
             self._resolved[skill_name] = resolved
@@ -196,10 +323,7 @@ class DependencyResolver:
                     optional=dep.optional,
                 )
                 if dep.optional:
-                    try:
-                        self._resolve_one(dep_request)
-                    except (SkillNotFoundError, NoMatchingVersionError):
-                        continue
+                    self._resolve_optional(dep_request)
                 else:
                     self._resolve_one(dep_request)
 
@@ -207,12 +331,43 @@ class DependencyResolver:
         finally:
             self._resolution_stack.pop()
 
+    def _resolve_optional(self, request: DependencyRequest) -> None:
+        """Resolve an optional dependency, skipping it if it cannot be found.
+
+        A skipped branch is rolled back, so neither its constraints nor any
+        skills it resolved along the way affect later requests.
+        """
+        constraints = {name: list(items) for name, items in self._constraints.items()}
+        ranges = dict(self._ranges)
+        resolved = dict(self._resolved)
+        try:
+            self._resolve_one(request)
+        except (SkillNotFoundError, NoMatchingVersionError):
+            self._constraints = constraints
+            self._ranges = ranges
+            self._resolved = resolved
+
     def _add_constraint(self, skill_name: str, constraint: str, source: str) -> None:
-        """Record a constraint for conflict reporting."""
+        """Record a constraint and fail fast if it cannot coexist with earlier ones.
+
+        Raises:
+            DependencyConflictError: If the combined range for the skill is empty
+        """
         if skill_name not in self._constraints:
             self._constraints[skill_name] = []
         self._constraints[skill_name].append((source, constraint))
 
+        try:
+            version_range = VersionRange.parse(constraint)
+        except ValueError:
+            return
+
+        combined = self._ranges.get(skill_name)
+        combined = version_range if combined is None else combined.intersect(version_range)
+        self._ranges[skill_name] = combined
+        if combined.is_empty():
+            raise DependencyConflictError(skill_name, self._constraints[skill_name])
+
     def _version_matches(self, version: str, constraint: str) -> bool:
         """Check if a version matches a constraint."""
         try:
@@ -260,31 +415,20 @@ class DependencyResolver:
                 continue
 
         _, first_entry = results[0]
-        available = [first_entry.version] + list(first_entry.versions.keys())
-        raise NoMatchingVersionError(skill_name, constraint, list(set(available)))
+        raise NoMatchingVersionError(skill_name, constraint, first_entry.available_versions())
 
     def _select_version(self, entry: SkillIndexEntry, constraint: str, skill_name: str) -> str:
         """Select the best version from an entry."""
-        available = [entry.version] + list(entry.versions.keys())
-        available = list(set(available))
-
         try:
             version_range = VersionRange.parse(constraint)
-            parsed_versions = []
-            for v in available:
-                try:
-                    parsed_versions.append(Version.parse(v))
-                except ValueError:
-                    continue
-
-            selected = version_range.select_highest(parsed_versions)
+            selected = version_range.select_highest_sorted(entry.sorted_versions())
             if selected:
                 return str(selected)
         except ValueError:
-            if constraint in available:
+            if constraint in entry.available_versions():
                 return constraint
 
-        raise NoMatchingVersionError(skill_name, constraint, available)
+        raise NoMatchingVersionError(skill_name, constraint, entry.available_versions())
 
     def _get_skill_dependencies(
         self, skill_name: str, version: str, registry_name: str
@@ -327,51 +471,86 @@ class DependencyResolver:
 
     def _topological_sort(self) -> list[ResolvedSkill]:
         """Sort resolved skills in dependency order (leaves first)."""
-        in_degree: dict[str, int] = dict.fromkeys(self._resolved, 0)
-        for skill in self._resolved.values():
-            for dep in skill.dependencies:
-                if dep in in_degree:
-                    in_degree[dep] += 1
-
-        queue = [name for name, degree in in_degree.items() if degree == 0]
-        result = []
-
-        while queue:
-            name = queue.pop(0)
-            result.append(self._resolved[name])
-
-            for dep in self._resolved[name].dependencies:
-                if dep in in_degree:
-                    in_degree[dep] -= 1
-                    if in_degree[dep] == 0:
-                        queue.append(dep)
+        return [skill for level in topological_levels(self._resolved.values()) for skill in level]
 
-        if len(result) != len(self._resolved):
-            missing = set(self._resolved.keys()) - {s.name for s in result}
-            raise CircularDependencyError(list(missing))
+    def install_levels(self) -> list[list[ResolvedSkill]]:
+        """Group the last resolution into install levels (leaves first).
 
-        return result
+        Skills within a level do not depend on each other, so each level can
+        be installed in parallel once the previous one has finished.
+        """
+        return topological_levels(self._resolved.values())
 
     def update_lockfile(self, resolved: list[ResolvedSkill]) -> None:
         """Update the lockfile with resolved dependencies.
 
+        Entries for other skills are kept, and all entries are written in one
+        batch under the lockfile's write lock so concurrent installs don't
+        drop each other's entries. Inside a caller's batch, the entries join it.
+
         Args:
             resolved: List of resolved skills
         """
-        from .lockfile import LockedSkill, Lockfile
-
-        lockfile = Lockfile()
-        for skill in resolved:
-            lockfile.skills[skill.name] = LockedSkill(
-                name=skill.name,
-                version=skill.version,
-                checksum=skill.checksum,
-                registry=skill.registry,
-                tarball_url=skill.tarball_url,
-                dependencies=skill.dependencies,
-            )
+        with self.lockfile_manager.batch():
+            for skill in resolved:
+                self.lockfile_manager.add_skill(
+                    name=skill.name,
+                    version=skill.version,
+                    checksum=skill.checksum,
+                    registry=skill.registry,
+                    tarball_url=skill.tarball_url,
+                    dependencies=skill.dependencies,
+                    tree_digest=skill.tree_digest,
+                )
+
+
+def topological_levels(skills: Iterable[ResolvedSkill]) -> list[list[ResolvedSkill]]:
+    """Group skills into dependency levels using Kahn's algorithm.
 
-        self.lockfile_manager.save(lockfile)
+    Level 0 holds skills with no dependencies inside the set, level 1 holds
+    skills depending only on level 0, and so on. Runs in O(V + E) plus the
+    sort within each level; levels are ordered by skill name so the result
+    does not depend on input order. Dependencies outside the set are ignored.
+
+    Args:
+        skills: Resolved skills
+
+    Returns:
+        List of levels, each a name-sorted list of skills
+
+    Raises:
+        CircularDependencyError: If the skills contain a dependency cycle
+    """
+    by_name = {skill.name: skill for skill in skills}
+    unmet: dict[str, int] = {}
+    dependents: dict[str, list[str]] = {name: [] for name in by_name}
+
+    for name, skill in by_name.items():
+        deps = {dep for dep in skill.dependencies if dep in by_name}
+        unmet[name] = len(deps)
+        for dep in deps:
+            dependents[dep].append(name)
+
+    levels: list[list[ResolvedSkill]] = []
+    ready = sorted(name for name, count in unmet.items() if count == 0)
+    placed = 0
+
+    while ready:
+        levels.append([by_name[name] for name in ready])
+        placed += len(ready)
+
+        next_ready = []
+        for name in ready:
+            for dependent in dependents[name]:
+                unmet[dependent] -= 1
+                if unmet[dependent] == 0:
+                    next_ready.append(dependent)
+        ready = sorted(next_ready)
+
+    if placed != len(by_name):
+        raise CircularDependencyError(sorted(name for name, count in unmet.items() if count > 0))
+
+    return levels
 
 
 def resolve_dependencies(
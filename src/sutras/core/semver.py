@@ -6,27 +6,51 @@ Supports npm-style semver constraints:
 - Tilde: ~1.2.3 (compatible with 1.2.x)
 - Ranges: >=1.0.0 <2.0.0
 - Wildcards: 1.x, 1.2.x, *
+- Unions: ^1.0.0 || ^2.0.0
+
+Ranges normalise to a sorted list of disjoint intervals, so they can be
+intersected, unioned and tested for emptiness without enumerating versions.
 """
 
 import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass
+from functools import cached_property
 
+# Official SemVer 2.0.0 grammar: no leading zeros in numeric identifiers,
+# dot-separated non-empty prerelease and build identifiers. Digits are ASCII
+# only; \d would also accept other Unicode digits, which int() then parses.
+SEMVER_PATTERN = re.compile(
+    r"^(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)"
+    r"(?:-((?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
 
-@dataclass
+
+@dataclass(frozen=True)
 class Version:
-    """Represents a semantic version."""
+    """Represents a semantic version.
+
+    Ordering and equality follow SemVer 2.0.0 precedence: prerelease
+    identifiers compare one by one (numeric identifiers numerically and below
+    alphanumeric ones) and build metadata is ignored. Versions are immutable,
+    so the cached sort key can't go stale.
+    """
 
     major: int
     minor: int
     patch: int
     prerelease: str | None = None
+    build: str | None = None
 
     @classmethod
     def parse(cls, version_str: str) -> "Version":
         """Parse a version string.
 
         Args:
-            version_str: Version string (e.g., "1.2.3", "1.2.3-alpha")
+            version_str: Version string (e.g., "1.2.3", "1.2.3-alpha", "1.2.3+build.5")
 
         Returns:
             Parsed Version object
@@ -36,59 +60,61 @@ class Version:
         """
         version_str = version_str.strip().lstrip("v")
 
-        match = re.match(
-            r"^(\d+)\.(\d+)\.(\d+)(?:-([a-zA-Z0-9.-]+))?$",
-            version_str,
-        )
+        match = SEMVER_PATTERN.match(version_str)
         if not match:
             raise ValueError(f"Invalid version format: '{version_str}'")
 
-        major, minor, patch, prerelease = match.groups()
+        major, minor, patch, prerelease, build = match.groups()
         return cls(
             major=int(major),
             minor=int(minor),
             patch=int(patch),
             prerelease=prerelease,
+            build=build,
         )
 
+    @cached_property
+    def sort_key(self) -> tuple:
+        """Precedence key, computed once so sorting large version lists stays cheap."""
+        if self.prerelease is None:
+            pre: tuple = (1,)
+        else:
+            pre = (
+                0,
+                tuple(
+                    (0, int(ident), "") if ident.isdigit() else (1, 0, ident)
+                    for ident in self.prerelease.split(".")
+                ),
+            )
+        return (self.major, self.minor, self.patch, pre)
+
     def __str__(self) -> str:
         base = f"{self.major}.{self.minor}.{self.patch}"
         if self.prerelease:
-            return f"{base}-{self.prerelease}"
+            base = f"{base}-{self.prerelease}"
+        if self.build:
+            base = f"{base}+{self.build}"
         return base
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Version):
             return NotImplemented
-        return (
-            self.major == other.major
-            and self.minor == other.minor
-            and self.patch == other.patch
-            and self.prerelease == other.prerelease
-        )
+        return self.sort_key == other.sort_key
 
     def __lt__(self, other: "Version") -> bool:
-        if (self.major, self.minor, self.patch) != (other.major, other.minor, other.patch):
-            return (self.major, self.minor, self.patch) < (other.major, other.minor, other.patch)
-        if self.prerelease is None and other.prerelease is None:
-            return False
-        if self.prerelease is None:
-            return False
-        if other.prerelease is None:
-            return True
-        return self.prerelease < other.prerelease
+        return self.sort_key < other.sort_key
 
     def __le__(self, other: "Version") -> bool:
-        return self == other or self < other
+        return self.sort_key <= other.sort_key
 
     def __gt__(self, other: "Version") -> bool:
-        return not self <= other
+        return self.sort_key > other.sort_key
 
     def __ge__(self, other: "Version") -> bool:
-        return self == other or self > other
+        return self.sort_key >= other.sort_key
 
     def __hash__(self) -> int:
-        return hash((self.major, self.minor, self.patch, self.prerelease))
+        return hash(self.sort_key)
 
 
 @dataclass
@@ -114,12 +140,197 @@ class VersionConstraint:
             return version != self.version
         return False
 
+    def to_intervals(self) -> list["VersionInterval"]:
+        """Convert this constraint to the intervals it admits."""
+        v = self.version
+        if self.operator == "=":
+            return [VersionInterval(Bound(v, True), Bound(v, True))]
+        elif self.operator == ">":
+            return [VersionInterval(Bound(v, False), None)]
+        elif self.operator == ">=":
+            return [VersionInterval(Bound(v, True), None)]
+        elif self.operator == "<":
+            return [VersionInterval(None, Bound(v, False))]
+        elif self.operator == "<=":
+            return [VersionInterval(None, Bound(v, True))]
+        elif self.operator == "!=":
+            return [
+                VersionInterval(None, Bound(v, False)),
+                VersionInterval(Bound(v, False), None),
+            ]
+        return []
+
+
+@dataclass(frozen=True)
+class Bound:
+    """One end of a version interval."""
+
+    version: Version
+    inclusive: bool
+
+
+@dataclass(frozen=True)
+class VersionInterval:
+    """A contiguous span of versions. A ``None`` bound is unbounded."""
+
+    lower: Bound | None = None
+    upper: Bound | None = None
+
+    def is_empty(self) -> bool:
+        """Check if no version can fall inside this interval."""
+        if self.lower is None or self.upper is None:
+            return False
+        if self.lower.version == self.upper.version:
+            return not (self.lower.inclusive and self.upper.inclusive)
+        return self.lower.version > self.upper.version
+
+    def contains(self, version: Version) -> bool:
+        """Check if a version falls inside this interval."""
+        if self.lower is not None:
+            if version < self.lower.version:
+                return False
+            if version == self.lower.version and not self.lower.inclusive:
+                return False
+        if self.upper is not None:
+            if version > self.upper.version:
+                return False
+            if version == self.upper.version and not self.upper.inclusive:
+                return False
+        return True
+
+    def intersect(self, other: "VersionInterval") -> "VersionInterval":
+        """Return the overlap of two intervals (possibly empty)."""
+        return VersionInterval(
+            _tighter_lower(self.lower, other.lower),
+            _tighter_upper(self.upper, other.upper),
+        )
+
+    def to_constraints(self) -> list[VersionConstraint]:
+        """Express this interval as a conjunction of constraints."""
+        if (
+            self.lower is not None
+            and self.upper is not None
+            and self.lower.version == self.upper.version
+            and self.lower.inclusive
+            and self.upper.inclusive
+        ):
+            return [VersionConstraint("=", self.lower.version)]
+
+        constraints = []
+        if self.lower is not None:
+            op = ">=" if self.lower.inclusive else ">"
+            constraints.append(VersionConstraint(op, self.lower.version))
+        if self.upper is not None:
+            op = "<=" if self.upper.inclusive else "<"
+            constraints.append(VersionConstraint(op, self.upper.version))
+        return constraints
+
+    def __str__(self) -> str:
+        if self.lower is None and self.upper is None:
+            return "*"
+        parts = []
+        for c in self.to_constraints():
+            op = "" if c.operator == "=" else c.operator
+            parts.append(f"{op}{c.version}")
+        return " ".join(parts)
+
+
+def _tighter_lower(a: Bound | None, b: Bound | None) -> Bound | None:
+    """Pick the more restrictive of two lower bounds."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.version != b.version:
+        return a if a.version > b.version else b
+    return a if not a.inclusive else b
+
+
+def _tighter_upper(a: Bound | None, b: Bound | None) -> Bound | None:
+    """Pick the more restrictive of two upper bounds."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.version != b.version:
+        return a if a.version < b.version else b
+    return a if not a.inclusive else b
+
+
+def _touches(upper: Bound | None, lower: Bound | None) -> bool:
+    """Check if an interval ending at ``upper`` overlaps or abuts one starting at ``lower``."""
+    if upper is None or lower is None:
+        return True
+    if upper.version != lower.version:
+        return upper.version > lower.version
+    return upper.inclusive or lower.inclusive
+
+
+def _lower_key(interval: VersionInterval) -> tuple:
+    """Sort key placing unbounded and inclusive lower bounds first."""
+    if interval.lower is None:
+        return (0,)
+    return (1, interval.lower.version, not interval.lower.inclusive)
+
+
+def normalize_intervals(intervals: list[VersionInterval]) -> list[VersionInterval]:
+    """Drop empty intervals and merge overlapping ones into sorted, disjoint spans."""
+    candidates = sorted((i for i in intervals if not i.is_empty()), key=_lower_key)
+
+    merged: list[VersionInterval] = []
+    for interval in candidates:
+        if merged and _touches(merged[-1].upper, interval.lower):
+            last = merged[-1]
+            if last.upper is None or interval.upper is None:
+                upper = None
+            elif last.upper.version != interval.upper.version:
+                upper = max(last.upper, interval.upper, key=lambda b: b.version)
+            else:
+                upper = last.upper if last.upper.inclusive else interval.upper
+            merged[-1] = VersionInterval(last.lower, upper)
+        else:
+            merged.append(interval)
+    return merged
+
+
+def _intersect_intervals(
+    left: list[VersionInterval], right: list[VersionInterval]
+) -> list[VersionInterval]:
+    """Intersect two normalised interval lists."""
+    return normalize_intervals([a.intersect(b) for a in left for b in right])
+
 
 class VersionRange:
     """Represents a version range constraint (potentially multiple constraints)."""
 
     def __init__(self, constraints: list[VersionConstraint] | None = None):
         self.constraints = constraints or []
+        self._intervals: list[VersionInterval] | None = None
+
+    @classmethod
+    def from_intervals(cls, intervals: list[VersionInterval]) -> "VersionRange":
+        """Build a range from intervals, normalising them first.
+
+        Single-interval ranges keep an equivalent constraint list; unions of
+        several intervals are represented by their intervals only.
+        """
+        normalized = normalize_intervals(intervals)
+        if len(normalized) == 1:
+            result = cls(normalized[0].to_constraints())
+        else:
+            result = cls()
+        result._intervals = normalized
+        return result
+
+    @property
+    def intervals(self) -> list[VersionInterval]:
+        """Canonical sorted, disjoint intervals admitted by this range."""
+        if self._intervals is None:
+            intervals = [VersionInterval()]
+            for c in self.constraints:
+                intervals = _intersect_intervals(intervals, c.to_intervals())
+            self._intervals = intervals
+        return self._intervals
 
     @classmethod
     def parse(cls, constraint_str: str) -> "VersionRange":
@@ -140,6 +351,10 @@ class VersionRange:
         """
         constraint_str = constraint_str.strip()
 
+        if "||" in constraint_str:
+            alternatives = [cls.parse(part) for part in constraint_str.split("||")]
+            return cls.from_intervals([i for alt in alternatives for i in alt.intervals])
+
         if not constraint_str or constraint_str == "*":
             return cls([VersionConstraint(">=", Version(0, 0, 0))])
 
@@ -211,6 +426,8 @@ class VersionRange:
     def _parse_wildcard(cls, constraint_str: str) -> "VersionRange":
         """Parse wildcard constraint (1.x -> >=1.0.0 <2.0.0)."""
         parts = constraint_str.replace("*", "x").split(".")
+        if not all(re.fullmatch(r"[0-9]+", part) for part in parts[:-1]):
+            raise ValueError(f"Invalid wildcard constraint: '{constraint_str}'")
 
         if len(parts) == 2 and parts[1] == "x":
             major = int(parts[0])
@@ -233,8 +450,30 @@ class VersionRange:
         raise ValueError(f"Invalid wildcard constraint: '{constraint_str}'")
 
     def matches(self, version: Version) -> bool:
-        """Check if a version matches all constraints."""
-        return all(c.matches(version) for c in self.constraints)
+        """Check if a version falls inside the range."""
+        return any(i.contains(version) for i in self.intervals)
+
+    def intersect(self, other: "VersionRange") -> "VersionRange":
+        """Return the range of versions admitted by both ranges."""
+        return VersionRange.from_intervals(_intersect_intervals(self.intervals, other.intervals))
+
+    def union(self, other: "VersionRange") -> "VersionRange":
+        """Return the range of versions admitted by either range."""
+        return VersionRange.from_intervals(self.intervals + other.intervals)
+
+    def is_empty(self) -> bool:
+        """Check if no version can satisfy the range."""
+        return not self.intervals
+
+    @property
+    def lower_bound(self) -> Bound | None:
+        """Lowest bound of the range, or None if unbounded below or empty."""
+        return self.intervals[0].lower if self.intervals else None
+
+    @property
+    def upper_bound(self) -> Bound | None:
+        """Highest bound of the range, or None if unbounded above or empty."""
+        return self.intervals[-1].upper if self.intervals else None
 
     def select_highest(self, versions: list[Version]) -> Version | None:
         """Select the highest version that matches the constraints.
@@ -250,7 +489,35 @@ class VersionRange:
             return None
         return max(matching)
 
+    def select_highest_sorted(self, versions: Sequence[Version]) -> Version | None:
+        """Select the highest matching version from an ascending sorted sequence.
+
+        Walks the intervals from the top and bisects for each one, so the cost
+        is logarithmic in the number of versions rather than linear.
+
+        Args:
+            versions: Available versions, sorted ascending
+
+        Returns:
+            Highest matching version, or None if no match
+        """
+        for interval in reversed(self.intervals):
+            if interval.upper is None:
+                end = len(versions)
+            elif interval.upper.inclusive:
+                end = bisect_right(versions, interval.upper.version)
+            else:
+                end = bisect_left(versions, interval.upper.version)
+
+            if end and interval.contains(versions[end - 1]):
+                return versions[end - 1]
+        return None
+
     def __str__(self) -> str:
+        if not self.constraints and self._intervals is not None:
+            if not self._intervals:
+                return "<0.0.0-0"
+            return " || ".join(str(i) for i in self._intervals)
         if not self.constraints:
             return "*"
         parts = []
@@ -8,6 +8,7 @@ from typing import Any
 import yaml
 
 from sutras.core.abi import SutrasABI
+from sutras.core.ignore import IgnoreMatcher, walk_files
 
 
 @dataclass
@@ -110,15 +111,15 @@ class Skill:
             abi_data = yaml.safe_load(ability_yaml.read_text())
             abi = SutrasABI(**abi_data)
 
-        # Discover supporting files
+        # Discover supporting files, recursively, honouring .sutrasignore
         supporting_files = {}
-        for file_path in skill_path.glob("*"):
-            if file_path.is_file() and file_path.name not in [
+        for rel_path, file_path in walk_files(skill_path, IgnoreMatcher.for_directory(skill_path)):
+            if rel_path not in [
                 "SKILL.md",
                 "sutras.yaml",
                 "ability.yaml",
             ]:
-                supporting_files[file_path.name] = file_path
+                supporting_files[rel_path] = file_path
 
         return cls(
             path=skill_path,
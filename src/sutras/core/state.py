@@ -0,0 +1,432 @@
+"""Install-state database for Sutras.
+
+Records which skill versions are installed in a small SQLite database at
+~/.sutras/state.db, so lookups don't need to scan the installed directory:
+
+- installs: skill name and version, install directory, tarball checksum,
+  tree digest, source, size on disk, install time and whether it was
+  installed explicitly (as opposed to as a dependency)
+- dependents: which skills depend on each installed version
+- files: the digest and stat of every installed file, as a baseline for
+  ``sutras verify``
+
+The installer updates it when installs and uninstalls commit; ``reconcile``
+rebuilds it from what is actually on disk, and runs automatically when the
+database is new or empty (e.g. the first run after upgrading).
+"""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS installs (
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    fs_name TEXT NOT NULL,
+    install_dir TEXT NOT NULL,
+    checksum TEXT,
+    tree_digest TEXT,
+    source TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    installed_at TEXT NOT NULL,
+    explicit INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, version)
+);
+CREATE INDEX IF NOT EXISTS installs_fs_name ON installs (fs_name);
+CREATE TABLE IF NOT EXISTS dependents (
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    dependent TEXT NOT NULL,
+    PRIMARY KEY (name, version, dependent)
+);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    path TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    PRIMARY KEY (name, version, path)
+);
+"""
+
+# Columns added after the table was first released, with their definitions.
+MIGRATIONS = {"installs": {"tree_digest": "TEXT"}}
+
+
+@dataclass
+class InstalledVersion:
+    """One installed version of a skill."""
+
+    name: str
+    version: str
+    fs_name: str
+    install_dir: Path
+    checksum: str | None = None
+    tree_digest: str | None = None
+    source: str | None = None
+    size: int = 0
+    installed_at: str = ""
+    explicit: bool = False
+
+
+@dataclass
+class FileRecord:
+    """Digest of an installed file and the stat it was taken at."""
+
+    digest: str
+    size: int
+    mtime_ns: int
+    ino: int
+    ctime_ns: int
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Whether a stat shows the file unchanged since the digest was taken."""
+        return (self.size, self.mtime_ns, self.ino, self.ctime_ns) == (
+            st.st_size,
+            st.st_mtime_ns,
+            st.st_ino,
+            st.st_ctime_ns,
+        )
+
+
+def tree_size(path: Path) -> int:
+    """Total size of the regular files under a directory, in bytes."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            if not os.path.islink(file_path):
+                total += os.stat(file_path).st_size
+    return total
+
+
+def _name_from_fs_name(fs_name: str) -> str:
+    """Best-effort inverse of SkillName.to_filesystem_name() for unknown installs."""
+    if "_" in fs_name:
+        namespace, name = fs_name.split("_", 1)
+        return f"@{namespace}/{name}"
+    return fs_name
+
+
+class InstallState:
+    """SQLite-backed record of installed skill versions."""
+
+    def __init__(self, db_path: Path, installed_dir: Path | None = None):
+        """Open (lazily) the install-state database.
+
+        Args:
+            db_path: Path to the SQLite database
+            installed_dir: Directory holding <skill>/<version> installs. When
+                given, a new or empty database is reconciled against it on
+                first use, so installs made before the database existed are
+                not mistaken for missing ones.
+        """
+        self.db_path = db_path
+        self.installed_dir = installed_dir
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+                )
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                self._migrate(conn)
+                self._conn = conn
+                empty = conn.execute("SELECT 1 FROM installs LIMIT 1").fetchone() is None
+                if empty and self.installed_dir is not None:
+                    self.reconcile(self.installed_dir)
+            return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Add columns that databases created by older versions lack."""
+        for table, columns in MIGRATIONS.items():
+            existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, definition in columns.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several updates atomically.
+
+        Uses BEGIN IMMEDIATE so concurrent sutras processes queue up instead
+        of failing part-way through.
+        """
+        with self._lock:
+            conn = self.conn
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _row_to_version(self, row: sqlite3.Row) -> InstalledVersion:
+        return InstalledVersion(
+            name=row["name"],
+            version=row["version"],
+            fs_name=row["fs_name"],
+            install_dir=Path(row["install_dir"]),
+            checksum=row["checksum"],
+            tree_digest=row["tree_digest"],
+            source=row["source"],
+            size=row["size"],
+            installed_at=row["installed_at"],
+            explicit=bool(row["explicit"]),
+        )
+
+    def record(
+        self,
+        installed: InstalledVersion,
+        dependent: str | None = None,
+        files: dict[str, FileRecord] | None = None,
+    ) -> None:
+        """Record an installed version, replacing any earlier record of it.
+
+        An explicit install stays explicit when the same version is later
+        installed again as a dependency.
+
+        Args:
+            installed: Version that was installed
+            dependent: Skill that required it, if installed as a dependency
+            files: Digests of the installed files, replacing any recorded ones
+        """
+        installed_at = installed.installed_at or datetime.now(UTC).isoformat()
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO installs
+                    (name, version, fs_name, install_dir, checksum, tree_digest, source,
+                     size, installed_at, explicit)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name, version) DO UPDATE SET
+                    fs_name = excluded.fs_name,
+                    install_dir = excluded.install_dir,
+                    checksum = COALESCE(excluded.checksum, installs.checksum),
+                    tree_digest = COALESCE(excluded.tree_digest, installs.tree_digest),
+                    source = COALESCE(excluded.source, installs.source),
+                    size = excluded.size,
+                    installed_at = excluded.installed_at,
+                    explicit = MAX(installs.explicit, excluded.explicit)
+                """,
+                (
+                    installed.name,
+                    installed.version,
+                    installed.fs_name,
+                    str(installed.install_dir),
+                    installed.checksum,
+                    installed.tree_digest,
+                    installed.source,
+                    installed.size,
+                    installed_at,
+                    int(installed.explicit),
+                ),
+            )
+            if dependent:
+                self.add_dependent(installed.name, installed.version, dependent)
+            if files is not None:
+                conn.execute(
+                    "DELETE FROM files WHERE name = ? AND version = ?",
+                    (installed.name, installed.version),
+                )
+                self.update_files(installed.name, installed.version, files)
+
+    def files(self, name: str, version: str) -> dict[str, FileRecord]:
+        """Get the recorded digests of an installed version's files."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM files WHERE name = ? AND version = ?", (name, version)
+            ).fetchall()
+        return {
+            row["path"]: FileRecord(
+                digest=row["digest"],
+                size=row["size"],
+                mtime_ns=row["mtime_ns"],
+                ino=row["ino"],
+                ctime_ns=row["ctime_ns"],
+            )
+            for row in rows
+        }
+
+    def update_files(self, name: str, version: str, files: dict[str, FileRecord]) -> None:
+        """Insert or refresh recorded file digests and stats."""
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO files
+                    (name, version, path, digest, size, mtime_ns, ino, ctime_ns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (name, version, path, r.digest, r.size, r.mtime_ns, r.ino, r.ctime_ns)
+                    for path, r in files.items()
+                ],
+            )
+
+    def add_dependent(self, name: str, version: str, dependent: str) -> None:
+        """Record that ``dependent`` requires this installed version."""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO dependents (name, version, dependent) VALUES (?, ?, ?)",
+                (name, version, dependent),
+            )
+
+    def remove(self, name: str, version: str | None = None) -> None:
+        """Forget one installed version, or every version of a skill."""
+        with self.transaction() as conn:
+            if version is None:
+                for table in ("installs", "dependents", "files"):
+                    conn.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+            else:
+                for table in ("installs", "dependents", "files"):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE name = ? AND version = ?", (name, version)
+                    )
+
+    def get(self, name: str, version: str) -> InstalledVersion | None:
+        """Look up one installed version by primary key."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM installs WHERE name = ? AND version = ?", (name, version)
+            ).fetchone()
+        return self._row_to_version(row) if row else None
+
+    def is_installed(self, name: str, version: str) -> bool:
+        """Check whether a version is recorded as installed."""
+        return self.get(name, version) is not None
+
+    def dependents(self, name: str, version: str) -> list[str]:
+        """List the skills that depend on an installed version."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT dependent FROM dependents WHERE name = ? AND version = ? "
+                "ORDER BY dependent",
+                (name, version),
+            ).fetchall()
+        return [row["dependent"] for row in rows]
+
+    def dependencies(self, dependent: str) -> list[tuple[str, str]]:
+        """List the installed (name, version) pairs that ``dependent`` requires."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT name, version FROM dependents WHERE dependent = ? ORDER BY name, version",
+                (dependent,),
+            ).fetchall()
+        return [(row["name"], row["version"]) for row in rows]
+
+    def all(self) -> list[InstalledVersion]:
+        """List every installed version, ordered by name and version."""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM installs ORDER BY name, version").fetchall()
+        return [self._row_to_version(row) for row in rows]
+
+    def list_installed(self) -> dict[str, list[str]]:
+        """Map filesystem skill names to their installed versions."""
+        installed: dict[str, list[str]] = {}
+        for item in self.all():
+            installed.setdefault(item.fs_name, []).append(item.version)
+        return {name: sorted(versions) for name, versions in installed.items()}
+
+    def _reconcile_plan(
+        self, installed_dir: Path
+    ) -> tuple[list[InstalledVersion], list[InstalledVersion], int]:
+        """Compare the records with the install directories on disk.
+
+        Returns:
+            Tuple of (stale records, records to keep or add, number added)
+        """
+        on_disk: dict[tuple[str, str], Path] = {}
+        if installed_dir.exists():
+            for skill_dir in installed_dir.iterdir():
+                if not skill_dir.is_dir() or skill_dir.name.startswith("."):
+                    continue
+                for version_dir in skill_dir.iterdir():
+                    if version_dir.is_dir() and not version_dir.name.startswith("."):
+                        on_disk[(skill_dir.name, version_dir.name)] = version_dir
+
+        recorded = {(item.fs_name, item.version): item for item in self.all()}
+        stale = [item for key, item in recorded.items() if key not in on_disk]
+
+        now = datetime.now(UTC).isoformat()
+        current = []
+        for (fs_name, version), version_dir in sorted(on_disk.items()):
+            existing = recorded.get((fs_name, version))
+            current.append(
+                InstalledVersion(
+                    name=existing.name if existing else _name_from_fs_name(fs_name),
+                    version=version,
+                    fs_name=fs_name,
+                    install_dir=version_dir,
+                    checksum=existing.checksum if existing else None,
+                    tree_digest=existing.tree_digest if existing else None,
+                    source=existing.source if existing else None,
+                    size=tree_size(version_dir),
+                    installed_at=existing.installed_at if existing else now,
+                    explicit=existing.explicit if existing else False,
+                )
+            )
+
+        added = sum(1 for key in on_disk if key not in recorded)
+        return stale, current, added
+
+    def reconciled(self, installed_dir: Path) -> list[InstalledVersion]:
+        """Get the records ``reconcile`` would leave, without writing anything.
+
+        Args:
+            installed_dir: Directory holding <skill>/<version> installs
+
+        Returns:
+            Installed versions, ordered by name and version
+        """
+        current = self._reconcile_plan(installed_dir)[1]
+        return sorted(current, key=lambda item: (item.name, item.version))
+
+    def reconcile(self, installed_dir: Path) -> tuple[int, int]:
+        """Rebuild the database from the install directories on disk.
+
+        Versions found on disk but not recorded are added (with their size,
+        and a name derived from the directory); records whose directory is
+        gone are dropped. Existing records keep their checksum, source and
+        dependents.
+
+        Args:
+            installed_dir: Directory holding <skill>/<version> installs
+
+        Returns:
+            Tuple of (records_added, records_removed)
+        """
+        with self.transaction():
+            stale, current, added = self._reconcile_plan(installed_dir)
+            for item in stale:
+                self.remove(item.name, item.version)
+            for item in current:
+                self.record(item)
+
+        return added, len(stale)
@@ -0,0 +1,224 @@
+"""Shared store of extracted skill versions for Sutras.
+
+Each distinct tarball is extracted once into ~/.sutras/store/, keyed by its
+SHA256 checksum. Installs are then materialised from the store by linking
+files instead of extracting again:
+
+- reflink: copy-on-write clone (FICLONE) on filesystems that support it
+  (btrfs, XFS, bcachefs); edits to an install never reach the store
+- hardlink: shares the inode; store files are read-only to discourage edits
+- copy: plain file copy, used when neither link type is available
+
+In "auto" mode the first working method is used, falling back per tree.
+
+Layout:
+    <aa>/<sha256>/    extracted contents of the tarball with that digest
+"""
+
+import errno
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+from .archive import ArchiveMetadata, extract_archive, read_metadata
+from .cache import sha256_file
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+_FALLBACK_ORDER = ["reflink", "hardlink", "copy"]
+
+# ioctl request number for FICLONE on Linux (_IOW(0x94, 9, int)).
+FICLONE = 0x40049409
+
+# Errors meaning "this link type is not possible here", as opposed to real I/O failures.
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EMLINK,
+}
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Clone ``src`` to ``dst`` with FICLONE."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dst.unlink(missing_ok=True)
+            raise
+
+
+def _hardlink(src: Path, dst: Path) -> None:
+    os.link(src, dst)
+
+
+def _copy(src: Path, dst: Path) -> None:
+    shutil.copyfile(src, dst)
+
+
+_LINKERS = {"reflink": _reflink, "hardlink": _hardlink, "copy": _copy}
+
+
+class SkillStore:
+    """Content-addressed store of extracted skill trees."""
+
+    def __init__(self, store_dir: Path, link_mode: str = "auto"):
+        if link_mode not in LINK_MODES:
+            raise ValueError(
+                f"Invalid link mode '{link_mode}'. Expected one of: {', '.join(LINK_MODES)}"
+            )
+        self.store_dir = store_dir
+        self.link_mode = link_mode
+        self._working_mode: str | None = None
+        self._metadata: dict[Path, ArchiveMetadata] = {}
+        self._lock = threading.Lock()
+
+    def entry_path(self, digest: str) -> Path:
+        """Get the store directory for a tarball digest."""
+        return self.store_dir / digest[:2] / digest
+
+    def entries(self) -> list[Path]:
+        """List every extracted tree in the store."""
+        if not self.store_dir.exists():
+            return []
+        return sorted(p for p in self.store_dir.glob("*/*") if p.is_dir())
+
+    def ensure(self, tarball_path: Path, digest: str | None = None) -> Path:
+        """Extract a tarball into the store unless it is already there.
+
+        Extraction is a single streaming pass into a staging directory that is
+        renamed into place, so concurrent callers never see a half-extracted
+        tree. The metadata files seen on the way are kept for :meth:`metadata`.
+
+        Args:
+            tarball_path: Path to the skill tarball
+            digest: SHA256 of the tarball if already known
+
+        Returns:
+            Store directory holding the extracted tree
+        """
+        digest = digest or sha256_file(tarball_path)
+        entry = self.entry_path(digest)
+        if entry.exists():
+            return entry
+
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{digest[:12]}-", dir=entry.parent))
+        try:
+            metadata = extract_archive(tarball_path, staging)
+            self._make_read_only(staging)
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process finished the same tree first.
+                if not entry.exists():
+                    raise
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        with self._lock:
+            self._metadata[entry] = metadata
+        return entry
+
+    def metadata(self, entry: Path) -> ArchiveMetadata:
+        """Get the sutras.yaml, SKILL.md and MANIFEST.json of a stored tree.
+
+        Uses what was captured during extraction when available, and reads
+        the small metadata files from the tree otherwise.
+        """
+        with self._lock:
+            cached = self._metadata.get(entry)
+        if cached is None:
+            cached = read_metadata(entry)
+            with self._lock:
+                self._metadata[entry] = cached
+        return cached
+
+    def _make_read_only(self, root: Path) -> None:
+        """Drop write bits from files so hardlinked installs don't edit the store."""
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                if path.is_symlink():
+                    continue
+                mode = path.stat().st_mode
+                path.chmod(mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+    def remove(self, digest: str) -> None:
+        """Remove an extracted tree from the store."""
+        entry = self.entry_path(digest)
+        if entry.exists():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def _candidate_modes(self) -> list[str]:
+        if self.link_mode != "auto":
+            return [self.link_mode]
+        if self._working_mode:
+            return _FALLBACK_ORDER[_FALLBACK_ORDER.index(self._working_mode) :]
+        return _FALLBACK_ORDER
+
+    def _link_file(self, src: Path, dst: Path) -> str:
+        """Materialise one file, falling back through the candidate modes."""
+        modes = self._candidate_modes()
+        for i, mode in enumerate(modes):
+            try:
+                _LINKERS[mode](src, dst)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED or i == len(modes) - 1:
+                    raise
+                continue
+
+            if mode != "hardlink":
+                dst.chmod(src.stat().st_mode | stat.S_IWUSR)
+            if self.link_mode == "auto":
+                with self._lock:
+                    self._working_mode = self._working_mode or mode
+            return mode
+
+        raise AssertionError("unreachable")
+
+    def materialize(self, entry: Path, dest_dir: Path) -> str:
+        """Recreate a stored tree at ``dest_dir`` by linking its files.
+
+        Args:
+            entry: Store directory returned by :meth:`ensure`
+            dest_dir: Directory to create; must not exist yet
+
+        Returns:
+            Link method used for the files ("reflink", "hardlink" or "copy")
+        """
+        used = "copy"
+        dest_dir.mkdir(parents=True)
+        for dirpath, dirnames, filenames in os.walk(entry):
+            rel = Path(dirpath).relative_to(entry)
+            target_dir = dest_dir / rel
+            for dirname in dirnames:
+                src = Path(dirpath) / dirname
+                if src.is_symlink():
+                    (target_dir / dirname).symlink_to(os.readlink(src))
+                else:
+                    (target_dir / dirname).mkdir()
+            for filename in filenames:
+                src = Path(dirpath) / filename
+                dst = target_dir / filename
+                if src.is_symlink():
+                    dst.symlink_to(os.readlink(src))
+                else:
+                    used = self._link_file(src, dst)
+        return used
@@ -9,11 +9,11 @@ from __future__ import annotations
 import json
 import shutil
 import subprocess
-import urllib.request
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from sutras import __version__
+from sutras.core.http import get_client
 from sutras.core.semver import Version
 
 PYPI_URL = "https://pypi.org/pypi/sutras/json"
@@ -50,9 +50,7 @@ class UpdateSummary:
 
 def _fetch_json(url: str, timeout: int = 10) -> dict:
     """Fetch JSON from a URL."""
-    req = urllib.request.Request(url, headers={"Accept": "application/json"})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read().decode())
+    return get_client().get_json(url, timeout=timeout)
 
 
 def _run(cmd: list[str], timeout: int = 120) -> subprocess.CompletedProcess:
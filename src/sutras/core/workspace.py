@@ -0,0 +1,198 @@
+"""Building every skill in a workspace in one run.
+
+Skills are discovered with SkillLoader and packaged in a process pool, so a
+repository with hundreds of skills pays interpreter startup once per worker
+rather than once per skill, and compression runs on every core. Each skill
+goes through SkillBuilder's build cache, so unchanged skills are skipped after
+a few stats. The run produces a BuildReport that can be written as JSON.
+"""
+
+import json
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from sutras.core.builder import SkillBuilder
+from sutras.core.loader import SkillLoader
+from sutras.core.skill import Skill
+
+
+@dataclass
+class SkillBuildResult:
+    """Outcome of building one skill."""
+
+    name: str
+    source: str
+    status: str  # "built", "cached", "invalid" or "failed"
+    version: str | None = None
+    artifact: str | None = None
+    size: int | None = None
+    checksum: str | None = None
+    duration: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("built", "cached")
+
+
+@dataclass
+class BuildReport:
+    """Results of a workspace build."""
+
+    results: list[SkillBuildResult]
+    jobs: int
+    duration: float
+    finished_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @property
+    def failed(self) -> list[SkillBuildResult]:
+        return [r for r in self.results if not r.ok]
+
+    def counts(self) -> dict[str, int]:
+        """Count results by status."""
+        counts = dict.fromkeys(("built", "cached", "invalid", "failed"), 0)
+        for result in self.results:
+            counts[result.status] += 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "finished_at": self.finished_at.isoformat(),
+            "duration": round(self.duration, 3),
+            "jobs": self.jobs,
+            "summary": self.counts(),
+            "skills": [{**asdict(r), "duration": round(r.duration, 3)} for r in self.results],
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the report as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+def build_skill(
+    skill_path: Path,
+    output_dir: Path | None = None,
+    validate: bool = True,
+    use_cache: bool = True,
+    **builder_options: Any,
+) -> SkillBuildResult:
+    """Build one skill, capturing any failure in the result.
+
+    Runs in worker processes, so it takes a path rather than a loaded skill.
+
+    Args:
+        skill_path: Skill directory
+        output_dir: Directory for the package (default: ./dist)
+        validate: Whether to validate before building
+        use_cache: Whether an up-to-date earlier package may be reused
+        **builder_options: Passed on to SkillBuilder
+
+    Returns:
+        Result of the build
+    """
+    start = time.perf_counter()
+    result = SkillBuildResult(name=skill_path.name, source=str(skill_path), status="failed")
+    try:
+        skill = Skill.load(skill_path)
+        result.name = skill.name
+        result.version = skill.abi.version if skill.abi else "0.0.0"
+
+        builder = SkillBuilder(skill, output_dir=output_dir, **builder_options)
+        errors = builder.validate_for_distribution() if validate else []
+        if errors:
+            result.status = "invalid"
+            result.errors = errors
+        else:
+            package_path = builder.build(validate=False, use_cache=use_cache)
+            result.status = "cached" if builder.from_cache else "built"
+            result.artifact = str(package_path)
+            result.size = package_path.stat().st_size
+            result.checksum = builder.checksum
+    except Exception as e:
+        result.status = "failed"
+        result.errors = [str(e)]
+    result.duration = time.perf_counter() - start
+    return result
+
+
+class WorkspaceBuilder:
+    """Builds every skill a SkillLoader can discover."""
+
+    def __init__(
+        self,
+        loader: SkillLoader | None = None,
+        output_dir: Path | None = None,
+        jobs: int | None = None,
+        validate: bool = True,
+        use_cache: bool = True,
+        **builder_options: Any,
+    ):
+        self.loader = loader or SkillLoader()
+        self.output_dir = output_dir or Path.cwd() / "dist"
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.validate = validate
+        self.use_cache = use_cache
+        self.builder_options = builder_options
+
+    def discover(self) -> list[Path]:
+        """Find the directory of every skill in the loader's search paths.
+
+        Skills with the same directory name in several search paths resolve
+        the same way as SkillLoader.load: the first search path wins.
+        """
+        paths = []
+        for name in self.loader.discover():
+            for search_path in self.loader.search_paths:
+                candidate = search_path / name
+                if (candidate / "SKILL.md").exists():
+                    paths.append(candidate)
+                    break
+        return paths
+
+    def build(
+        self,
+        skill_paths: list[Path] | None = None,
+        on_result: Callable[[SkillBuildResult], None] | None = None,
+    ) -> BuildReport:
+        """Build skills in parallel.
+
+        Args:
+            skill_paths: Skills to build (default: every discovered skill)
+            on_result: Called with each result as soon as it is ready
+
+        Returns:
+            Report with one result per skill, sorted by name
+        """
+        skill_paths = self.discover() if skill_paths is None else skill_paths
+        kwargs = {
+            "output_dir": self.output_dir,
+            "validate": self.validate,
+            "use_cache": self.use_cache,
+            **self.builder_options,
+        }
+        start = time.perf_counter()
+        results = []
+
+        jobs = min(self.jobs, len(skill_paths)) or 1
+        if jobs == 1:
+            for path in skill_paths:
+                results.append(build_skill(path, **kwargs))
+                if on_result:
+                    on_result(results[-1])
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(build_skill, path, **kwargs) for path in skill_paths]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if on_result:
+                        on_result(results[-1])
+
+        results.sort(key=lambda r: (r.name, r.source))
+        return BuildReport(results=results, jobs=jobs, duration=time.perf_counter() - start)
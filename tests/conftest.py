@@ -0,0 +1,17 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from sutras.core.config import SutrasConfig
+from sutras.core.installer import SkillInstaller
+
+
+@pytest.fixture
+def installer(tmp_path):
+    """An installer whose config, caches and skills all live under tmp_path."""
+    config = SutrasConfig(config_path=tmp_path / "config.yaml")
+    config.config.skills_dir = str(tmp_path / "skills")
+    config.config.cache_dir = str(tmp_path / "registry-cache")
+    project = tmp_path / "project"
+    project.mkdir()
+    return SkillInstaller(config=config, project_path=project)
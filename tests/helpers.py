@@ -0,0 +1,25 @@
+"""Shared helpers for building test tarballs."""
+
+import io
+import tarfile
+
+
+def make_tarball(path, files, mode="w:gz"):
+    """Write a tarball holding ``files`` (archive name -> bytes) to path."""
+    with tarfile.open(path, mode) as tar:
+        for arcname, data in files.items():
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+def make_skill_tarball(path, name, version, mode="w:gz", files=None):
+    """Write a minimal skill tarball to path, plus any extra ``files`` under the skill."""
+    contents = {
+        f"{name}/SKILL.md": f"---\nname: {name}\ndescription: test\n---\n".encode(),
+        f"{name}/sutras.yaml": f"version: {version}\n".encode(),
+    }
+    for relpath, data in (files or {}).items():
+        contents[f"{name}/{relpath}"] = data
+    return make_tarball(path, contents, mode)
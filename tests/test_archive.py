@@ -0,0 +1,131 @@
+"""Tests for single-pass skill tarball extraction."""
+
+import io
+import json
+import sys
+import tarfile
+
+import pytest
+
+from sutras.core import archive
+from sutras.core.archive import (
+    COMPRESSIONS,
+    ArchiveMetadata,
+    compression_writer,
+    extract_archive,
+    is_archive,
+    read_metadata,
+    strip_archive_extension,
+)
+
+from .helpers import make_tarball
+
+SKILL_FILES = {
+    "my-skill/SKILL.md": b"---\nname: my-skill\ndescription: test\n---\n",
+    "my-skill/sutras.yaml": b"version: 1.2.3\n",
+    "my-skill/MANIFEST.json": json.dumps({"files": {"SKILL.md": {}}}).encode(),
+    "my-skill/examples/sutras.yaml": b"version: 9.9.9\n",
+}
+
+
+class TestExtractArchive:
+    def test_captures_metadata_while_extracting(self, tmp_path):
+        tarball = make_tarball(tmp_path / "skill.tar.gz", SKILL_FILES)
+
+        metadata = extract_archive(tarball, tmp_path / "out")
+
+        assert metadata.identity() == ("my-skill", "1.2.3")
+        assert metadata.root == "my-skill"
+        assert metadata.manifest == {"files": {"SKILL.md": {}}}
+        assert (tmp_path / "out" / "my-skill" / "examples" / "sutras.yaml").exists()
+
+    def test_opens_archive_once_as_a_stream(self, tmp_path, monkeypatch):
+        tarball = make_tarball(tmp_path / "skill.tar.gz", SKILL_FILES)
+        modes = []
+        real_open = tarfile.open
+
+        def counting_open(*args, **kwargs):
+            modes.append(args[1] if len(args) > 1 else kwargs.get("mode"))
+            return real_open(*args, **kwargs)
+
+        monkeypatch.setattr(archive.tarfile, "open", counting_open)
+        extract_archive(tarball, tmp_path / "out")
+
+        assert modes == ["r|*"]
+
+    def test_name_falls_back_to_root_directory(self, tmp_path):
+        tarball = make_tarball(
+            tmp_path / "skill.tar.gz",
+            {"fallback/SKILL.md": b"no frontmatter", "fallback/sutras.yaml": b"version: 1.0.0\n"},
+        )
+
+        assert extract_archive(tarball, tmp_path / "out").identity() == ("fallback", "1.0.0")
+
+    def test_missing_sutras_yaml(self, tmp_path):
+        tarball = make_tarball(tmp_path / "skill.tar.gz", {"x/SKILL.md": b"name: x\n"})
+
+        with pytest.raises(ValueError, match="No sutras.yaml"):
+            extract_archive(tarball, tmp_path / "out").identity()
+
+    def test_root_level_without_name(self, tmp_path):
+        with pytest.raises(ValueError, match="Could not determine skill name"):
+            ArchiveMetadata(sutras_yaml={"version": "1.0.0"}).identity()
+
+
+class TestReadMetadata:
+    def test_matches_extracted_metadata(self, tmp_path):
+        tarball = make_tarball(tmp_path / "skill.tar.gz", SKILL_FILES)
+        extracted = extract_archive(tarball, tmp_path / "out")
+
+        assert read_metadata(tmp_path / "out") == extracted
+
+
+def make_package(path, files, compression, level=None):
+    with (
+        open(path, "wb") as raw,
+        compression_writer(raw, compression, level) as stream,
+        tarfile.open(fileobj=stream, mode="w") as tar,
+    ):
+        for arcname, data in files.items():
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+class TestCompression:
+    @pytest.mark.parametrize("compression", ["gz", "xz", "none"])
+    def test_detected_from_contents(self, tmp_path, compression):
+        # The name deliberately does not match, so detection cannot rely on it.
+        tarball = make_package(tmp_path / "skill.pkg", SKILL_FILES, compression)
+
+        metadata = extract_archive(tarball, tmp_path / "out")
+
+        assert metadata.identity() == ("my-skill", "1.2.3")
+
+    def test_zstd(self, tmp_path):
+        pytest.importorskip("zstandard")
+        tarball = make_package(tmp_path / "skill.tar.zst", SKILL_FILES, "zstd", level=19)
+
+        assert tarball.read_bytes().startswith(archive.ZSTD_MAGIC)
+        assert extract_archive(tarball, tmp_path / "out").identity() == ("my-skill", "1.2.3")
+
+    def test_zstd_without_zstandard(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+        tarball = tmp_path / "skill.tar.zst"
+        tarball.write_bytes(archive.ZSTD_MAGIC + b"\0" * 16)
+
+        with pytest.raises(ImportError, match="sutras\\[zstd\\]"):
+            extract_archive(tarball, tmp_path / "out")
+
+    def test_level_validation(self):
+        assert COMPRESSIONS["xz"].validate_level(None) == 6
+        assert COMPRESSIONS["zstd"].validate_level(22) == 22
+        with pytest.raises(ValueError, match="between 0 and 9"):
+            COMPRESSIONS["gz"].validate_level(10)
+        with pytest.raises(ValueError, match="does not take a level"):
+            COMPRESSIONS["none"].validate_level(1)
+
+    def test_archive_names(self):
+        assert [is_archive(n) for n in ("a.tar.zst", "a.tgz", "a.zip")] == [True, True, False]
+        assert strip_archive_extension("my-skill-1.0.0.tar.xz") == "my-skill-1.0.0"
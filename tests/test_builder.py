@@ -0,0 +1,249 @@
+"""Tests for building skill packages."""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tarfile
+
+import pytest
+
+from sutras import SkillLoader
+from sutras.core.builder import BuildError, SkillBuilder
+
+
+@pytest.fixture
+def skill(tmp_path):
+    skills_dir = tmp_path / "skills"
+    skill_dir = skills_dir / "test-skill"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(
+        "---\nname: test-skill\ndescription: A test skill\n---\n\n# Test Skill\n"
+    )
+    (skill_dir / "sutras.yaml").write_text('version: "1.0.0"\nauthor: Test\nlicense: MIT\n')
+    (skill_dir / "examples.md").write_text("# Examples\n")
+    (skill_dir / "reference.md").write_text("# Reference\n")
+
+    loader = SkillLoader(search_paths=[skills_dir], include_global=False, include_project=False)
+    return loader.load("test-skill")
+
+
+def build(skill, output_dir, **kwargs):
+    return SkillBuilder(skill, output_dir=output_dir, **kwargs).build()
+
+
+def read_manifest(package):
+    with tarfile.open(package) as tar:
+        return json.load(tar.extractfile("test-skill/MANIFEST.json"))
+
+
+class TestReproducibleBuild:
+    def test_builds_are_byte_identical(self, skill, tmp_path):
+        first = build(skill, tmp_path / "a", reproducible=True)
+        os.utime(skill.path / "examples.md", (0, 0))
+        second = build(skill, tmp_path / "b", reproducible=True)
+
+        assert first.read_bytes() == second.read_bytes()
+
+    def test_metadata_is_normalized(self, skill, tmp_path):
+        package = build(skill, tmp_path, source_date_epoch=1700000000)
+
+        with tarfile.open(package) as tar:
+            members = tar.getmembers()
+
+        names = [m.name for m in members]
+        assert names[:-1] == sorted(names[:-1])
+        assert names[-1] == "test-skill/MANIFEST.json"
+        assert {(m.uid, m.gid, m.uname, m.gname) for m in members} == {(0, 0, "", "")}
+        assert {m.mtime for m in members} == {1700000000}
+        assert {m.mode for m in members if m.isfile()} == {0o644}
+        assert read_manifest(package)["build_timestamp"] == "2023-11-14T22:13:20+00:00"
+
+        with gzip.open(package) as gz:
+            gz.read()
+            assert gz.mtime == 1700000000
+
+    def test_source_date_epoch_enables_reproducible_mode(self, skill, tmp_path, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1234")
+
+        builder = SkillBuilder(skill, output_dir=tmp_path)
+
+        assert builder.reproducible
+        assert builder.source_date_epoch() == 1234
+
+    def test_default_epoch(self, skill, tmp_path, monkeypatch):
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+
+        builder = SkillBuilder(skill, output_dir=tmp_path, reproducible=True)
+
+        assert builder.source_date_epoch() == SkillBuilder.DEFAULT_SOURCE_DATE_EPOCH
+
+    def test_invalid_source_date_epoch(self, skill, tmp_path, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+
+        with pytest.raises(BuildError, match="SOURCE_DATE_EPOCH"):
+            build(skill, tmp_path)
+
+    def test_manifest_lists_files_in_order(self, skill, tmp_path):
+        manifest = read_manifest(build(skill, tmp_path, reproducible=True))
+
+        assert list(manifest["files"]) == ["SKILL.md", "examples.md", "reference.md", "sutras.yaml"]
+
+
+class TestStreamingBuild:
+    def test_manifest_matches_archived_content(self, skill, tmp_path):
+        package = build(skill, tmp_path)
+
+        with tarfile.open(package) as tar:
+            manifest = json.load(tar.extractfile("test-skill/MANIFEST.json"))
+            for name, entry in manifest["files"].items():
+                data = tar.extractfile(f"test-skill/{name}").read()
+                assert entry == {"size": len(data), "checksum": hashlib.sha256(data).hexdigest()}
+
+    def test_preserves_executable_bit(self, skill, tmp_path):
+        script = skill.path / "run.sh"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o755)
+        skill.supporting_files["run.sh"] = script
+
+        with tarfile.open(build(skill, tmp_path, reproducible=True)) as tar:
+            assert tar.getmember("test-skill/run.sh").mode == 0o755
+
+    def test_failed_build_leaves_no_package(self, skill, tmp_path, monkeypatch):
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(SkillBuilder, "_add_file", fail)
+
+        with pytest.raises(OSError):
+            build(skill, tmp_path / "dist")
+        assert list((tmp_path / "dist").iterdir()) == []
+
+
+class TestSupportingFiles:
+    def test_nested_files_are_packaged(self, skill, tmp_path):
+        (skill.path / "scripts").mkdir()
+        (skill.path / "scripts" / "run.sh").write_text("#!/bin/sh\n")
+        (skill.path / "templates" / "email").mkdir(parents=True)
+        (skill.path / "templates" / "email" / "welcome.txt").write_text("Hi\n")
+        skill = SkillLoader(search_paths=[skill.path.parent]).load("test-skill")
+
+        package = build(skill, tmp_path / "dist", reproducible=True)
+
+        manifest = read_manifest(package)
+        assert "scripts/run.sh" in manifest["files"]
+        assert "templates/email/welcome.txt" in manifest["files"]
+        with tarfile.open(package) as tar:
+            assert tar.getmember("test-skill/templates").isdir()
+            assert tar.getmember("test-skill/templates/email").isdir()
+
+    def test_output_dir_inside_skill_is_excluded(self, skill):
+        build(skill, skill.path / "dist")
+        skill = SkillLoader(search_paths=[skill.path.parent]).load("test-skill")
+        assert any(name.startswith("dist/") for name in skill.supporting_files)
+
+        package = SkillBuilder(skill, output_dir=skill.path / "dist").build(use_cache=False)
+
+        assert not any(name.startswith("dist/") for name in read_manifest(package)["files"])
+
+
+class TestCompression:
+    @pytest.mark.parametrize(
+        ("compression", "extension"), [("gz", ".tar.gz"), ("xz", ".tar.xz"), ("none", ".tar")]
+    )
+    def test_package_is_named_after_format(self, skill, tmp_path, compression, extension):
+        package = build(skill, tmp_path, compression=compression)
+
+        assert package.name == f"test-skill-1.0.0{extension}"
+        assert read_manifest(package)["name"] == "test-skill"
+
+    def test_xz_reproducible(self, skill, tmp_path):
+        first = build(skill, tmp_path / "a", compression="xz", reproducible=True)
+        second = build(skill, tmp_path / "b", compression="xz", reproducible=True)
+
+        assert first.read_bytes() == second.read_bytes()
+
+    def test_invalid_options(self, skill, tmp_path):
+        with pytest.raises(BuildError, match="Unknown compression"):
+            SkillBuilder(skill, output_dir=tmp_path, compression="bz2")
+        with pytest.raises(BuildError, match="between 1 and 22"):
+            SkillBuilder(skill, output_dir=tmp_path, compression="zstd", compression_level=30)
+
+    def test_zstd_without_zstandard(self, skill, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, "zstandard", None)
+
+        with pytest.raises(BuildError, match="zstandard"):
+            build(skill, tmp_path, compression="zstd")
+        assert list(tmp_path.glob("*.tar.zst")) == []
+
+
+class TestBuildCache:
+    def test_unchanged_skill_is_reused(self, skill, tmp_path, monkeypatch):
+        first = SkillBuilder(skill, output_dir=tmp_path)
+        package = first.build()
+        built_at = package.stat().st_mtime_ns
+
+        second = SkillBuilder(skill, output_dir=tmp_path)
+        monkeypatch.setattr(SkillBuilder, "_add_file", None)  # would fail if it rebuilt
+
+        assert second.build() == package
+        assert second.from_cache and not first.from_cache
+        assert package.stat().st_mtime_ns == built_at
+
+    def test_touched_but_unchanged_file_is_reused(self, skill, tmp_path):
+        SkillBuilder(skill, output_dir=tmp_path).build()
+        os.utime(skill.path / "examples.md", (0, 0))
+
+        builder = SkillBuilder(skill, output_dir=tmp_path)
+        builder.build()
+
+        assert builder.from_cache
+        record = json.loads((tmp_path / ".test-skill-1.0.0.tar.gz.json").read_text())
+        assert record["files"]["examples.md"]["mtime_ns"] == 0
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda skill: (skill.path / "examples.md").write_text("# Changed\n"),
+            lambda skill: skill.supporting_files.pop("reference.md"),
+        ],
+    )
+    def test_changed_inputs_rebuild(self, skill, tmp_path, change):
+        SkillBuilder(skill, output_dir=tmp_path).build()
+        change(skill)
+
+        builder = SkillBuilder(skill, output_dir=tmp_path)
+        package = builder.build()
+
+        assert not builder.from_cache
+        assert list(read_manifest(package)["files"]) == [n for n, _ in builder.collect_files()]
+
+    def test_changed_options_rebuild(self, skill, tmp_path):
+        SkillBuilder(skill, output_dir=tmp_path, reproducible=True).build()
+
+        builder = SkillBuilder(skill, output_dir=tmp_path, source_date_epoch=1234)
+        builder.build()
+
+        assert not builder.from_cache
+
+    def test_modified_or_missing_package_rebuilds(self, skill, tmp_path):
+        package = SkillBuilder(skill, output_dir=tmp_path).build()
+        package.write_bytes(b"corrupt")
+
+        builder = SkillBuilder(skill, output_dir=tmp_path)
+        builder.build()
+        assert not builder.from_cache
+        assert read_manifest(package)["name"] == "test-skill"
+
+        package.unlink()
+        builder.build()
+        assert not builder.from_cache and package.exists()
+
+    def test_use_cache_false_always_rebuilds(self, skill, tmp_path):
+        SkillBuilder(skill, output_dir=tmp_path).build()
+
+        builder = SkillBuilder(skill, output_dir=tmp_path)
+        builder.build(use_cache=False)
+
+        assert not builder.from_cache
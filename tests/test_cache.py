@@ -0,0 +1,86 @@
+"""Tests for the download cache."""
+
+import hashlib
+import os
+
+from sutras.core.cache import DownloadCache, sha256_file
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return path
+
+
+class TestDownloadCache:
+    def test_put_and_get_by_checksum(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        data = b"tarball contents"
+        digest = hashlib.sha256(data).hexdigest()
+
+        blob = cache.put(write(tmp_path / "dl", data))
+        assert blob == cache.blob_path(digest)
+        assert blob.read_bytes() == data
+        assert not (tmp_path / "dl").exists()
+        assert cache.get(checksum=digest) == blob
+
+    def test_get_by_url(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        blob = cache.put(write(tmp_path / "dl", b"abc"), url="https://example.com/a.tar.gz")
+
+        assert cache.get(url="https://example.com/a.tar.gz") == blob
+        assert cache.get(url="https://example.com/other.tar.gz") is None
+
+    def test_checksum_miss_ignores_url(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        cache.put(write(tmp_path / "dl", b"abc"), url="https://example.com/a.tar.gz")
+
+        assert cache.get(checksum="0" * 64, url="https://example.com/a.tar.gz") is None
+
+    def test_duplicate_put_keeps_single_blob(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        cache.put(write(tmp_path / "one", b"same"))
+        cache.put(write(tmp_path / "two", b"same"))
+
+        assert len(cache.entries()) == 1
+        assert not (tmp_path / "two").exists()
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache", max_size=10)
+        old = cache.put(write(tmp_path / "a", b"a" * 6), url="https://example.com/a")
+        new = cache.put(write(tmp_path / "b", b"b" * 6))
+        os.utime(old, (1, 1))
+
+        removed, freed = cache.prune()
+
+        assert (removed, freed) == (1, 6)
+        assert not old.exists()
+        assert new.exists()
+        assert cache.get(url="https://example.com/a") is None
+
+    def test_prune_by_age(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        stale = cache.put(write(tmp_path / "a", b"a"))
+        os.utime(stale, (1, 1))
+
+        removed, _ = cache.prune(max_age=60)
+        assert removed == 1
+
+    def test_verify_removes_corrupted(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        good = cache.put(write(tmp_path / "a", b"good"))
+        bad = cache.put(write(tmp_path / "b", b"bad"))
+        bad.write_bytes(b"tampered")
+
+        corrupted = cache.verify()
+
+        assert corrupted == [bad.name]
+        assert not bad.exists()
+        assert sha256_file(good) == good.name
+
+    def test_clear(self, tmp_path):
+        cache = DownloadCache(tmp_path / "cache")
+        cache.put(write(tmp_path / "a", b"a"), url="https://example.com/a")
+        cache.clear()
+
+        assert cache.entries() == []
+        assert cache.get(url="https://example.com/a") is None
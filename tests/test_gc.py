@@ -0,0 +1,119 @@
+"""Tests for garbage collection of installs and cached tarballs."""
+
+import hashlib
+
+from sutras.core.gc import GarbageCollector
+from sutras.core.lockfile import LockfileManager
+from sutras.core.state import InstalledVersion
+
+from .helpers import make_skill_tarball
+
+
+def lock(installer, tmp_path, name, version="1.0.0", dependencies=()):
+    tarball = make_skill_tarball(tmp_path / f"{name}-{version}.tar.gz", name, version)
+    installer.lockfile_manager.add_skill(
+        f"@ns/{name}",
+        version,
+        checksum=hashlib.sha256(tarball.read_bytes()).hexdigest(),
+        registry="test",
+        tarball_url=tarball.as_uri(),
+        dependencies=list(dependencies),
+    )
+
+
+class TestGarbageCollector:
+    def test_removes_superseded_versions(self, installer, tmp_path):
+        old = installer._install_from_file(make_skill_tarball(tmp_path / "a1.tar.gz", "a", "1.0.0"))
+        new = installer._install_from_file(make_skill_tarball(tmp_path / "a2.tar.gz", "a", "2.0.0"))
+
+        report = GarbageCollector(installer).collect()
+
+        assert [(v.name, v.version) for v in report.versions] == [("a", "1.0.0")]
+        assert report.freed > 0
+        assert not old.exists()
+        assert new.exists()
+        assert installer.list_installed() == {"a": ["2.0.0"]}
+        assert len(installer.store.entries()) == 1
+
+    def test_keeps_locked_skills_and_their_dependencies(self, installer, tmp_path):
+        lock(installer, tmp_path, "app", dependencies=["@ns/lib"])
+        lock(installer, tmp_path, "lib")
+        installer.install_frozen()
+
+        report = GarbageCollector(installer).collect()
+
+        assert report.versions == []
+        assert report.blobs == []
+        assert installer.list_installed() == {"ns_app": ["1.0.0"], "ns_lib": ["1.0.0"]}
+
+    def test_removes_orphaned_dependencies(self, installer, tmp_path):
+        lock(installer, tmp_path, "app", dependencies=["@ns/lib"])
+        lock(installer, tmp_path, "lib")
+        installer.install_frozen()
+        installer.lockfile_manager.clear()
+        installer.uninstall("@ns/app")
+
+        report = GarbageCollector(installer).collect()
+
+        assert [(v.name, v.version) for v in report.versions] == [("@ns/lib", "1.0.0")]
+        assert not (installer.skills_dir / "lib").is_symlink()
+        assert installer.list_installed() == {}
+        assert installer.download_cache.entries() == []
+        assert installer.store.entries() == []
+
+    def test_dry_run_removes_nothing(self, installer, tmp_path):
+        old = installer._install_from_file(make_skill_tarball(tmp_path / "a1.tar.gz", "a", "1.0.0"))
+        installer._install_from_file(make_skill_tarball(tmp_path / "a2.tar.gz", "a", "2.0.0"))
+
+        report = GarbageCollector(installer).collect(dry_run=True)
+
+        assert report.dry_run
+        assert len(report.versions) == 1
+        assert old.exists()
+        assert installer.list_installed() == {"a": ["1.0.0", "2.0.0"]}
+
+    def test_dry_run_does_not_reconcile_state(self, installer, tmp_path):
+        installer._install_from_file(make_skill_tarball(tmp_path / "a1.tar.gz", "a", "1.0.0"))
+        gone = installer.installed_dir / "ns_gone" / "1.0.0"
+        installer.state.record(
+            InstalledVersion(name="@ns/gone", version="1.0.0", fs_name="ns_gone", install_dir=gone)
+        )
+        (installer.installed_dir / "ns_manual" / "1.0.0").mkdir(parents=True)
+        before = installer.state.all()
+
+        report = GarbageCollector(installer).collect(dry_run=True)
+
+        assert [(v.fs_name, v.version) for v in report.versions] == [("ns_manual", "1.0.0")]
+        assert installer.state.all() == before
+
+    def test_max_age_spares_recent_installs(self, installer, tmp_path):
+        old = installer._install_from_file(make_skill_tarball(tmp_path / "a1.tar.gz", "a", "1.0.0"))
+        installer._install_from_file(make_skill_tarball(tmp_path / "a2.tar.gz", "a", "2.0.0"))
+
+        report = GarbageCollector(installer).collect(max_age=3600)
+
+        assert report.versions == []
+        assert old.exists()
+
+    def test_size_budget_evicts_referenced_blobs(self, installer, tmp_path):
+        lock(installer, tmp_path, "a")
+        installer.install_frozen()
+
+        report = GarbageCollector(installer).collect(max_size=0)
+
+        assert report.versions == []
+        assert len(report.blobs) == 1
+        assert installer.download_cache.entries() == []
+        assert installer.list_installed() == {"ns_a": ["1.0.0"]}
+
+    def test_lockfiles_from_other_projects_are_roots(self, installer, tmp_path):
+        old = installer._install_from_file(make_skill_tarball(tmp_path / "a1.tar.gz", "a", "1.0.0"))
+        installer._install_from_file(make_skill_tarball(tmp_path / "a2.tar.gz", "a", "2.0.0"))
+        other = tmp_path / "other"
+        other.mkdir()
+        LockfileManager(other).add_skill("a", "1.0.0")
+
+        report = GarbageCollector(installer, [other]).collect()
+
+        assert report.versions == []
+        assert old.exists()
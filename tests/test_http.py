@@ -0,0 +1,286 @@
+"""Tests for the HTTP client and resumable, retried downloads."""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sutras.core.http import DownloadError, HttpClient, HTTPStatusError, RetryPolicy, download
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+FAST_RETRY = RetryPolicy(attempts=4, backoff=0.0, jitter=0.0)
+
+
+class FaultyServer:
+    """Local HTTP server that can drop connections and honour Range requests."""
+
+    def __init__(self):
+        self.data = PAYLOAD
+        self.etag = '"v1"'
+        self.cut_after: list[int] = []  # per-request byte limits before dropping
+        self.fail_status: list[int] = []  # per-request error statuses
+        self.support_ranges = True
+        self.range_starts: list[int] = []  # per-request overrides of the requested start
+        self.delay = 0.0
+        self.requests: list[dict] = []
+        self.peers: list[tuple[str, int]] = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                server.peers.append(self.client_address)
+                with server.lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    self.respond()
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+            def respond(self):
+                time.sleep(server.delay)
+                if self.path == "/redirect":
+                    self.send_response(302)
+                    self.send_header("Location", "/skill.tar.gz")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.path == "/index.json":
+                    body = json.dumps({"name": "skill"}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                if server.fail_status:
+                    self.send_error(server.fail_status.pop(0))
+                    return
+
+                start = 0
+                range_header = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if (
+                    server.support_ranges
+                    and range_header
+                    and (if_range is None or if_range == server.etag)
+                ):
+                    start = int(range_header.removeprefix("bytes=").rstrip("-"))
+                    if server.range_starts:
+                        start = server.range_starts.pop(0)
+
+                body = server.data[start:]
+                self.send_response(206 if start else 200)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", server.etag)
+                if start:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{len(server.data) - 1}/{len(server.data)}"
+                    )
+                self.end_headers()
+
+                if server.cut_after:
+                    body = body[: server.cut_after.pop(0)]
+                    self.close_connection = True
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.url = f"{self.base}/skill.tar.gz"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    with FaultyServer() as s:
+        yield s
+
+
+@pytest.fixture
+def client():
+    c = HttpClient(max_connections_per_host=4, timeout=5.0)
+    yield c
+    c.close()
+
+
+class TestHttpClient:
+    def test_reuses_keep_alive_connection(self, server, client, tmp_path):
+        for n in range(3):
+            download(server.url, tmp_path / f"out{n}", retry=FAST_RETRY, client=client)
+
+        assert len(server.requests) == 3
+        assert len(set(server.peers)) == 1
+
+    def test_follows_redirects(self, server, client, tmp_path):
+        dest = tmp_path / "out"
+        download(f"{server.base}/redirect", dest, retry=FAST_RETRY, client=client)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert len(set(server.peers)) == 1
+
+    def test_get_json(self, server, client):
+        assert client.get_json(f"{server.base}/index.json") == {"name": "skill"}
+
+    def test_error_status_raises(self, server, client):
+        server.fail_status = [404]
+
+        with pytest.raises(HTTPStatusError) as exc_info:
+            client.get_json(server.url)
+        assert exc_info.value.status == 404
+
+    def test_limits_concurrency_per_host(self, server, tmp_path):
+        server.delay = 0.05
+        client = HttpClient(max_connections_per_host=2)
+        threads = [
+            threading.Thread(
+                target=download,
+                args=(server.url, tmp_path / f"out{n}"),
+                kwargs={"retry": FAST_RETRY, "client": client},
+            )
+            for n in range(6)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        client.close()
+
+        assert len(server.requests) == 6
+        assert server.max_active <= 2
+        assert len(set(server.peers)) <= 2
+
+    def test_file_urls(self, client, tmp_path):
+        source = tmp_path / "skill.tar.gz"
+        source.write_bytes(b"tarball")
+
+        with client.open(source.as_uri()) as response:
+            assert response.read() == b"tarball"
+
+
+class TestDownload:
+    def test_plain_download(self, server, client, tmp_path):
+        dest = tmp_path / "out"
+        events = []
+
+        digest = download(
+            server.url, dest, retry=FAST_RETRY, client=client, on_progress=events.append
+        )
+
+        assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+        assert dest.read_bytes() == PAYLOAD
+        assert events[-1].downloaded == events[-1].total == len(PAYLOAD)
+        assert not (tmp_path / "out.meta").exists()
+
+    def test_resumes_after_dropped_connection(self, server, client, tmp_path):
+        server.cut_after = [300_000]
+        dest = tmp_path / "out"
+
+        digest = download(server.url, dest, retry=FAST_RETRY, client=client)
+
+        assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+        assert dest.read_bytes() == PAYLOAD
+        assert len(server.requests) == 2
+        assert server.requests[1]["Range"] == "bytes=300000-"
+        assert server.requests[1]["If-Range"] == '"v1"'
+
+    def test_resumes_partial_file_from_earlier_run(self, server, client, tmp_path):
+        server.cut_after = [100_000]
+        dest = tmp_path / "out"
+        with pytest.raises(DownloadError):
+            download(server.url, dest, retry=RetryPolicy(attempts=1), client=client)
+        assert dest.stat().st_size == 100_000
+
+        digest = download(server.url, dest, retry=FAST_RETRY, client=client)
+
+        assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+        assert server.requests[-1]["Range"] == "bytes=100000-"
+
+    def test_restarts_when_file_changed(self, server, client, tmp_path):
+        server.cut_after = [100_000]
+        dest = tmp_path / "out"
+        with pytest.raises(DownloadError):
+            download(server.url, dest, retry=RetryPolicy(attempts=1), client=client)
+
+        server.data = PAYLOAD[::-1]
+        server.etag = '"v2"'
+        digest = download(server.url, dest, retry=FAST_RETRY, client=client)
+
+        assert digest == hashlib.sha256(PAYLOAD[::-1]).hexdigest()
+        assert dest.read_bytes() == PAYLOAD[::-1]
+
+    def test_restarts_when_ranges_unsupported(self, server, client, tmp_path):
+        server.support_ranges = False
+        server.cut_after = [100_000]
+        dest = tmp_path / "out"
+
+        digest = download(server.url, dest, retry=FAST_RETRY, client=client)
+
+        assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+        assert dest.read_bytes() == PAYLOAD
+
+    def test_restarts_when_range_starts_elsewhere(self, server, client, tmp_path):
+        server.cut_after = [100_000]
+        server.range_starts = [50_000]
+        dest = tmp_path / "out"
+
+        digest = download(server.url, dest, retry=FAST_RETRY, client=client)
+
+        assert digest == hashlib.sha256(PAYLOAD).hexdigest()
+        assert dest.read_bytes() == PAYLOAD
+        assert server.requests[1]["Range"] == "bytes=100000-"
+        assert "Range" not in server.requests[2]
+
+    def test_retries_server_errors(self, server, client, tmp_path):
+        server.fail_status = [503, 502]
+        dest = tmp_path / "out"
+
+        download(server.url, dest, retry=FAST_RETRY, client=client)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert len(server.requests) == 3
+
+    def test_does_not_retry_client_errors(self, server, client, tmp_path):
+        server.fail_status = [404]
+
+        with pytest.raises(DownloadError, match="HTTP 404"):
+            download(server.url, tmp_path / "out", retry=FAST_RETRY, client=client)
+        assert len(server.requests) == 1
+
+    def test_gives_up_after_attempts(self, server, client, tmp_path):
+        server.fail_status = [503] * 10
+
+        with pytest.raises(DownloadError, match="after 4 attempts"):
+            download(server.url, tmp_path / "out", retry=FAST_RETRY, client=client)
+        assert len(server.requests) == 4
+
+
+class TestRetryPolicy:
+    def test_backoff_is_exponential_and_capped(self):
+        policy = RetryPolicy(backoff=1.0, max_backoff=5.0, jitter=0.0)
+        assert [policy.delay(n) for n in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_jitter_stays_in_bounds(self):
+        policy = RetryPolicy(backoff=1.0, jitter=0.5)
+        assert all(0.5 <= policy.delay(0) <= 1.5 for _ in range(50))
@@ -0,0 +1,105 @@
+"""Tests for .sutrasignore rules."""
+
+import os
+
+import pytest
+
+from sutras.core import ignore
+from sutras.core.ignore import IgnoreMatcher, walk_files
+
+
+def make_tree(root, paths):
+    for path in paths:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(path)
+
+
+class TestIgnoreMatcher:
+    @pytest.mark.parametrize(
+        ("pattern", "path", "is_dir", "ignored"),
+        [
+            ("*.log", "debug.log", False, True),
+            ("*.log", "logs/deep/debug.log", False, True),
+            ("*.log", "debug.log.txt", False, False),
+            ("build/", "build", True, True),
+            ("build/", "build", False, False),
+            ("build/", "src/build", True, True),
+            ("/build", "src/build", True, False),
+            ("docs/*.md", "docs/a.md", False, True),
+            ("docs/*.md", "docs/sub/a.md", False, False),
+            ("docs/*.md", "x/docs/a.md", False, False),
+            ("**/fixtures", "tests/unit/fixtures", True, True),
+            ("tests/**/tmp", "tests/tmp", True, True),
+            ("tests/**/tmp", "tests/a/b/tmp", True, True),
+            ("cache/**", "cache/x/y", False, True),
+            ("cache/**", "cache", True, False),
+            ("file?.txt", "file1.txt", False, True),
+            ("file?.txt", "file10.txt", False, False),
+            ("[!a]*.txt", "b.txt", False, True),
+            ("[!a]*.txt", "a.txt", False, False),
+            ("\\#notes", "#notes", False, True),
+            ("# comment", "# comment", False, False),
+        ],
+    )
+    def test_patterns(self, pattern, path, is_dir, ignored):
+        assert IgnoreMatcher([pattern]).match(path, is_dir) is ignored
+
+    def test_last_match_wins(self):
+        matcher = IgnoreMatcher(["*.md", "!README.md", "docs/README.md"])
+
+        assert matcher.match("notes.md")
+        assert not matcher.match("README.md")
+        assert matcher.match("docs/README.md")
+
+
+class TestWalkFiles:
+    def test_collects_tree_with_ignore_file(self, tmp_path):
+        make_tree(
+            tmp_path,
+            [
+                "SKILL.md",
+                "scripts/run.sh",
+                "templates/base/page.html",
+                "tests/fixtures/input.json",
+                "tests/fixtures/big.bin",
+                "node_modules/pkg/index.js",
+                "__pycache__/x.pyc",
+                "scratch.tmp",
+            ],
+        )
+        (tmp_path / ".sutrasignore").write_text("# local files\n*.tmp\ntests/fixtures/*.bin\n")
+
+        matcher = IgnoreMatcher.for_directory(tmp_path)
+        files = sorted(rel for rel, _ in walk_files(tmp_path, matcher))
+
+        assert files == [
+            "SKILL.md",
+            "scripts/run.sh",
+            "templates/base/page.html",
+            "tests/fixtures/input.json",
+        ]
+
+    def test_ignored_directories_are_not_walked(self, tmp_path, monkeypatch):
+        make_tree(tmp_path, ["keep.md", "node_modules/a/b/c.js", "vendor/x/y.js"])
+        (tmp_path / ".sutrasignore").write_text("vendor/\n")
+        visited = []
+        real_walk = os.walk
+
+        def recording_walk(top):
+            for entry in real_walk(top):
+                visited.append(os.path.relpath(entry[0], tmp_path))
+                yield entry
+
+        monkeypatch.setattr(ignore.os, "walk", recording_walk)
+        list(walk_files(tmp_path, IgnoreMatcher.for_directory(tmp_path)))
+
+        assert visited == ["."]
+
+    def test_negation_reincludes_default(self, tmp_path):
+        make_tree(tmp_path, ["node_modules/pkg/index.js"])
+        (tmp_path / ".sutrasignore").write_text("!node_modules/\n")
+
+        files = [rel for rel, _ in walk_files(tmp_path, IgnoreMatcher.for_directory(tmp_path))]
+
+        assert files == ["node_modules/pkg/index.js"]
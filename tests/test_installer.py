@@ -0,0 +1,500 @@
+"""Tests for skill installation."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from sutras.core.installer import InstallTransaction, SkillInstaller
+from sutras.core.naming import SkillName
+from sutras.core.registry import SkillIndexEntry
+from sutras.core.resolver import ResolvedSkill
+from sutras.core.state import InstalledVersion
+
+from .helpers import make_skill_tarball, make_tarball
+
+
+def resolved(name, version="1.0.0"):
+    return ResolvedSkill(
+        name=name, version=version, registry="test", tarball_url=None, checksum=None
+    )
+
+
+class TestInstallLevel:
+    def _stub_registry(self, installer, tmp_path, fail=()):
+        def locate(skill_name, version, registry_name):
+            url = tmp_path / f"{skill_name.name}-{version}.tar.gz"
+            if str(skill_name) not in fail:
+                make_skill_tarball(url, skill_name.name, version)
+            return version, str(url), None, "test"
+
+        def download(url, checksum):
+            copy = tmp_path / "downloads" / (url.rsplit("/", 1)[-1])
+            copy.parent.mkdir(exist_ok=True)
+            with open(url, "rb") as f:
+                copy.write_bytes(f.read())
+            return copy
+
+        installer._locate_registry_tarball = locate
+        installer._download_and_verify = download
+
+    def test_installs_all_and_links(self, installer, tmp_path):
+        self._stub_registry(installer, tmp_path)
+        timings = installer._install_level([resolved("@ns/a"), resolved("@ns/b", "2.0.0")])
+
+        assert sorted(t.name for t in timings) == ["@ns/a", "@ns/b"]
+        assert all(t.download_seconds >= 0 and t.extract_seconds >= 0 for t in timings)
+        assert (installer.skills_dir / "a").resolve() == (
+            installer.installed_dir / SkillName.parse("@ns/a").to_filesystem_name() / "1.0.0"
+        ).resolve()
+        assert (installer.skills_dir / "b" / "b" / "SKILL.md").exists()
+
+    def test_failure_rolls_back_level(self, installer, tmp_path):
+        self._stub_registry(installer, tmp_path, fail={"@ns/b"})
+
+        with pytest.raises(ValueError, match="@ns/b"):
+            installer._install_level([resolved("@ns/a"), resolved("@ns/b")])
+
+        assert not (installer.skills_dir / "a").exists()
+        assert not (installer.installed_dir / "ns_a" / "1.0.0").exists()
+
+
+class TestDownload:
+    def test_download_is_cached(self, installer, tmp_path):
+        source = tmp_path / "skill.tar.gz"
+        source.write_bytes(b"tarball")
+        digest = hashlib.sha256(b"tarball").hexdigest()
+
+        first = installer._download_and_verify(source.as_uri(), digest)
+        source.unlink()
+        second = installer._download_and_verify(source.as_uri(), digest)
+
+        assert first == second == installer.download_cache.blob_path(digest)
+
+    def test_corrupted_cache_blob_is_downloaded_again(self, installer, tmp_path):
+        source = tmp_path / "skill.tar.gz"
+        source.write_bytes(b"tarball")
+        digest = hashlib.sha256(b"tarball").hexdigest()
+        cached = installer._download_and_verify(source.as_uri(), digest)
+        cached.write_bytes(b"tampered")
+
+        path = installer._download_and_verify(source.as_uri(), digest)
+
+        assert path.read_bytes() == b"tarball"
+
+    def test_corrupted_cache_blob_fails_offline(self, installer, tmp_path):
+        source = tmp_path / "skill.tar.gz"
+        source.write_bytes(b"tarball")
+        digest = hashlib.sha256(b"tarball").hexdigest()
+        installer._download_and_verify(source.as_uri(), digest).write_bytes(b"tampered")
+        installer.offline = True
+
+        with pytest.raises(ValueError, match="not in the download cache"):
+            installer._download_and_verify(source.as_uri(), digest)
+        assert installer.download_cache.entries() == []
+
+    def test_checksum_mismatch(self, installer, tmp_path):
+        source = tmp_path / "skill.tar.gz"
+        source.write_bytes(b"tarball")
+
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            installer._download_and_verify(source.as_uri(), "0" * 64)
+        assert installer.download_cache.entries() == []
+
+
+class TestSharedStore:
+    def test_installs_link_from_store(self, installer, tmp_path):
+        tarball = make_skill_tarball(tmp_path / "a.tar.gz", "a", "1.0.0")
+
+        first = installer._install_from_file(tarball)
+        installer.uninstall("a")
+        second = installer._install_from_file(tarball)
+
+        assert first == second
+        assert len(installer.store.entries()) == 1
+        assert (second / "a" / "SKILL.md").exists()
+
+    @pytest.mark.parametrize(("suffix", "mode"), [(".tar.xz", "w:xz"), (".tar", "w")])
+    def test_installs_other_compressions(self, installer, tmp_path, suffix, mode):
+        tarball = make_skill_tarball(tmp_path / f"a{suffix}", "a", "1.0.0", mode)
+
+        install_dir = installer._install_from_file(tarball)
+
+        assert (install_dir / "a" / "SKILL.md").exists()
+
+    def test_rejects_non_packages(self, installer, tmp_path):
+        (tmp_path / "a.zip").write_bytes(b"PK")
+
+        with pytest.raises(ValueError, match="must be a skill package"):
+            installer._install_from_file(tmp_path / "a.zip")
+
+
+class TestInstallState:
+    def test_install_and_uninstall_update_state(self, installer, tmp_path):
+        tarball = make_skill_tarball(tmp_path / "a.tar.gz", "a", "1.0.0")
+
+        install_dir = installer._install_from_file(tarball)
+
+        installed = installer.state.get("a", "1.0.0")
+        assert installed.install_dir == install_dir
+        assert installed.checksum == hashlib.sha256(tarball.read_bytes()).hexdigest()
+        assert installed.source == f"file:{tarball.resolve()}"
+        assert installed.size > 0
+        assert installed.explicit
+        assert installer.list_installed() == {"a": ["1.0.0"]}
+
+        installer.uninstall("a")
+        assert installer.list_installed() == {}
+
+    def test_rollback_records_nothing(self, installer, tmp_path):
+        staging = tmp_path / "staging"
+        staging.mkdir()
+        install_dir = installer.installed_dir / "a" / "1.0.0"
+        install_dir.parent.mkdir(parents=True)
+
+        with pytest.raises(RuntimeError):
+            with InstallTransaction() as txn:
+                txn.place(staging, install_dir)
+                name = SkillName.parse("a")
+                installer._record_on_commit(txn, name, install_dir, None, None, True)
+                raise RuntimeError("boom")
+
+        assert installer.list_installed() == {}
+
+    def test_frozen_install_records_dependents(self, installer, tmp_path):
+        for name, deps in (("app", ["@ns/lib"]), ("lib", [])):
+            tarball = make_skill_tarball(tmp_path / f"{name}.tar.gz", name, "1.0.0")
+            installer.lockfile_manager.add_skill(
+                f"@ns/{name}",
+                "1.0.0",
+                registry="test",
+                tarball_url=tarball.as_uri(),
+                dependencies=deps,
+            )
+
+        installer.install_frozen()
+
+        assert installer.state.get("@ns/app", "1.0.0").explicit
+        assert not installer.state.get("@ns/lib", "1.0.0").explicit
+        assert installer.state.dependents("@ns/lib", "1.0.0") == ["@ns/app"]
+
+    def test_existing_installs_are_picked_up_by_a_new_database(self, installer, tmp_path):
+        (installer.installed_dir / "ns_a" / "1.0.0").mkdir(parents=True)
+
+        assert installer.list_installed() == {"ns_a": ["1.0.0"]}
+        assert installer._is_installed("@ns/a", "1.0.0")
+
+    def test_reconcile_picks_up_manual_installs(self, installer, tmp_path):
+        installer._install_from_file(make_skill_tarball(tmp_path / "b.tar.gz", "b", "1.0.0"))
+        (installer.installed_dir / "ns_a" / "1.0.0").mkdir(parents=True)
+
+        assert installer.list_installed() == {"b": ["1.0.0"]}
+        assert installer.reconcile() == (1, 0)
+        assert installer.list_installed() == {"b": ["1.0.0"], "ns_a": ["1.0.0"]}
+
+
+class TestDependencyChecksums:
+    def _registry(self, installer, tmp_path):
+        """Serve @ns/lib 1.0.0 and 2.0.0 from a stub registry; the index lists 2.0.0."""
+        tarballs = {
+            v: make_skill_tarball(tmp_path / f"lib-{v}.tar.gz", "lib", v)
+            for v in ("1.0.0", "2.0.0")
+        }
+        entry = SkillIndexEntry(
+            name="@ns/lib",
+            version="2.0.0",
+            tarball_url=tarballs["2.0.0"].as_uri(),
+            versions={v: path.as_uri() for v, path in tarballs.items()},
+            checksum=hashlib.sha256(tarballs["2.0.0"].read_bytes()).hexdigest(),
+        )
+        registry = SimpleNamespace(
+            index=SimpleNamespace(skills={"@ns/lib": entry}), cache_path=tmp_path / "index"
+        )
+        installer.registry_manager = SimpleNamespace(
+            search_skill=lambda name: [("test", entry)] if name == "@ns/lib" else [],
+            find_skill=lambda name: ("test", entry),
+            get_registry=lambda name: registry,
+            get_index_revisions=lambda: {"test": "rev1"},
+            config=SimpleNamespace(list_registries=lambda: {}),
+        )
+        return tarballs
+
+    def test_dependency_below_latest_locks_installed_checksum(self, installer, tmp_path):
+        tarballs = self._registry(installer, tmp_path)
+        app = tmp_path / "app"
+        app.mkdir()
+        (app / "sutras.yaml").write_text(
+            "capabilities:\n  dependencies:\n    - name: '@ns/lib'\n      version: ^1.0.0\n"
+        )
+
+        installer._install_dependencies(app, "@ns/app")
+
+        locked = installer.lockfile_manager.get_skill("@ns/lib")
+        assert locked.version == "1.0.0"
+        assert locked.checksum == hashlib.sha256(tarballs["1.0.0"].read_bytes()).hexdigest()
+
+        installer.uninstall("@ns/lib")
+        timings = installer.install_frozen()
+        assert [(t.name, t.version) for t in timings] == [("@ns/lib", "1.0.0")]
+
+    def test_frozen_reinstall_of_root_uses_locked_url(self, installer, tmp_path):
+        self._registry(installer, tmp_path)
+        installer.install("@ns/lib", install_dependencies=False)
+        assert installer.lockfile_manager.get_skill("@ns/lib").tarball_url
+
+        installer.uninstall("@ns/lib")
+        installer.download_cache.clear()
+        installer.registry_manager = None
+        timings = installer.install_frozen()
+
+        assert [(t.name, t.version) for t in timings] == [("@ns/lib", "2.0.0")]
+        assert (installer.skills_dir / "lib" / "lib" / "SKILL.md").exists()
+
+
+class TestInstallTransaction:
+    def _tree(self, path, content):
+        path.mkdir(parents=True)
+        (path / "SKILL.md").write_text(content)
+        return path
+
+    def test_commit_replaces_install_and_symlink(self, tmp_path):
+        install_dir = self._tree(tmp_path / "installed" / "1.0.0", "old")
+        link = tmp_path / "skills" / "a"
+        link.parent.mkdir()
+        link.symlink_to(install_dir)
+        staging = self._tree(tmp_path / "installed" / ".staging", "new")
+
+        with InstallTransaction() as txn:
+            txn.place(staging, install_dir)
+            txn.link(link, install_dir)
+
+        assert (install_dir / "SKILL.md").read_text() == "new"
+        assert os.readlink(link) == str(install_dir)
+        assert sorted(p.name for p in install_dir.parent.iterdir()) == ["1.0.0"]
+
+    def test_rollback_restores_previous_state(self, tmp_path):
+        old_dir = self._tree(tmp_path / "installed" / "1.0.0", "old")
+        new_dir = tmp_path / "installed" / "2.0.0"
+        link = tmp_path / "skills" / "a"
+        link.parent.mkdir()
+        link.symlink_to(old_dir)
+        replaced = self._tree(tmp_path / "installed" / ".staging-1", "replaced")
+        staged = self._tree(tmp_path / "installed" / ".staging-2", "new")
+
+        with pytest.raises(RuntimeError):
+            with InstallTransaction() as txn:
+                txn.place(replaced, old_dir)
+                txn.place(staged, new_dir)
+                txn.link(link, new_dir)
+                raise RuntimeError("later step failed")
+
+        assert (old_dir / "SKILL.md").read_text() == "old"
+        assert not new_dir.exists()
+        assert os.readlink(link) == str(old_dir)
+        assert sorted(p.name for p in old_dir.parent.iterdir()) == ["1.0.0"]
+
+    def test_rollback_removes_new_symlink(self, tmp_path):
+        target = self._tree(tmp_path / "installed", "x")
+        link = tmp_path / "a"
+
+        txn = InstallTransaction()
+        txn.link(link, target)
+        txn.rollback()
+
+        assert not link.is_symlink()
+
+
+class TestStagedInstall:
+    def _tarball_with_manifest(self, path, name, version, checksum):
+        files = {
+            f"{name}/SKILL.md": f"---\nname: {name}\n---\n".encode(),
+            f"{name}/sutras.yaml": f"version: {version}\n".encode(),
+        }
+        files[f"{name}/MANIFEST.json"] = json.dumps(
+            {"files": {"SKILL.md": {"size": len(files[f"{name}/SKILL.md"]), "checksum": checksum}}}
+        ).encode()
+        return make_tarball(path, files)
+
+    def test_manifest_mismatch_keeps_existing_install(self, installer, tmp_path):
+        good = make_skill_tarball(tmp_path / "good.tar.gz", "a", "1.0.0")
+        install_dir = installer._install_from_file(good)
+
+        bad = self._tarball_with_manifest(tmp_path / "bad.tar.gz", "a", "1.0.0", "0" * 64)
+        with pytest.raises(ValueError, match="checksum mismatch"):
+            installer._install_from_file(bad)
+
+        assert (install_dir / "a" / "SKILL.md").exists()
+        assert (installer.skills_dir / "a").resolve() == install_dir.resolve()
+        assert [p.name for p in install_dir.parent.iterdir()] == ["1.0.0"]
+
+    def test_manifest_match_installs(self, installer, tmp_path):
+        skill_md = b"---\nname: a\n---\n"
+        tarball = self._tarball_with_manifest(
+            tmp_path / "a.tar.gz", "a", "1.0.0", hashlib.sha256(skill_md).hexdigest()
+        )
+
+        install_dir = installer._install_from_file(tarball)
+
+        assert (install_dir / "a" / "SKILL.md").read_bytes() == skill_md
+
+
+class TestCrossProcessLocking:
+    def test_reuses_version_installed_while_waiting(self, installer, tmp_path):
+        installer._locate_registry_tarball = lambda *args: ("1.0.0", "unused", None, "test")
+        downloads = []
+        installer._download_and_extract = lambda *args: downloads.append(args)
+        install_dir = installer.installed_dir / "ns_a" / "1.0.0"
+
+        lock = installer._version_lock("@ns/a", "1.0.0")
+        holder_ready = threading.Event()
+        release = threading.Event()
+
+        def other_process():
+            with lock:
+                holder_ready.set()
+                release.wait()
+                (install_dir / "a").mkdir(parents=True)
+                installer.state.record(
+                    InstalledVersion(
+                        name="@ns/a", version="1.0.0", fs_name="ns_a", install_dir=install_dir
+                    )
+                )
+
+        holder = threading.Thread(target=other_process)
+        holder.start()
+        holder_ready.wait()
+
+        result = []
+        waiter = threading.Thread(
+            target=lambda: result.append(
+                installer._install_from_registry("@ns/a", install_dependencies=False)
+            )
+        )
+        waiter.start()
+        time.sleep(0.1)
+        release.set()
+        holder.join()
+        waiter.join()
+
+        assert result[0][0] == install_dir
+        assert downloads == []
+        assert (installer.skills_dir / "a").resolve() == install_dir.resolve()
+
+    def test_uninstall_waits_for_version_lock(self, installer, tmp_path):
+        install_dir = installer._install_from_file(
+            make_skill_tarball(tmp_path / "a.tar.gz", "a", "1.0.0")
+        )
+        lock = installer._version_lock("a", "1.0.0")
+        lock.acquire()
+
+        uninstaller = threading.Thread(target=installer.uninstall, args=("a",))
+        uninstaller.start()
+        time.sleep(0.1)
+        assert install_dir.exists()
+        assert installer.state.get("a", "1.0.0") is not None
+
+        lock.release()
+        uninstaller.join()
+        assert not install_dir.exists()
+        assert installer.list_installed() == {}
+
+
+class TestFrozenInstall:
+    def _offline(self, installer):
+        project = installer.lockfile_manager.project_path
+        return SkillInstaller(config=installer.config, project_path=project, offline=True)
+
+    def _lock(self, installer, tmp_path, names):
+        for name in names:
+            tarball = make_skill_tarball(tmp_path / f"{name}.tar.gz", name, "1.0.0")
+            installer.lockfile_manager.add_skill(
+                f"@ns/{name}",
+                "1.0.0",
+                checksum=hashlib.sha256(tarball.read_bytes()).hexdigest(),
+                registry="test",
+                tarball_url=tarball.as_uri(),
+            )
+
+    def test_installs_everything_in_lockfile(self, installer, tmp_path):
+        self._lock(installer, tmp_path, ["a", "b"])
+
+        timings = installer.install_frozen()
+
+        assert sorted(t.name for t in timings) == ["@ns/a", "@ns/b"]
+        for name in ("a", "b"):
+            assert (installer.skills_dir / name / name / "SKILL.md").exists()
+
+    def test_offline_uses_download_cache(self, installer, tmp_path):
+        self._lock(installer, tmp_path, ["a"])
+        installer.install_frozen()
+        installer.uninstall("@ns/a")
+        (tmp_path / "a.tar.gz").unlink()
+
+        offline = self._offline(installer)
+        timings = offline.install_frozen()
+
+        assert [t.name for t in timings] == ["@ns/a"]
+        assert (offline.skills_dir / "a" / "a" / "SKILL.md").exists()
+
+    def test_offline_fails_when_not_cached(self, installer, tmp_path):
+        self._lock(installer, tmp_path, ["a"])
+
+        offline = self._offline(installer)
+        with pytest.raises(ValueError, match="not in the download cache"):
+            offline.install_frozen()
+        assert not (offline.skills_dir / "a").exists()
+
+    def test_offline_rejects_corrupted_cache_blob(self, installer, tmp_path):
+        self._lock(installer, tmp_path, ["a"])
+        installer.install_frozen()
+        installer.uninstall("@ns/a")
+        checksum = installer.lockfile_manager.get_skill("@ns/a").checksum
+        installer.download_cache.blob_path(checksum).write_bytes(b"tampered")
+
+        offline = self._offline(installer)
+        with pytest.raises(ValueError, match="not in the download cache"):
+            offline.install_frozen()
+        assert not (offline.skills_dir / "a").exists()
+
+    def test_checksum_mismatch_installs_nothing(self, installer, tmp_path):
+        self._lock(installer, tmp_path, ["a", "b"])
+        make_skill_tarball(tmp_path / "b.tar.gz", "b", "1.0.1")
+
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            installer.install_frozen()
+        assert not (installer.skills_dir / "a").exists()
+        assert not (installer.skills_dir / "b").exists()
+
+    def test_skips_versions_installed_while_waiting_for_locks(self, installer, tmp_path):
+        self._lock(installer, tmp_path, ["a", "b"])
+        other = SkillInstaller(config=installer.config, project_path=tmp_path / "other")
+        other_dir = other.installed_dir / "ns_a" / "1.0.0"
+        real_lock = installer._version_lock
+
+        def lock_after_other_install(skill_name, version):
+            # Simulate another process finishing @ns/a before our locks are held.
+            if str(skill_name) == "@ns/a" and not other_dir.exists():
+                (other_dir / "a").mkdir(parents=True)
+                (other_dir / "a" / "SKILL.md").write_text("installed by other\n")
+                other.state.record(
+                    InstalledVersion(
+                        name="@ns/a", version="1.0.0", fs_name="ns_a", install_dir=other_dir
+                    )
+                )
+            return real_lock(skill_name, version)
+
+        installer._version_lock = lock_after_other_install
+
+        timings = installer.install_frozen()
+
+        assert [t.name for t in timings] == ["@ns/b"]
+        assert (installer.skills_dir / "a" / "a" / "SKILL.md").read_text() == "installed by other\n"
+        assert (installer.skills_dir / "b" / "b" / "SKILL.md").exists()
+
+    def test_requires_lockfile(self, installer):
+        with pytest.raises(ValueError, match="No .sutras.lock"):
+            installer.install_frozen()
@@ -0,0 +1,113 @@
+"""Tests for verifying installed skills against recorded digests."""
+
+import os
+
+import pytest
+
+from sutras.core.integrity import Verifier, scan_tree, tree_digest
+
+from .helpers import make_skill_tarball
+
+GUIDE = {"docs/guide.md": b"# Guide\n"}
+
+
+@pytest.fixture
+def locked_install(installer, tmp_path):
+    """Install skill "a" from a file and pin it in the lockfile."""
+    install_dir = installer._install_from_file(
+        make_skill_tarball(tmp_path / "a.tar.gz", "a", "1.0.0", files=GUIDE)
+    )
+    installer._update_lockfile_entry("a", install_dir, None)
+    return install_dir
+
+
+def overwrite(path, data):
+    path.chmod(0o644)
+    path.write_bytes(data)
+
+
+class TestScanTree:
+    def test_digest_is_stable(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "sub" / "b.txt").write_text("b")
+
+        first, hashed = scan_tree(tmp_path)
+        second, _ = scan_tree(tmp_path)
+
+        assert sorted(first) == ["a.txt", "sub/b.txt"]
+        assert hashed == 2
+        assert tree_digest(first) == tree_digest(second)
+
+    def test_unchanged_files_are_not_rehashed(self, tmp_path):
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        baseline, _ = scan_tree(tmp_path)
+
+        (tmp_path / "b.txt").write_text("changed")
+        current, hashed = scan_tree(tmp_path, baseline)
+
+        assert hashed == 1
+        assert current["a.txt"] is baseline["a.txt"]
+        assert current["b.txt"].digest != baseline["b.txt"].digest
+
+
+class TestVerifier:
+    def test_lockfile_records_digests(self, installer, locked_install):
+        locked = installer.lockfile_manager.get_skill("a")
+        installed = installer.state.get("a", "1.0.0")
+
+        assert locked.checksum == installed.checksum
+        assert locked.tree_digest == installed.tree_digest
+        assert locked.tree_digest == tree_digest(scan_tree(locked_install)[0])
+
+    def test_unchanged_install_costs_only_stats(self, installer, locked_install):
+        results = Verifier(installer).verify_locked()
+
+        assert [(r.name, r.status, r.hashed) for r in results] == [("a", "ok", 0)]
+
+    def test_detects_modified_and_extra_files(self, installer, locked_install):
+        overwrite(locked_install / "a" / "docs" / "guide.md", b"tampered\n")
+        (locked_install / "a" / "extra.sh").write_text("echo hi\n")
+
+        [result] = Verifier(installer).verify_locked()
+
+        assert result.status == "modified"
+        assert result.problems == ["a/docs/guide.md: modified", "a/extra.sh: unexpected file"]
+
+    def test_touched_file_is_rehashed_once(self, installer, locked_install):
+        guide = locked_install / "a" / "docs" / "guide.md"
+        st = guide.stat()
+        os.utime(guide, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        first = Verifier(installer).verify_locked()
+        second = Verifier(installer).verify_locked()
+
+        assert [(r.status, r.hashed) for r in first] == [("ok", 1)]
+        assert [(r.status, r.hashed) for r in second] == [("ok", 0)]
+
+    def test_missing_install(self, installer, locked_install):
+        installer.uninstall("a")
+
+        [result] = Verifier(installer).verify_locked()
+        assert result.status == "missing"
+
+    def test_checksum_mismatch(self, installer, locked_install):
+        installer.lockfile_manager.add_skill("a", "1.0.0", checksum="0" * 64)
+
+        [result] = Verifier(installer).verify_locked()
+        assert result.status == "mismatch"
+
+    def test_verify_installed_without_lockfile(self, installer, tmp_path):
+        install_dir = installer._install_from_file(
+            make_skill_tarball(tmp_path / "a.tar.gz", "a", "1.0.0", files=GUIDE)
+        )
+        verifier = Verifier(installer)
+
+        assert [r.status for r in verifier.verify_installed()] == ["ok"]
+        with pytest.raises(ValueError, match="No .sutras.lock"):
+            verifier.verify_locked()
+
+        (install_dir / "a" / "docs" / "guide.md").unlink()
+        [result] = verifier.verify_installed()
+        assert result.problems == ["a/docs/guide.md: missing"]
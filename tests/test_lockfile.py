@@ -0,0 +1,133 @@
+"""Tests for lockfile management."""
+
+import json
+
+import pytest
+import yaml
+
+from sutras.core.lockfile import LockfileManager
+from sutras.core.resolver import DependencyResolver, ResolvedSkill
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return LockfileManager(tmp_path)
+
+
+def count_saves(manager, monkeypatch):
+    saves = []
+    real_save = manager.save
+
+    def save(lockfile):
+        saves.append(sorted(lockfile.skills))
+        real_save(lockfile)
+
+    monkeypatch.setattr(manager, "save", save)
+    return saves
+
+
+class TestTransaction:
+    def test_writes_once(self, manager, monkeypatch):
+        saves = count_saves(manager, monkeypatch)
+
+        with manager.transaction():
+            for i in range(5):
+                manager.add_skill(f"@ns/s{i}", "1.0.0")
+            manager.remove_skill("@ns/s0")
+            assert "@ns/s1" in manager.load().skills
+
+        assert len(saves) == 1
+        assert sorted(manager.load().skills) == ["@ns/s1", "@ns/s2", "@ns/s3", "@ns/s4"]
+
+    def test_unchanged_lockfile_is_not_rewritten(self, manager, monkeypatch):
+        manager.add_skill("@ns/a", "1.0.0")
+        saves = count_saves(manager, monkeypatch)
+
+        with manager.transaction() as lockfile:
+            assert "@ns/a" in lockfile.skills
+
+        assert saves == []
+
+    def test_error_discards_changes(self, manager):
+        manager.add_skill("@ns/a", "1.0.0")
+
+        with pytest.raises(RuntimeError):
+            with manager.transaction():
+                manager.remove_skill("@ns/a")
+                raise RuntimeError("boom")
+
+        assert "@ns/a" in manager.load().skills
+
+    def test_write_is_atomic(self, manager, tmp_path):
+        manager.add_skill("@ns/a", "1.0.0")
+        manager.add_skill("@ns/b", "1.0.0")
+
+        leftovers = [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+        assert leftovers == []
+
+
+class TestBatch:
+    def test_queues_changes_until_exit(self, manager, monkeypatch):
+        saves = count_saves(manager, monkeypatch)
+
+        with manager.batch():
+            manager.add_skill("@ns/a", "1.0.0")
+            manager.add_skill("@ns/b", "1.0.0")
+            with manager.batch():
+                manager.add_skill("@ns/c", "1.0.0")
+            assert not manager.exists()
+
+        assert saves == [["@ns/a", "@ns/b", "@ns/c"]]
+
+    def test_error_discards_queue(self, manager):
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.add_skill("@ns/a", "1.0.0")
+                raise RuntimeError("boom")
+
+        assert not manager.exists()
+
+    def test_resolver_updates_join_batch(self, manager, monkeypatch):
+        saves = count_saves(manager, monkeypatch)
+        resolver = DependencyResolver(registry_manager=None, lockfile_manager=manager)
+        resolved = [
+            ResolvedSkill(
+                name=f"@ns/{n}", version="1.0.0", registry=None, tarball_url=None, checksum=None
+            )
+            for n in ("a", "b")
+        ]
+
+        with manager.batch():
+            resolver.update_lockfile(resolved)
+            manager.add_skill("@ns/app", "1.0.0", dependencies=["@ns/a", "@ns/b"])
+
+        assert saves == [["@ns/a", "@ns/app", "@ns/b"]]
+
+
+class TestFormats:
+    def test_json_is_readable_as_yaml(self, tmp_path):
+        manager = LockfileManager(tmp_path, "json")
+        manager.add_skill("@ns/a", "1.0.0", checksum="abc", dependencies=["@ns/b"])
+
+        text = manager.lockfile_path.read_text()
+        assert json.loads(text) == yaml.safe_load(text)
+        assert manager.get_skill("@ns/a").dependencies == ["@ns/b"]
+
+    def test_existing_format_is_kept(self, tmp_path):
+        LockfileManager(tmp_path, "json").add_skill("@ns/a", "1.0.0")
+
+        manager = LockfileManager(tmp_path)
+        manager.add_skill("@ns/b", "1.0.0")
+
+        data = json.loads(manager.lockfile_path.read_text())
+        assert sorted(data["skills"]) == ["@ns/a", "@ns/b"]
+
+    def test_yaml_is_default(self, manager):
+        manager.add_skill("@ns/a", "1.0.0")
+
+        assert manager.lockfile_path.read_text().startswith("version:")
+        assert manager.get_locked_version("@ns/a") == "1.0.0"
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown lockfile format"):
+            LockfileManager(tmp_path, "toml")
@@ -0,0 +1,102 @@
+"""Tests for cross-process file locks."""
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from sutras.core.lockfile import LockfileManager
+from sutras.core.locks import FileLock, LockTimeout, lock_name
+
+HOLD_LOCK = textwrap.dedent(
+    """
+    import sys
+    from pathlib import Path
+    from sutras.core.locks import FileLock
+
+    with FileLock(Path(sys.argv[1])):
+        print("locked", flush=True)
+        sys.stdin.read()
+    """
+)
+
+ADD_SKILL = textwrap.dedent(
+    """
+    import sys
+    from pathlib import Path
+    from sutras.core.lockfile import LockfileManager
+
+    manager = LockfileManager(Path(sys.argv[1]))
+    for i in range(5):
+        manager.add_skill(f"@ns/{sys.argv[2]}-{i}", "1.0.0")
+    """
+)
+
+
+class TestFileLock:
+    def test_excludes_other_processes(self, tmp_path):
+        path = tmp_path / "skill.lock"
+        holder = subprocess.Popen(
+            [sys.executable, "-c", HOLD_LOCK, str(path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert holder.stdout.readline().strip() == "locked"
+            with pytest.raises(LockTimeout):
+                FileLock(path, timeout=0.2).acquire()
+        finally:
+            holder.communicate("")
+
+        with FileLock(path, timeout=5):
+            pass
+
+    def test_reentrant_within_thread(self, tmp_path):
+        lock = FileLock(tmp_path / "skill.lock")
+        with lock:
+            with FileLock(tmp_path / "skill.lock", timeout=0.1):
+                pass
+
+    def test_excludes_other_threads(self, tmp_path):
+        path = tmp_path / "skill.lock"
+        inside = []
+        overlaps = []
+
+        def work():
+            with FileLock(path):
+                inside.append(1)
+                overlaps.append(len(inside))
+                time.sleep(0.01)
+                inside.pop()
+
+        threads = [threading.Thread(target=work) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert overlaps == [1] * 5
+
+    def test_lock_name_is_safe(self):
+        name = lock_name("download", "https://example.com/a b/skill.tar.gz")
+
+        assert "/" not in name and " " not in name
+        assert name.endswith(".lock")
+        assert name != lock_name("download", "https://example.com/a_b/skill.tar.gz")
+
+
+class TestLockfileWriteLock:
+    def test_concurrent_processes_keep_all_entries(self, tmp_path):
+        procs = [
+            subprocess.Popen([sys.executable, "-c", ADD_SKILL, str(tmp_path), f"p{n}"])
+            for n in range(4)
+        ]
+        for proc in procs:
+            assert proc.wait(timeout=60) == 0
+
+        skills = LockfileManager(tmp_path).load().skills
+        assert len(skills) == 20
@@ -1,13 +1,22 @@
 """Tests for dependency resolution."""
 
+from types import SimpleNamespace
+
+import pytest
+
+from sutras.core.abi import DependencyConfig
+from sutras.core.config import RegistryConfigEntry
+from sutras.core.registry import SkillIndexEntry
 from sutras.core.resolver import (
     CircularDependencyError,
     DependencyConflictError,
     DependencyRequest,
     DependencyResolver,
     NoMatchingVersionError,
+    ResolutionCache,
     ResolvedSkill,
     SkillNotFoundError,
+    topological_levels,
 )
 
 
@@ -126,6 +135,106 @@ class TestDependencyResolver:
         assert ("root", "^1.0.0") in resolver._constraints["@user/skill"]
         assert ("@other/skill", ">=1.5.0") in resolver._constraints["@user/skill"]
 
+    def test_add_constraint_detects_conflict_early(self):
+        resolver = DependencyResolver(
+            registry_manager=None, lockfile_manager=None, use_lockfile=False
+        )
+        resolver._add_constraint("@user/skill", "^1.0.0", "root")
+
+        with pytest.raises(DependencyConflictError, match="@user/skill"):
+            resolver._add_constraint("@user/skill", "^2.0.0", "@other/skill")
+
+
+class StubRegistryManager:
+    """Registry manager serving a fixed index of skills."""
+
+    def __init__(self, skills):
+        self.skills = skills
+
+    def search_skill(self, name):
+        return [("test", self.skills[name])] if name in self.skills else []
+
+
+class CacheRegistryManager(StubRegistryManager):
+    """Stub registry manager that also reports index revisions and settings."""
+
+    def __init__(self, skills=None):
+        super().__init__(skills or {})
+        self.config = SimpleNamespace(list_registries=lambda: {})
+
+    def get_index_revisions(self):
+        return {"official": "rev1"}
+
+
+def index_entry(name, versions):
+    return SkillIndexEntry(
+        name=name,
+        version=versions[-1],
+        versions={v: f"{name}-{v}.tar.gz" for v in versions},
+        checksum=f"checksum-of-{versions[-1]}",
+    )
+
+
+class TestOptionalDependencies:
+    def _resolver(self, monkeypatch, skills, dependencies):
+        resolver = DependencyResolver(
+            registry_manager=StubRegistryManager(skills),
+            lockfile_manager=None,
+            use_lockfile=False,
+        )
+        monkeypatch.setattr(
+            resolver,
+            "_get_skill_dependencies",
+            lambda name, version, registry: dependencies.get(name, []),
+        )
+        return resolver
+
+    def test_skipped_optional_constraint_is_rolled_back(self, monkeypatch):
+        resolver = self._resolver(
+            monkeypatch,
+            {"@n/x": index_entry("@n/x", ["1.0.0"]), "@n/y": index_entry("@n/y", ["1.0.0"])},
+            {"@n/x": [DependencyConfig(name="@n/y", version="^2.0.0", optional=True)]},
+        )
+
+        resolved = resolver.resolve(
+            [
+                DependencyRequest(name="@n/x", constraint="*", source="root"),
+                DependencyRequest(name="@n/y", constraint="^1.0.0", source="root"),
+            ]
+        )
+
+        assert {(s.name, s.version) for s in resolved} == {("@n/x", "1.0.0"), ("@n/y", "1.0.0")}
+        assert resolver._constraints["@n/y"] == [("root", "^1.0.0")]
+
+    def test_skipped_optional_branch_resolves_nothing(self, monkeypatch):
+        resolver = self._resolver(
+            monkeypatch,
+            {"@n/x": index_entry("@n/x", ["1.0.0"]), "@n/z": index_entry("@n/z", ["1.0.0"])},
+            {
+                "@n/x": [DependencyConfig(name="@n/z", version="*")],
+                "@n/z": [DependencyConfig(name="@n/missing", version="*")],
+            },
+        )
+
+        resolved = resolver.resolve(
+            [DependencyRequest(name="@n/x", constraint="*", source="root", optional=True)]
+        )
+
+        assert resolved == []
+
+    def test_selected_version_below_latest_has_no_index_checksum(self, monkeypatch):
+        resolver = self._resolver(
+            monkeypatch, {"@n/y": index_entry("@n/y", ["1.0.0", "2.0.0"])}, {}
+        )
+
+        [pinned] = resolver.resolve(
+            [DependencyRequest(name="@n/y", constraint="^1.0.0", source="root")]
+        )
+        [latest] = resolver.resolve([DependencyRequest(name="@n/y", constraint="*", source="root")])
+
+        assert pinned.version == "1.0.0" and pinned.checksum is None
+        assert latest.version == "2.0.0" and latest.checksum == "checksum-of-2.0.0"
+
 
 class TestTopologicalSort:
     def test_simple_sort(self):
@@ -219,6 +328,65 @@ class TestTopologicalSort:
         assert len(result) == 2
 
 
+class TestTopologicalLevels:
+    def _skill(self, name, deps=None):
+        return ResolvedSkill(
+            name=name,
+            version="1.0.0",
+            registry=None,
+            tarball_url=None,
+            checksum=None,
+            dependencies=deps or [],
+        )
+
+    def test_leaves_first(self):
+        skills = [self._skill("a", ["b", "c"]), self._skill("b", ["c"]), self._skill("c")]
+        levels = topological_levels(skills)
+        assert [[s.name for s in level] for level in levels] == [["c"], ["b"], ["a"]]
+
+    def test_independent_skills_share_level_sorted(self):
+        skills = [self._skill("z"), self._skill("m"), self._skill("a")]
+        levels = topological_levels(skills)
+        assert [[s.name for s in level] for level in levels] == [["a", "m", "z"]]
+
+    def test_deterministic_regardless_of_input_order(self):
+        skills = [
+            self._skill("app", ["lib-b", "lib-a"]),
+            self._skill("lib-b", ["core"]),
+            self._skill("lib-a", ["core"]),
+            self._skill("core"),
+        ]
+        forward = topological_levels(skills)
+        backward = topological_levels(list(reversed(skills)))
+        assert forward == backward
+        assert [[s.name for s in level] for level in forward] == [
+            ["core"],
+            ["lib-a", "lib-b"],
+            ["app"],
+        ]
+
+    def test_ignores_external_dependencies(self):
+        levels = topological_levels([self._skill("a", ["not-resolved"])])
+        assert [[s.name for s in level] for level in levels] == [["a"]]
+
+    def test_cycle_raises(self):
+        skills = [self._skill("a", ["b"]), self._skill("b", ["a"]), self._skill("c")]
+        with pytest.raises(CircularDependencyError) as exc:
+            topological_levels(skills)
+        assert exc.value.cycle == ["a", "b"]
+
+    def test_resolver_sort_is_flattened_levels(self):
+        resolver = DependencyResolver(
+            registry_manager=None, lockfile_manager=None, use_lockfile=False
+        )
+        resolver._resolved = {
+            "a": self._skill("a", ["b"]),
+            "b": self._skill("b"),
+        }
+        assert [s.name for s in resolver._topological_sort()] == ["b", "a"]
+        assert [[s.name for s in level] for level in resolver.install_levels()] == [["b"], ["a"]]
+
+
 class TestParseDependencies:
     def test_parse_string_dependencies(self):
         resolver = DependencyResolver(
@@ -273,3 +441,143 @@ class TestParseDependencies:
         assert len(deps) == 2
         assert deps[0].name == "@user/simple"
         assert deps[1].version == "~1.2.0"
+
+
+class TestSelectVersion:
+    def _entry(self):
+        return SkillIndexEntry(
+            name="@user/skill",
+            version="2.0.0",
+            versions={
+                "1.0.0": "a.tar.gz",
+                "1.10.0": "b.tar.gz",
+                "1.2.0": "c.tar.gz",
+                "2.0.0": "d.tar.gz",
+                "not-a-version": "e.tar.gz",
+            },
+        )
+
+    def test_sorted_versions_cached(self):
+        entry = self._entry()
+        versions = entry.sorted_versions()
+        assert [str(v) for v in versions] == ["1.0.0", "1.2.0", "1.10.0", "2.0.0"]
+        assert entry.sorted_versions() is versions
+
+    def test_select_highest_matching(self):
+        resolver = DependencyResolver(
+            registry_manager=None, lockfile_manager=None, use_lockfile=False
+        )
+        assert resolver._select_version(self._entry(), "^1.0.0", "@user/skill") == "1.10.0"
+        assert resolver._select_version(self._entry(), "*", "@user/skill") == "2.0.0"
+
+    def test_select_unparseable_constraint_exact(self):
+        resolver = DependencyResolver(
+            registry_manager=None, lockfile_manager=None, use_lockfile=False
+        )
+        selected = resolver._select_version(self._entry(), "not-a-version", "@user/skill")
+        assert selected == "not-a-version"
+
+    def test_select_no_match(self):
+        resolver = DependencyResolver(
+            registry_manager=None, lockfile_manager=None, use_lockfile=False
+        )
+        with pytest.raises(NoMatchingVersionError):
+            resolver._select_version(self._entry(), "^3.0.0", "@user/skill")
+
+
+class TestResolutionCache:
+    def _resolved(self):
+        return [
+            ResolvedSkill(
+                name="@user/helper",
+                version="1.0.0",
+                registry="official",
+                tarball_url="helper.tar.gz",
+                checksum="abc",
+            ),
+            ResolvedSkill(
+                name="@user/skill",
+                version="2.1.0",
+                registry="official",
+                tarball_url="skill.tar.gz",
+                checksum=None,
+                dependencies=["@user/helper"],
+            ),
+        ]
+
+    def test_roundtrip(self, tmp_path):
+        cache = ResolutionCache(tmp_path / "cache")
+        cache.put("key", self._resolved())
+        assert cache.get("key") == self._resolved()
+
+    def test_miss(self, tmp_path):
+        cache = ResolutionCache(tmp_path / "cache")
+        assert cache.get("missing") is None
+
+    def test_corrupt_entry_is_miss(self, tmp_path):
+        cache = ResolutionCache(tmp_path)
+        (tmp_path / "bad.json").write_text("{not json")
+        assert cache.get("bad") is None
+
+    def test_key_ignores_request_order(self):
+        a = DependencyRequest(name="@user/a", constraint="^1.0.0", source="root")
+        b = DependencyRequest(name="@user/b", constraint="*", source="root")
+        revisions = {"official": "deadbeef"}
+        assert ResolutionCache.make_key([a, b], revisions, None) == ResolutionCache.make_key(
+            [b, a], revisions, None
+        )
+
+    def test_key_changes_with_inputs(self):
+        req = [DependencyRequest(name="@user/a", constraint="^1.0.0", source="root")]
+        base = ResolutionCache.make_key(req, {"official": "rev1"}, None)
+        assert base != ResolutionCache.make_key(req, {"official": "rev2"}, None)
+        assert base != ResolutionCache.make_key(req, {"official": "rev1"}, "lockhash")
+
+    def test_key_changes_with_registry_settings(self):
+        req = [DependencyRequest(name="@user/a", constraint="^1.0.0", source="root")]
+        revisions = {"official": "rev1", "mirror": "rev2"}
+
+        def key(**changes):
+            configs = {
+                "official": RegistryConfigEntry(url="https://example.com/official.git"),
+                "mirror": RegistryConfigEntry(url="https://example.com/mirror.git"),
+            }
+            configs["mirror"] = configs["mirror"].model_copy(update=changes)
+            return ResolutionCache.make_key(req, revisions, None, configs)
+
+        base = key()
+        assert base == key()
+        assert base != key(enabled=False)
+        assert base != key(priority=10)
+        assert base != key(url="https://example.com/other.git")
+        assert base != key(namespace="user")
+        assert base == key(auth_token="secret")
+
+    def test_resolver_uses_cached_result(self, tmp_path):
+        cache = ResolutionCache(tmp_path)
+        resolver = DependencyResolver(
+            registry_manager=CacheRegistryManager(),
+            lockfile_manager=None,
+            use_lockfile=False,
+            cache=cache,
+        )
+        requests = [DependencyRequest(name="@user/skill", constraint="^2.0.0", source="root")]
+        cache.put(resolver._cache_key(requests), self._resolved())
+
+        assert resolver.resolve(requests) == self._resolved()
+
+    def test_unwritable_cache_does_not_fail_resolution(self, tmp_path, monkeypatch):
+        # A cache directory below a regular file can't be created, even by root.
+        (tmp_path / "not-a-dir").write_text("")
+        cache = ResolutionCache(tmp_path / "not-a-dir" / "cache")
+        registry = CacheRegistryManager({"@user/skill": index_entry("@user/skill", ["1.0.0"])})
+        resolver = DependencyResolver(
+            registry_manager=registry, lockfile_manager=None, use_lockfile=False, cache=cache
+        )
+        monkeypatch.setattr(resolver, "_get_skill_dependencies", lambda *args: [])
+
+        resolved = resolver.resolve(
+            [DependencyRequest(name="@user/skill", constraint="*", source="root")]
+        )
+
+        assert [(s.name, s.version) for s in resolved] == [("@user/skill", "1.0.0")]
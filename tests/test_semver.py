@@ -1,8 +1,11 @@
 """Tests for semantic versioning and constraint parsing."""
 
+import dataclasses
+
 import pytest
 
 from sutras.core.semver import (
+    Bound,
     Version,
     VersionRange,
     matches_constraint,
@@ -70,6 +73,58 @@ class TestVersion:
         v2 = Version(1, 2, 3)
         assert hash(v1) == hash(v2)
 
+    def test_parse_build_metadata(self):
+        v = Version.parse("1.0.0-rc.1+build.5")
+        assert v.prerelease == "rc.1"
+        assert v.build == "build.5"
+        assert str(v) == "1.0.0-rc.1+build.5"
+
+    def test_build_metadata_ignored_for_precedence(self):
+        a = Version.parse("1.0.0+a")
+        b = Version.parse("1.0.0+b")
+        assert a == b
+        assert hash(a) == hash(b)
+        assert not a < b
+
+    def test_parse_rejects_leading_zeros(self):
+        with pytest.raises(ValueError, match="Invalid version format"):
+            Version.parse("01.0.0")
+        with pytest.raises(ValueError, match="Invalid version format"):
+            Version.parse("1.0.0-alpha.01")
+
+    def test_parse_rejects_empty_identifiers(self):
+        with pytest.raises(ValueError, match="Invalid version format"):
+            Version.parse("1.0.0-alpha..1")
+
+    @pytest.mark.parametrize("version", ["١.٢.٣", "1.2.３", "1.0.0-٣"])
+    def test_parse_rejects_non_ascii_digits(self, version):
+        with pytest.raises(ValueError):
+            Version.parse(version)
+
+    def test_is_immutable(self):
+        v = Version.parse("1.2.3")
+        assert v.sort_key == (1, 2, 3, (1,))
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            v.major = 2
+
+    def test_numeric_prerelease_identifiers(self):
+        assert Version.parse("1.0.0-alpha.2") < Version.parse("1.0.0-alpha.10")
+
+    def test_spec_precedence_order(self):
+        ordered = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+        ]
+        versions = [Version.parse(v) for v in reversed(ordered)]
+        assert [str(v) for v in sorted(versions)] == ordered
+
 
 class TestVersionRange:
     def test_parse_wildcard_star(self):
@@ -145,6 +200,10 @@ class TestVersionRange:
         assert r.matches(Version(1, 0, 0))
         assert not r.matches(Version(2, 0, 0))
 
+    def test_parse_wildcard_rejects_non_ascii_digits(self):
+        with pytest.raises(ValueError):
+            VersionRange.parse("١.x")
+
     def test_select_highest(self):
         r = VersionRange.parse("^1.0.0")
         versions = [
@@ -165,6 +224,67 @@ class TestVersionRange:
         assert "1.0.0" in str(r)
 
 
+class TestVersionRangeAlgebra:
+    def test_intersect_overlapping(self):
+        r = VersionRange.parse("^1.0.0").intersect(VersionRange.parse(">=1.5.0"))
+        assert r.matches(Version(1, 5, 0))
+        assert not r.matches(Version(1, 4, 0))
+        assert not r.matches(Version(2, 0, 0))
+        assert str(r) == ">=1.5.0 <2.0.0"
+
+    def test_intersect_disjoint_is_empty(self):
+        r = VersionRange.parse("^1.0.0").intersect(VersionRange.parse("^2.0.0"))
+        assert r.is_empty()
+        assert not r.matches(Version(1, 5, 0))
+
+    def test_exact_bounds_not_both_inclusive_is_empty(self):
+        assert VersionRange.parse(">1.0.0 <=1.0.0").is_empty()
+        assert not VersionRange.parse(">=1.0.0 <=1.0.0").is_empty()
+
+    def test_not_equal_splits_interval(self):
+        r = VersionRange.parse(">=1.0.0 <2.0.0 !=1.5.0")
+        assert len(r.intervals) == 2
+        assert not r.matches(Version(1, 5, 0))
+        assert r.matches(Version(1, 5, 1))
+
+    def test_union_merges_adjacent(self):
+        r = VersionRange.parse("^1.0.0").union(VersionRange.parse("^2.0.0"))
+        assert len(r.intervals) == 1
+        assert str(r) == ">=1.0.0 <3.0.0"
+
+    def test_union_keeps_gaps(self):
+        r = VersionRange.parse("^1.0.0").union(VersionRange.parse("^3.0.0"))
+        assert len(r.intervals) == 2
+        assert not r.matches(Version(2, 0, 0))
+        assert str(r) == ">=1.0.0 <2.0.0 || >=3.0.0 <4.0.0"
+
+    def test_parse_or(self):
+        r = VersionRange.parse("^1.0.0 || ^3.0.0")
+        assert r.matches(Version(3, 2, 0))
+        assert not r.matches(Version(2, 0, 0))
+
+    def test_bounds(self):
+        r = VersionRange.parse("~1.2.3")
+        assert r.lower_bound == Bound(Version(1, 2, 3), True)
+        assert r.upper_bound == Bound(Version(1, 3, 0), False)
+        assert VersionRange.parse("<2.0.0").lower_bound is None
+        assert VersionRange.parse(">=1.0.0").upper_bound is None
+
+    def test_select_highest_sorted(self):
+        versions = sorted(Version.parse(v) for v in ["1.0.0", "1.6.0", "1.7.0", "2.0.0", "3.1.0"])
+        r = VersionRange.parse(">=1.5.0 <2.0.0 !=1.7.0")
+        assert r.select_highest_sorted(versions) == Version(1, 6, 0)
+        assert VersionRange.parse("^1.0.0 || ^3.0.0").select_highest_sorted(versions) == Version(
+            3, 1, 0
+        )
+        assert VersionRange.parse("<1.0.0").select_highest_sorted(versions) is None
+
+    def test_select_highest_sorted_inclusive_upper(self):
+        versions = [Version(1, 0, 0), Version(2, 0, 0), Version(3, 0, 0)]
+        assert VersionRange.parse("<=2.0.0").select_highest_sorted(versions) == Version(2, 0, 0)
+        assert VersionRange.parse("<2.0.0").select_highest_sorted(versions) == Version(1, 0, 0)
+
+
 class TestConvenienceFunctions:
     def test_parse_version(self):
         v = parse_version("1.2.3")
@@ -93,6 +93,25 @@ license: "MIT"
     assert skill.author == "Test Author"
 
 
+def test_skill_supporting_files_are_recursive(tmp_path):
+    """Test that supporting files are collected from subdirectories."""
+    skill_dir = tmp_path / "test-skill"
+    (skill_dir / "scripts").mkdir(parents=True)
+    (skill_dir / "tests" / "fixtures").mkdir(parents=True)
+    (skill_dir / "node_modules" / "pkg").mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\nname: test-skill\ndescription: Test\n---\n")
+    (skill_dir / "sutras.yaml").write_text('version: "1.0.0"\n')
+    (skill_dir / "scripts" / "run.sh").write_text("#!/bin/sh\n")
+    (skill_dir / "tests" / "fixtures" / "input.json").write_text("{}")
+    (skill_dir / "tests" / "fixtures" / "scratch.tmp").write_text("")
+    (skill_dir / "node_modules" / "pkg" / "index.js").write_text("")
+    (skill_dir / ".sutrasignore").write_text("*.tmp\n")
+
+    skill = Skill.load(skill_dir)
+
+    assert sorted(skill.supporting_files) == ["scripts/run.sh", "tests/fixtures/input.json"]
+
+
 def test_skill_parse_invalid_frontmatter():
     """Test that invalid SKILL.md raises error."""
     content = "# No frontmatter\n\nJust content"
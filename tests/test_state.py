@@ -0,0 +1,158 @@
+"""Tests for the install-state database."""
+
+import sqlite3
+
+import pytest
+
+from sutras.core.state import FileRecord, InstalledVersion, InstallState
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = InstallState(tmp_path / "state.db")
+    yield state
+    state.close()
+
+
+def version(tmp_path, name="@ns/a", ver="1.0.0", **kwargs):
+    fs_name = name.lstrip("@").replace("/", "_")
+    return InstalledVersion(
+        name=name,
+        version=ver,
+        fs_name=fs_name,
+        install_dir=tmp_path / "installed" / fs_name / ver,
+        **kwargs,
+    )
+
+
+class TestInstallState:
+    def test_record_and_get(self, state, tmp_path):
+        state.record(version(tmp_path, checksum="abc", source="registry:test", size=42))
+
+        installed = state.get("@ns/a", "1.0.0")
+        assert installed.checksum == "abc"
+        assert installed.source == "registry:test"
+        assert installed.size == 42
+        assert installed.installed_at
+        assert state.is_installed("@ns/a", "1.0.0")
+        assert not state.is_installed("@ns/a", "2.0.0")
+
+    def test_explicit_install_stays_explicit(self, state, tmp_path):
+        state.record(version(tmp_path, explicit=True, checksum="abc"))
+        state.record(version(tmp_path, explicit=False))
+
+        installed = state.get("@ns/a", "1.0.0")
+        assert installed.explicit
+        assert installed.checksum == "abc"
+
+    def test_list_installed_uses_filesystem_names(self, state, tmp_path):
+        state.record(version(tmp_path, ver="2.0.0"))
+        state.record(version(tmp_path, ver="1.0.0"))
+        state.record(version(tmp_path, name="@ns/b"))
+
+        assert state.list_installed() == {"ns_a": ["1.0.0", "2.0.0"], "ns_b": ["1.0.0"]}
+
+    def test_dependents(self, state, tmp_path):
+        state.record(version(tmp_path), dependent="@ns/app")
+        state.add_dependent("@ns/a", "1.0.0", "@ns/tool")
+
+        assert state.dependents("@ns/a", "1.0.0") == ["@ns/app", "@ns/tool"]
+
+        state.remove("@ns/a", "1.0.0")
+        assert state.dependents("@ns/a", "1.0.0") == []
+
+    def test_remove_all_versions(self, state, tmp_path):
+        state.record(version(tmp_path, ver="1.0.0"))
+        state.record(version(tmp_path, ver="2.0.0"))
+        state.remove("@ns/a")
+
+        assert state.list_installed() == {}
+
+    def test_transaction_rolls_back(self, state, tmp_path):
+        with pytest.raises(RuntimeError):
+            with state.transaction():
+                state.record(version(tmp_path))
+                raise RuntimeError("boom")
+
+        assert not state.is_installed("@ns/a", "1.0.0")
+
+    def test_persists_across_connections(self, state, tmp_path):
+        state.record(version(tmp_path))
+        state.close()
+
+        assert InstallState(tmp_path / "state.db").is_installed("@ns/a", "1.0.0")
+
+    def test_file_records_are_replaced_and_removed(self, state, tmp_path):
+        old = FileRecord(digest="d1", size=1, mtime_ns=1, ino=1, ctime_ns=1)
+        new = FileRecord(digest="d2", size=2, mtime_ns=2, ino=2, ctime_ns=2)
+        state.record(version(tmp_path), files={"a/SKILL.md": old, "a/old.md": old})
+        state.record(version(tmp_path), files={"a/SKILL.md": new})
+
+        assert state.files("@ns/a", "1.0.0") == {"a/SKILL.md": new}
+        state.remove("@ns/a", "1.0.0")
+        assert state.files("@ns/a", "1.0.0") == {}
+
+    def test_adds_columns_to_older_databases(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "old.db")
+        conn.execute(
+            "CREATE TABLE installs (name TEXT, version TEXT, fs_name TEXT, install_dir TEXT, "
+            "checksum TEXT, source TEXT, size INTEGER, installed_at REAL, explicit INTEGER, "
+            "PRIMARY KEY (name, version))"
+        )
+        conn.commit()
+        conn.close()
+
+        state = InstallState(tmp_path / "old.db")
+        state.record(version(tmp_path, tree_digest="abc"))
+        assert state.get("@ns/a", "1.0.0").tree_digest == "abc"
+        state.close()
+
+
+class TestReconcile:
+    def test_rebuilds_from_disk(self, state, tmp_path):
+        installed_dir = tmp_path / "installed"
+        kept = version(tmp_path, checksum="abc", source="registry:test")
+        kept.install_dir.mkdir(parents=True)
+        (kept.install_dir / "SKILL.md").write_text("hello")
+        state.record(kept)
+        state.record(version(tmp_path, name="@ns/gone"))
+        (installed_dir / "ns_new" / "0.1.0").mkdir(parents=True)
+        (installed_dir / "ns_new" / ".0.2.0.staging-123").mkdir()
+
+        assert state.reconcile(installed_dir) == (1, 1)
+
+        assert state.list_installed() == {"ns_a": ["1.0.0"], "ns_new": ["0.1.0"]}
+        assert state.get("@ns/a", "1.0.0").checksum == "abc"
+        assert state.get("@ns/a", "1.0.0").size == 5
+        assert state.get("@ns/new", "0.1.0") is not None
+
+    def test_reconciled_is_read_only(self, state, tmp_path):
+        installed_dir = tmp_path / "installed"
+        state.record(version(tmp_path, name="@ns/gone"))
+        (installed_dir / "ns_new" / "0.1.0").mkdir(parents=True)
+
+        view = state.reconciled(installed_dir)
+
+        assert [(item.name, item.version) for item in view] == [("@ns/new", "0.1.0")]
+        assert state.list_installed() == {"ns_gone": ["1.0.0"]}
+
+    def test_empty_database_is_reconciled_on_first_use(self, tmp_path):
+        installed_dir = tmp_path / "installed"
+        (installed_dir / "ns_a" / "1.0.0").mkdir(parents=True)
+
+        state = InstallState(tmp_path / "state.db", installed_dir)
+
+        assert state.list_installed() == {"ns_a": ["1.0.0"]}
+        assert state.get("@ns/a", "1.0.0").install_dir == installed_dir / "ns_a" / "1.0.0"
+        state.close()
+
+    def test_populated_database_is_not_reconciled(self, state, tmp_path):
+        installed_dir = tmp_path / "installed"
+        state.record(version(tmp_path))
+        state.close()
+        (installed_dir / "ns_manual" / "1.0.0").mkdir(parents=True)
+
+        reopened = InstallState(tmp_path / "state.db", installed_dir)
+
+        assert reopened.list_installed() == {"ns_a": ["1.0.0"]}
+        reopened.close()
@@ -0,0 +1,102 @@
+"""Tests for the shared skill store."""
+
+import errno
+
+import pytest
+
+from sutras.core import store as store_module
+from sutras.core.store import SkillStore
+
+from .helpers import make_tarball
+
+
+@pytest.fixture
+def tarball(tmp_path):
+    return make_tarball(
+        tmp_path / "skill.tar.gz",
+        {"skill/SKILL.md": b"---\nname: skill\n---\n", "skill/examples/a.md": b"example"},
+    )
+
+
+class TestSkillStore:
+    def test_ensure_extracts_once(self, tmp_path, tarball):
+        store = SkillStore(tmp_path / "store")
+
+        first = store.ensure(tarball)
+        (first / "marker").touch()
+        second = store.ensure(tarball)
+
+        assert first == second
+        assert (second / "marker").exists()
+        assert (first / "skill" / "SKILL.md").read_bytes() == b"---\nname: skill\n---\n"
+        assert store.entries() == [first]
+
+    def test_store_files_are_read_only(self, tmp_path, tarball):
+        entry = SkillStore(tmp_path / "store").ensure(tarball)
+
+        assert (entry / "skill" / "SKILL.md").stat().st_mode & 0o222 == 0
+
+    def test_hardlink_mode_shares_inodes(self, tmp_path, tarball):
+        store = SkillStore(tmp_path / "store", link_mode="hardlink")
+        entry = store.ensure(tarball)
+
+        assert store.materialize(entry, tmp_path / "a") == "hardlink"
+        assert store.materialize(entry, tmp_path / "b") == "hardlink"
+
+        src = entry / "skill" / "examples" / "a.md"
+        assert (tmp_path / "a" / "skill" / "examples" / "a.md").stat().st_ino == src.stat().st_ino
+        assert src.stat().st_nlink == 3
+
+    def test_copy_mode_is_writable_and_independent(self, tmp_path, tarball):
+        store = SkillStore(tmp_path / "store", link_mode="copy")
+        entry = store.ensure(tarball)
+
+        assert store.materialize(entry, tmp_path / "a") == "copy"
+        copied = tmp_path / "a" / "skill" / "SKILL.md"
+        copied.write_text("edited")
+
+        assert (entry / "skill" / "SKILL.md").read_text() == "---\nname: skill\n---\n"
+
+    def test_auto_falls_back_when_reflink_unsupported(self, tmp_path, tarball, monkeypatch):
+        def no_reflink(src, dst):
+            raise OSError(errno.EOPNOTSUPP, "not supported")
+
+        monkeypatch.setitem(store_module._LINKERS, "reflink", no_reflink)
+        store = SkillStore(tmp_path / "store")
+        entry = store.ensure(tarball)
+
+        assert store.materialize(entry, tmp_path / "a") == "hardlink"
+        assert (tmp_path / "a" / "skill" / "SKILL.md").exists()
+
+    def test_auto_falls_back_to_copy(self, tmp_path, tarball, monkeypatch):
+        def unsupported(src, dst):
+            raise OSError(errno.EXDEV, "cross-device")
+
+        monkeypatch.setitem(store_module._LINKERS, "reflink", unsupported)
+        monkeypatch.setitem(store_module._LINKERS, "hardlink", unsupported)
+        store = SkillStore(tmp_path / "store")
+
+        assert store.materialize(store.ensure(tarball), tmp_path / "a") == "copy"
+
+    def test_real_io_errors_are_not_swallowed(self, tmp_path, tarball, monkeypatch):
+        def broken(src, dst):
+            raise OSError(errno.EIO, "I/O error")
+
+        monkeypatch.setitem(store_module._LINKERS, "reflink", broken)
+        store = SkillStore(tmp_path / "store")
+
+        with pytest.raises(OSError):
+            store.materialize(store.ensure(tarball), tmp_path / "a")
+
+    def test_invalid_link_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid link mode"):
+            SkillStore(tmp_path / "store", link_mode="symlink")
+
+    def test_remove(self, tmp_path, tarball):
+        store = SkillStore(tmp_path / "store")
+        entry = store.ensure(tarball)
+
+        store.remove(entry.name)
+
+        assert not entry.exists()
+        assert store.entries() == []
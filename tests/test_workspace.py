@@ -0,0 +1,107 @@
+"""Tests for building every skill in a workspace."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from sutras.cli.main import cli
+from sutras.core.loader import SkillLoader
+from sutras.core.workspace import WorkspaceBuilder
+
+
+def make_skill(skills_dir, name, version="1.0.0", author="Test"):
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: Skill {name}\n---\n")
+    lines = [f'version: "{version}"', "license: MIT"]
+    if author:
+        lines.append(f"author: {author}")
+    (skill_dir / "sutras.yaml").write_text("\n".join(lines) + "\n")
+    return skill_dir
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    skills_dir = tmp_path / "skills"
+    for name in ("alpha", "beta", "gamma"):
+        make_skill(skills_dir, name)
+    return skills_dir
+
+
+def workspace(skills_dir, tmp_path, **kwargs):
+    loader = SkillLoader(search_paths=[skills_dir], include_global=False, include_project=False)
+    return WorkspaceBuilder(loader, output_dir=tmp_path / "dist", **kwargs)
+
+
+class TestWorkspaceBuilder:
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_builds_every_skill(self, skills_dir, tmp_path, jobs):
+        report = workspace(skills_dir, tmp_path, jobs=jobs).build()
+
+        assert [(r.name, r.status) for r in report.results] == [
+            ("alpha", "built"),
+            ("beta", "built"),
+            ("gamma", "built"),
+        ]
+        for result in report.results:
+            assert result.artifact.endswith(f"{result.name}-1.0.0.tar.gz")
+            assert result.size > 0 and len(result.checksum) == 64
+
+    def test_second_run_skips_unchanged_skills(self, skills_dir, tmp_path):
+        first = workspace(skills_dir, tmp_path, jobs=1).build()
+        (skills_dir / "beta" / "notes.md").write_text("# Notes\n")
+
+        second = workspace(skills_dir, tmp_path, jobs=1).build()
+
+        assert [r.status for r in second.results] == ["cached", "built", "cached"]
+        assert second.results[0].checksum == first.results[0].checksum
+        assert second.results[1].checksum != first.results[1].checksum
+
+    def test_failures_do_not_stop_the_run(self, skills_dir, tmp_path):
+        make_skill(skills_dir, "delta", author=None)
+        make_skill(skills_dir, "epsilon", version="not-a-version")
+        (make_skill(skills_dir, "zeta") / "SKILL.md").write_text("no frontmatter")
+
+        report = workspace(skills_dir, tmp_path, jobs=2).build()
+
+        assert report.counts() == {"built": 3, "cached": 0, "invalid": 2, "failed": 1}
+        assert [r.name for r in report.failed] == ["delta", "epsilon", "zeta"]
+        assert report.failed[0].errors == ["Author is required in sutras.yaml"]
+        assert report.failed[2].source.endswith("zeta")
+
+    def test_report_is_json(self, skills_dir, tmp_path):
+        report = workspace(skills_dir, tmp_path, jobs=1).build()
+        report.write(tmp_path / "report.json")
+
+        data = json.loads((tmp_path / "report.json").read_text())
+        assert data["summary"]["built"] == 3
+        assert set(data["skills"][0]) >= {"name", "status", "artifact", "size", "checksum"}
+
+
+class TestBuildAllCommand:
+    def test_writes_report(self, skills_dir, tmp_path):
+        output = tmp_path / "dist"
+        args = ["build", "--all", "--path", str(skills_dir), "-o", str(output), "-j", "1"]
+
+        result = CliRunner().invoke(cli, args)
+
+        assert result.exit_code == 0, result.output
+        assert "3 built, 0 up to date, 0 failed" in result.output
+        report = json.loads((output / "build-report.json").read_text())
+        assert [s["name"] for s in report["skills"]] == ["alpha", "beta", "gamma"]
+
+    def test_fails_when_a_skill_fails(self, skills_dir, tmp_path):
+        make_skill(skills_dir, "delta", author=None)
+        args = ["build", "--all", "--path", str(skills_dir), "-o", str(tmp_path / "dist")]
+
+        result = CliRunner().invoke(cli, args)
+
+        assert result.exit_code != 0
+        assert "delta 1.0.0 (invalid)" in result.output
+
+    def test_requires_name_or_all(self):
+        result = CliRunner().invoke(cli, ["build"])
+
+        assert result.exit_code == 2
+        assert "Provide a skill name, or use --all" in result.output